@@ -0,0 +1,64 @@
+import streamlit as st
+import pandas as pd
+
+from golf_runner import DEFAULT_TEAM_FILE
+from golf_utils import load_pickle
+from golf_valuation import LiveValuation
+
+st.title("Calcutta Auction Valuation")
+
+team_file = st.sidebar.text_input("Team file", value=str(DEFAULT_TEAM_FILE))
+payout_text = st.sidebar.text_input("Payouts by place (%)", value="100")
+house_cut = st.sidebar.number_input("House cut (%)", min_value=0.0, max_value=100.0, value=0.0) / 100
+
+
+
+@st.cache_resource
+def load_teams(path):
+    """Load the team pickle once per path, not on every rerun."""
+    return load_pickle(path)
+
+
+team_data = load_teams(team_file)
+if not team_data or not team_data.get("c_teams"):
+    st.error(f"No c_teams found in {team_file}")
+    st.stop()
+c_teams = team_data["c_teams"]
+payouts = tuple(float(p) / 100 for p in payout_text.replace(",", " ").split())
+
+# Simulate once per field; prices only re-price the cached result.
+if "valuation" not in st.session_state:
+    with st.spinner("Simulating tournament..."):
+        st.session_state.valuation = LiveValuation(c_teams, payouts=payouts, house_cut=house_cut)
+valuation = st.session_state.valuation
+valuation.set_payouts(payouts, house_cut)
+if valuation.poll():
+    st.success("Simulation updated for the new field.")
+valuation.refresh_in_background(c_teams)
+
+st.header("1. Enter Sale Prices")
+col1, col2 = st.columns(2)
+with col1:
+    team = st.selectbox("Team", options=valuation.result.team_names)
+with col2:
+    price = st.number_input("Sale price ($)", min_value=0.0, step=10.0,
+                            value=valuation.prices.get(team, 0.0))
+if st.button("Record Price"):
+    valuation.set_price(team, price or None)
+    st.success(f"{team}: ${price:,.0f}")
+
+st.header("2. Valuation")
+if valuation.refreshing:
+    st.info("Field changed, re-simulating in the background; showing the previous result.")
+    if st.button("Check for update"):
+        st.rerun()
+
+st.metric("Pot", f"${valuation.pot():,.0f}")
+rows = pd.DataFrame(valuation.valuations())
+rows["win_prob"] = rows["win_prob"] * 100
+rows["roi"] = pd.to_numeric(rows["roi"]) * 100  # None (unsold) -> NaN
+st.dataframe(rows.rename(columns={
+    "team": "Team", "win_prob": "Win %", "payout_share": "Pot Share", "price": "Price",
+    "ev": "EV", "value": "EV - Price", "roi": "ROI %",
+}), hide_index=True)
+st.caption(f"{valuation.result.n_sims:,} simulated tournaments")
@@ -0,0 +1,348 @@
+# golf_backtest.py
+"""
+Backtest harness: replay past Calcuttas and score the forecasts.
+
+For each event the C teams are rebuilt from that year's team sheet, every
+player's history is cut to rounds dated before the event, and the Day-2
+simulation is run on that history only. Forecasts are scored against the
+actual Day-2 results:
+
+    Brier score   sum over teams of (P(win) - won)^2, averaged over events
+    log-loss      -log P(actual winner), averaged over events
+    finish Brier  Brier score of every finishing position, averaged
+    calibration   predicted win probability vs observed win rate, by bin
+
+The same events re-fit CALIBRATION_CORRECTIONS: each band's correction is
+the mean of actual minus expected (uncalibrated) player points. The events
+are then forecast again with the re-fitted bands (same seed), so the report
+shows whether they would have scored better than the current bands.
+
+sweep() evaluates many sampler settings in parallel across cores.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field as dc_field
+from datetime import date
+from numbers import Real
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from golf_classes import CTeam, MMTeam, Player
+from golf_ingest import TEAM_PLAYER_COLUMNS
+from golf_names import name_index
+from golf_sampler import HistorySampler
+from golf_scoring import CALIBRATION_CORRECTIONS, course_model, default_course
+from golf_simulation import compile_field, player_course_handicap, simulate_tournament
+
+# Win probabilities are clipped here before taking logs.
+LOG_LOSS_EPS = 1e-6
+CALIBRATION_BINS = 10
+
+
+@dataclass
+class BacktestEvent:
+    """One past Day 2 with its teams and actual results."""
+    name: str
+    date: date
+    c_teams: Dict[str, CTeam]
+    player_points: Dict[str, float]  # actual Day-2 Stableford points by player name
+
+    def team_totals(self):
+        """Actual C team scores: best 2 of 3 MM team sums."""
+        totals = {}
+        for team_name, c_team in self.c_teams.items():
+            mm = sorted((sum(self.player_points[p.name] for p in m.players) for m in c_team.mm_teams),
+                        reverse=True)
+            totals[team_name] = mm[0] + mm[1]
+        return totals
+
+
+def load_event_sheet(file_path, players, name, event_date, fuzzy=True):
+    """
+    Build a BacktestEvent from a C team results sheet (CTeamData.xlsx layout:
+    team name, then player / net-points column pairs for the six players).
+
+    Rows with unknown players are reported and skipped.
+    """
+    df = pd.read_excel(file_path, header=0)
+    index = name_index(players)
+    c_teams, points = {}, {}
+    for idx, row in df.iterrows():
+        mm_teams = []
+        for c1, c2 in TEAM_PLAYER_COLUMNS:
+            pair = []
+            for col in (c1, c2):
+                player = index.get(str(row.iloc[col]), fuzzy=fuzzy)
+                if player is None or pd.isnull(row.iloc[col + 1]):
+                    break
+                points[player.name] = float(row.iloc[col + 1])
+                pair.append(player)
+            if len(pair) < 2:
+                break
+            mm_teams.append(MMTeam(f"{pair[0].name}/{pair[1].name}", *pair))
+        if len(mm_teams) < 3:
+            print(f"⚠️ Skipping row {idx + 2}: unknown player or missing points")
+            continue
+        team_name = str(row.iloc[0])
+        c_teams[team_name] = CTeam(team_name, mm_teams)
+    print(f"✅ {name}: {len(c_teams)} C teams")
+    return BacktestEvent(name, event_date, c_teams, points)
+
+
+def history_before(player, cutoff):
+    """Copy of a player with only rounds dated strictly before cutoff."""
+    past = Player(player.name, player.sand_bag_factor)
+    past.rounds = [r for r in player.rounds if r.date is not None and r.date < cutoff]
+    return past
+
+
+def event_handicap(player, event_date):
+    """
+    Course handicap the player played off: the round on the event date if
+    there is one (known before tee-off), else the latest earlier round.
+    """
+    on_day = [r.handicap for r in player.rounds
+              if r.date == event_date and isinstance(r.handicap, Real) and r.handicap == r.handicap]
+    if on_day:
+        return on_day[0]
+    return player_course_handicap(history_before(player, event_date))
+
+
+def as_of(event):
+    """
+    The event's C teams rebuilt on players with history cut at the event
+    date, plus each player's event-day course handicap by name.
+    """
+    players, handicaps = {}, {}
+
+    def past(p):
+        if p.name not in players:
+            players[p.name] = history_before(p, event.date)
+            handicaps[p.name] = event_handicap(p, event.date)
+        return players[p.name]
+
+    c_teams = {
+        name: CTeam(name, [MMTeam(m.name, *(past(p) for p in m.players)) for m in c_team.mm_teams])
+        for name, c_team in event.c_teams.items()
+    }
+    return c_teams, {name: h for name, h in handicaps.items() if h is not None}
+
+
+@dataclass
+class EventForecast:
+    """Predicted vs actual outcome of one event."""
+    event: str
+    team_names: List[str]
+    win_prob: np.ndarray       # (n_teams,)
+    finish_prob: np.ndarray    # (n_teams, n_teams)
+    actual_win: np.ndarray     # (n_teams,) 1 for the winner(s), split on ties
+    actual_finish: np.ndarray  # (n_teams, n_teams) one-hot actual positions, split on ties
+    handicaps: np.ndarray      # (n_players,) course handicap used per player
+    actual_points: np.ndarray  # (n_players,) actual Day-2 points per player
+
+
+def _actual_finish(totals):
+    """One-hot finish positions from actual scores, ties shared evenly."""
+    scores = np.asarray(totals, dtype=float)
+    n = len(scores)
+    finish = np.zeros((n, n))
+    for i, s in enumerate(scores):
+        better = int((scores > s).sum())
+        tied = int((scores == s).sum())
+        finish[i, better:better + tied] = 1 / tied
+    return finish
+
+
+def forecast_event(event, n_sims=10000, seed=None, sampler=None, calibrated=True, course=None):
+    """Simulate an event on pre-event history and pair it with the actual result."""
+    c_teams, handicaps = as_of(event)
+    field = compile_field(c_teams, handicaps)
+    result = simulate_tournament(field, n_sims, rng=seed, calibrated=calibrated, sampler=sampler,
+                                 course=course)
+    totals = event.team_totals()
+    finish = _actual_finish([totals[t] for t in field.team_names])
+    return EventForecast(
+        event=event.name,
+        team_names=list(field.team_names),
+        win_prob=result.win_prob,
+        finish_prob=result.finish_prob,
+        actual_win=finish[:, 0],
+        actual_finish=finish,
+        handicaps=field.course_handicaps,
+        actual_points=np.array([event.player_points[p.name] for p in field.players]),
+    )
+
+
+def brier_score(forecasts):
+    return float(np.mean([((f.win_prob - f.actual_win) ** 2).sum() for f in forecasts]))
+
+
+def log_loss(forecasts):
+    return float(np.mean([-(f.actual_win * np.log(np.clip(f.win_prob, LOG_LOSS_EPS, 1))).sum()
+                          for f in forecasts]))
+
+
+def finish_brier_score(forecasts):
+    return float(np.mean([((f.finish_prob - f.actual_finish) ** 2).sum(axis=0).mean()
+                          for f in forecasts]))
+
+
+def calibration_curve(forecasts, bins=CALIBRATION_BINS):
+    """
+    Predicted vs observed win rate, pooling every team of every event.
+
+    Returns:
+        List of dicts (low, high, predicted, observed, count) for non-empty bins.
+    """
+    p = np.concatenate([f.win_prob for f in forecasts])
+    y = np.concatenate([f.actual_win for f in forecasts])
+    edges = np.linspace(0, 1, bins + 1)
+    which = np.clip(np.digitize(p, edges) - 1, 0, bins - 1)
+    rows = []
+    for b in range(bins):
+        mask = which == b
+        if mask.any():
+            rows.append({"low": edges[b], "high": edges[b + 1], "predicted": float(p[mask].mean()),
+                         "observed": float(y[mask].mean()), "count": int(mask.sum())})
+    return rows
+
+
+def fit_calibration(handicaps, actual_points, bands=None, course=None, min_count=1):
+    """
+    Re-fit calibration bands: mean actual minus expected uncalibrated points.
+
+    Args:
+        handicaps (array-like): Course handicap per observation.
+        actual_points (array-like): Actual Stableford points per observation.
+        bands (iterable[(low, high)] | None): Handicap bands (default: the
+            CALIBRATION_CORRECTIONS bands).
+        course (CourseModel | None): Course tables (default: default_course()).
+        min_count (int): Bands with fewer observations are left out.
+
+    Returns:
+        dict in the CALIBRATION_CORRECTIONS format.
+    """
+    course = course or default_course()
+    handicaps = np.asarray(handicaps, dtype=float)
+    residual = np.asarray(actual_points, dtype=float) - course.expected_stableford(handicaps)
+    fitted = {}
+    for low, high in (bands or CALIBRATION_CORRECTIONS.keys()):
+        mask = (handicaps >= low) & (handicaps <= high)
+        if mask.sum() >= min_count:
+            fitted[(low, high)] = round(float(residual[mask].mean()), 2)
+    return fitted
+
+
+def refit_course(fitted, course=None):
+    """
+    CourseModel with the re-fitted bands applied; bands left out of fitted
+    keep their current correction.
+    """
+    course = course or default_course()
+    bands = {**dict(course.calibration_bands), **fitted}
+    return course_model(course.hole_pars, course.stroke_index, name=course.name, calibration=bands)
+
+
+def _metrics(forecasts):
+    return {"brier": brier_score(forecasts),
+            "log_loss": log_loss(forecasts),
+            "finish_brier": finish_brier_score(forecasts)}
+
+
+@dataclass
+class BacktestReport:
+    forecasts: List[EventForecast]
+    params: Optional[dict] = None
+    metrics: dict = dc_field(default_factory=dict)
+    calibration: list = dc_field(default_factory=list)
+    fitted_corrections: dict = dc_field(default_factory=dict)
+    refit_metrics: Optional[dict] = None  # metrics forecasting with fitted_corrections
+
+
+def run_backtest(events, n_sims=10000, seed=None, sampler=None, calibrated=True, params=None,
+                 refit=True):
+    """
+    Forecast every event and compute the metrics.
+
+    With refit (and calibrated) the events are forecast a second time with the
+    re-fitted calibration bands and the same seed, giving refit_metrics.
+    """
+    forecasts = [forecast_event(e, n_sims, seed, sampler, calibrated) for e in events]
+    fitted = fit_calibration(np.concatenate([f.handicaps for f in forecasts]),
+                             np.concatenate([f.actual_points for f in forecasts]))
+    refit_metrics = None
+    if refit and calibrated and fitted:
+        course = refit_course(fitted, getattr(sampler, "course", None))
+        refit_metrics = _metrics([forecast_event(e, n_sims, seed, sampler, calibrated, course)
+                                  for e in events])
+    return BacktestReport(
+        forecasts=forecasts,
+        params=params,
+        metrics=_metrics(forecasts),
+        calibration=calibration_curve(forecasts),
+        fitted_corrections=fitted,
+        refit_metrics=refit_metrics,
+    )
+
+
+_worker_events = None
+
+
+def _init_worker(events):
+    global _worker_events
+    _worker_events = events
+
+
+def _run_params(params, n_sims, seed, calibrated, refit):
+    sampler = HistorySampler(**params) if params is not None else None
+    return run_backtest(_worker_events, n_sims, seed, sampler, calibrated, params, refit)
+
+
+def sweep(events, param_grid, n_sims=10000, seed=None, calibrated=True, workers=None, refit=True):
+    """
+    Backtest every parameter set in parallel.
+
+    Args:
+        events (list[BacktestEvent]): Events to replay.
+        param_grid (list[dict | None]): HistorySampler keyword arguments per run;
+            None runs the parametric model.
+        workers (int | None): Worker processes (default: os.cpu_count()).
+        refit (bool): Also score each run with its re-fitted calibration bands.
+
+    Returns:
+        list[BacktestReport] sorted by log-loss, best first.
+    """
+    workers = workers or os.cpu_count() or 1
+    n = len(param_grid)
+    if workers == 1 or n <= 1:
+        _init_worker(events)
+        reports = [_run_params(p, n_sims, seed, calibrated, refit) for p in param_grid]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, n), initializer=_init_worker,
+                                 initargs=(events,)) as pool:
+            reports = list(pool.map(_run_params, param_grid, [n_sims] * n, [seed] * n,
+                                    [calibrated] * n, [refit] * n))
+    reports.sort(key=lambda r: r.metrics["log_loss"])
+    return reports
+
+
+def print_backtest(report):
+    m = report.metrics
+    print(f"\n📈 Backtest over {len(report.forecasts)} event(s)"
+          + (f" with {report.params}" if report.params else ""))
+    print(f"   Brier {m['brier']:.4f} | log-loss {m['log_loss']:.4f} | finish Brier {m['finish_brier']:.4f}")
+    print(f"\n{'Bin':<12} {'Pred %':>8} {'Obs %':>8} {'N':>5}")
+    for row in report.calibration:
+        print(f"{row['low']:.1f}-{row['high']:.1f}    {row['predicted'] * 100:>7.2f} "
+              f"{row['observed'] * 100:>7.2f} {row['count']:>5}")
+    print("\nRe-fitted calibration corrections:")
+    for band, value in report.fitted_corrections.items():
+        print(f"   {band}: {value:+.2f} (current {CALIBRATION_CORRECTIONS.get(band, 0):+.2f})")
+    if report.refit_metrics:
+        r = report.refit_metrics
+        print(f"   Forecast with re-fitted bands: Brier {r['brier']:.4f} ({r['brier'] - m['brier']:+.4f}) | "
+              f"log-loss {r['log_loss']:.4f} ({r['log_loss'] - m['log_loss']:+.4f}) | "
+              f"finish Brier {r['finish_brier']:.4f} ({r['finish_brier'] - m['finish_brier']:+.4f})")
@@ -0,0 +1,392 @@
+# golf_bench.py
+"""
+Benchmarks for the scoring and simulation hot paths.
+
+Runs every benchmark on a synthetic dataset, records throughput and peak
+memory in a JSON history, and compares the latest run against an earlier one
+to flag regressions. The imports command checks the cold-import time of the
+modules every worker process and app start loads against a fixed budget.
+
+Usage:
+    python src/golf_bench.py run --scale club
+    python src/golf_bench.py run --scale league --only simulate_tournament
+    python src/golf_bench.py compare --threshold 0.10
+    python src/golf_bench.py imports
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from golf_classes import CTeam, MMTeam, Player, PlayerRoundInfo
+from golf_scoring import (calibrated_simulate_round, compute_real_stableford,
+                          compute_real_stableford_batch, hole_pars, simulate_round,
+                          simulate_rounds, strokes_allocated_per_hole)
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent.parent / "benchmarks" / "history.json"
+DEFAULT_THRESHOLD = 0.10
+# Peak memory changes below this many MB are noise, not regressions.
+MEMORY_FLOOR_MB = 1.0
+
+# Cold-import budgets in ms (NumPy included) for the modules loaded at worker
+# spawn and app start, none of which may pull in the heavy modules below.
+IMPORT_BUDGETS_MS = {
+    "golf_classes": 250,
+    "golf_scoring": 250,
+    "golf_utils": 300,
+    "golf_simulation": 350,
+    "golf_runner": 350,
+}
+HEAVY_MODULES = ("scipy", "pandas", "openpyxl", "difflib")
+
+# name -> (players, rounds per player, C teams)
+SCALES = {
+    "club": (200, 40, 12),
+    "multi-club": (1000, 60, 24),
+    "league": (5000, 80, 48),
+}
+
+
+# --- Synthetic data ---
+
+def synthetic_players(n_players, n_rounds, seed=0):
+    """Players with hole-by-hole rounds, a third of them tournament rounds."""
+    rng = np.random.default_rng(seed)
+    pars = np.array(hole_pars)
+    players = {}
+    for i in range(n_players):
+        player = Player(f"Player {i:05d}")
+        handicap = int(rng.integers(0, 37))
+        over = rng.poisson(handicap / 18 + 0.3, size=(n_rounds, 18))
+        for k in range(n_rounds):
+            holes = (pars + over[k]).tolist()
+            total = int(sum(holes))
+            player.rounds.append(PlayerRoundInfo(
+                player=player, tournament_name="individual" if k % 3 else f"Event {k}",
+                tournament_flag=k % 3 == 0, round_number=1, handicap=handicap, tee="White",
+                hole_scores=holes, total=total, net=total - handicap,
+                date=date(2024, 1, 1) + timedelta(days=k * 3), index=handicap * 0.9,
+                cr=70.1, sr=125, course_played="Home"))
+            player.rounds[-1].completed = True
+        players[player.name] = player
+    return players
+
+
+def synthetic_teams(players, n_teams):
+    names = list(players)
+    c_teams = {}
+    for t in range(n_teams):
+        mm_teams = []
+        for m in range(3):
+            a, b = (players[names[(t * 6 + m * 2 + k) % len(names)]] for k in range(2))
+            mm_teams.append(MMTeam(f"MM {t}-{m}", a, b))
+        c_teams[f"Team {t}"] = CTeam(f"Team {t}", mm_teams)
+    return c_teams
+
+
+# --- Benchmarks ---
+# Each setup takes the dataset and returns (callable, operations per call).
+
+def _bench_simulate_round(data):
+    return lambda: [simulate_round(h) for h in range(0, 36)], 36
+
+
+def _bench_calibrated_simulate_round(data):
+    return lambda: [calibrated_simulate_round(h) for h in range(0, 36)], 36
+
+
+def _bench_simulate_rounds(data):
+    return lambda: simulate_rounds(np.arange(72) % 36, 10000, 0), 720000
+
+
+def _bench_compute_real_stableford(data):
+    rounds = [r for p in list(data["players"].values())[:50] for r in p.rounds]
+    return lambda: [compute_real_stableford(r) for r in rounds], len(rounds)
+
+
+def _bench_compute_real_stableford_batch(data):
+    rounds = [r for p in data["players"].values() for r in p.rounds]
+    holes = np.array([list(r.hole_scores) for r in rounds])
+    handicaps = np.array([r.handicap for r in rounds])
+    return lambda: compute_real_stableford_batch(holes, handicaps), len(rounds)
+
+
+def _bench_strokes_allocated_per_hole(data):
+    return lambda: [strokes_allocated_per_hole(h) for h in range(0, 55)], 55
+
+
+def _bench_score_randomness_test(data):
+    from golf_stats import score_randomness_test
+    players = list(data["players"].values())[:100]
+    return lambda: [score_randomness_test(p) for p in players], len(players)
+
+
+def _bench_top_sandbaggers(data):
+    from golf_stats import top_sandbaggers
+    return lambda: top_sandbaggers(data["players"]), len(data["players"])
+
+
+def _bench_get_close_player_matches(data):
+    from golf_utils import get_close_player_matches
+    queries = [name.replace("Player", "Plyer") for name in list(data["players"])[:100]]
+    return lambda: [get_close_player_matches(q, data["players"]) for q in queries], len(queries)
+
+
+def _bench_pickle_roundtrip(data):
+    from golf_utils import load_pickle, save_pickle
+    path = data["tmp"] / "players.pkl"
+    payload = {"players": data["players"]}
+
+    def run():
+        with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+            save_pickle(payload, path)
+            load_pickle(path)
+    return run, len(data["players"])
+
+
+def _bench_simulate_tournament(data):
+    from golf_simulation import simulate_tournament
+    return lambda: simulate_tournament(data["c_teams"], 20000, rng=0), 20000
+
+
+BENCHMARKS = {
+    "simulate_round": _bench_simulate_round,
+    "calibrated_simulate_round": _bench_calibrated_simulate_round,
+    "simulate_rounds": _bench_simulate_rounds,
+    "compute_real_stableford": _bench_compute_real_stableford,
+    "compute_real_stableford_batch": _bench_compute_real_stableford_batch,
+    "strokes_allocated_per_hole": _bench_strokes_allocated_per_hole,
+    "score_randomness_test": _bench_score_randomness_test,
+    "top_sandbaggers": _bench_top_sandbaggers,
+    "get_close_player_matches": _bench_get_close_player_matches,
+    "pickle_roundtrip": _bench_pickle_roundtrip,
+    "simulate_tournament": _bench_simulate_tournament,
+}
+
+
+def measure(fn, ops, repeat=5, min_time=0.2):
+    """
+    Best-of-repeat timing plus peak traced memory of one call.
+
+    Returns:
+        dict with seconds (per call), ops_per_sec and peak_mb.
+    """
+    fn()  # warm-up: imports, caches, lazy tables
+    best = float("inf")
+    for _ in range(repeat):
+        calls, start = 0, time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time or calls >= 1000:
+                break
+        best = min(best, elapsed / calls)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "ops_per_sec": ops / best, "peak_mb": peak / 2 ** 20}
+
+
+def run_benchmarks(scale="club", only=None, repeat=5):
+    n_players, n_rounds, n_teams = SCALES[scale]
+    players = synthetic_players(n_players, n_rounds)
+    data = {"players": players, "c_teams": synthetic_teams(players, n_teams)}
+    results = {}
+    # Scratch space for benchmarks that write files, removed after the run.
+    with tempfile.TemporaryDirectory() as tmp:
+        data["tmp"] = Path(tmp)
+        for name, setup in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            fn, ops = setup(data)
+            results[name] = measure(fn, ops, repeat=repeat)
+            r = results[name]
+            print(f"{name:<32} {r['ops_per_sec']:>14,.0f} ops/s {r['seconds'] * 1e3:>10.2f} ms "
+                  f"{r['peak_mb']:>9.1f} MB")
+    return results
+
+
+# --- Import time ---
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module, repeat=3):
+    """Best-of-repeat cold import time of module in a fresh interpreter."""
+    src = Path(__file__).resolve().parent
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(src), os.environ.get("PYTHONPATH")])))
+    env.pop("GOLF_INSTRUMENT", None)
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                             capture_output=True, text=True, cwd=src, env=env, check=True)
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or probe["seconds"] < best["seconds"]:
+            best = probe
+    return best
+
+
+def check_imports(budgets=IMPORT_BUDGETS_MS, repeat=3):
+    """
+    Import every budgeted module cold and compare with its budget.
+
+    Returns:
+        (rows, failures): per-module dicts (module, ms, budget_ms, heavy) and
+        the modules that were over budget or loaded a heavy module.
+    """
+    rows, failures = [], []
+    for module, budget in budgets.items():
+        probe = measure_import(module, repeat)
+        row = {"module": module, "ms": probe["seconds"] * 1e3, "budget_ms": budget, "heavy": probe["heavy"]}
+        rows.append(row)
+        if row["ms"] > budget or row["heavy"]:
+            failures.append(module)
+    return rows, failures
+
+
+# --- History ---
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=Path(__file__).resolve().parent, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=DEFAULT_HISTORY):
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(entry, path=DEFAULT_HISTORY):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    history = load_history(path)
+    history.append(entry)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def compare(history, threshold=DEFAULT_THRESHOLD, scale=None, baseline=None):
+    """
+    Compare the latest run against a baseline run of the same scale.
+
+    Args:
+        history (list[dict]): Recorded runs, oldest first.
+        threshold (float): Relative throughput drop / memory growth flagged.
+        scale (str | None): Scale to compare (default: the latest run's).
+        baseline (str | None): Commit of the baseline run (default: the previous run).
+
+    Returns:
+        (rows, regressions): per-benchmark comparison dicts and the names
+        that regressed.
+    """
+    runs = [h for h in history if scale is None or h["scale"] == scale]
+    if len(runs) < 2:
+        raise ValueError("Need at least two recorded runs of the same scale to compare.")
+    latest = runs[-1]
+    candidates = [h for h in runs[:-1] if h["scale"] == latest["scale"]
+                  and (baseline is None or h.get("commit") == baseline)]
+    if not candidates:
+        raise ValueError("No baseline run found.")
+    base = candidates[-1]
+
+    rows, regressions = [], []
+    for name, new in latest["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        speed = new["ops_per_sec"] / old["ops_per_sec"]
+        memory = new["peak_mb"] / old["peak_mb"] if old["peak_mb"] else 1.0
+        grew = memory > 1 + threshold and new["peak_mb"] - old["peak_mb"] > MEMORY_FLOOR_MB
+        regressed = speed < 1 - threshold or grew
+        rows.append({"name": name, "speedup": speed, "memory_ratio": memory, "regressed": regressed})
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring and simulation hot paths.")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run benchmarks and record them")
+    run.add_argument("--scale", choices=SCALES, default="club")
+    run.add_argument("--only", nargs="*", choices=BENCHMARKS, help="run only these benchmarks")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--no-record", action="store_true", help="do not write to the history")
+
+    cmp = sub.add_parser("compare", help="compare the latest run with an earlier one")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    cmp.add_argument("--scale", choices=SCALES, default=None)
+    cmp.add_argument("--baseline", default=None, help="commit of the baseline run")
+
+    imports = sub.add_parser("imports", help="check cold-import times against their budgets")
+    imports.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "imports":
+        rows, failures = check_imports(repeat=args.repeat)
+        for r in rows:
+            flag = "❌" if r["module"] in failures else "✅"
+            heavy = f" loads {', '.join(r['heavy'])}" if r["heavy"] else ""
+            print(f"{flag} {r['module']:<24} {r['ms']:>7.1f} ms (budget {r['budget_ms']} ms){heavy}")
+        return 1 if failures else 0
+
+    if args.command == "run":
+        results = run_benchmarks(args.scale, args.only, args.repeat)
+        if not args.no_record:
+            append_history({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "scale": args.scale,
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "results": results,
+            }, args.history)
+        return 0
+
+    rows, regressions = compare(load_history(args.history), args.threshold, args.scale, args.baseline)
+    for r in rows:
+        flag = "❌ REGRESSION" if r["regressed"] else ""
+        print(f"{r['name']:<32} {r['speedup']:>7.2f}x speed {r['memory_ratio']:>7.2f}x memory {flag}")
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
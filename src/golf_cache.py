@@ -0,0 +1,236 @@
+# golf_cache.py
+"""
+Content-addressed on-disk cache of simulation outputs.
+
+Two kinds of entries live in the cache directory:
+
+    <key>.npy   one player's column of simulated Day-2 scores (n_sims,)
+    <key>.npz   a whole TournamentResult for a field
+
+Player keys hash the player's name, round data, course handicap, the model
+(the CourseModel's outcome, calibration and points tables, sampler settings),
+n_sims and seed. Every player draws from its own random stream derived from
+(seed, name), so when one MM pair changes only the new players' columns are
+simulated and every other column is reused. Result keys hash the ordered
+field plus all of its player keys.
+
+Entries are evicted least-recently-used (by file mtime, refreshed on every
+hit) once the directory exceeds max_bytes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import golf_scoring
+from golf_sampler import sample_history
+from golf_simulation import CompiledField, TournamentResult, compile_field, score_field
+
+# Bump when simulation code changes in a way that alters cached outputs.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def stable_name_key(name):
+    """Name -> tuple of 32-bit ints, stable across runs (unlike hash())."""
+    digest = hashlib.sha256(name.encode()).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], "little") for i in range(0, 16, 4))
+
+
+def player_stream(seed, name):
+    """Independent Generator for one player's column."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=stable_name_key(name)))
+
+
+# Player.rounds_version -> player_data_version, so unchanged players are not rehashed.
+_data_versions = {}
+_MAX_DATA_VERSIONS = 65536
+
+
+def player_data_version(player):
+    """Hash of the round data a player's simulated scores can depend on."""
+    version = getattr(player, "rounds_version", None)
+    if version in _data_versions:
+        return _data_versions[version]
+    h = hashlib.sha256()
+    for r in player.rounds:
+        h.update(repr((r.date, r.handicap, r.net, r.tournament_flag, r.tournament_name,
+                       getattr(r, "duplicate", False), list(r.hole_scores))).encode())
+    digest = h.hexdigest()
+    if version is not None:
+        if len(_data_versions) >= _MAX_DATA_VERSIONS:
+            _data_versions.clear()
+        _data_versions[version] = digest
+    return digest
+
+
+def _table_digest(course):
+    h = hashlib.sha256()
+    for table in (course.hole_pars, course.stroke_index, course.outcome_cdfs,
+                  course.calibration, course.hole_points):
+        table = np.ascontiguousarray(table)
+        h.update(repr((table.dtype.str, table.shape)).encode())
+        h.update(table.tobytes())
+    return h.hexdigest()
+
+
+def model_fingerprint(calibrated=True, sampler=None, course=None):
+    """Hash of every model setting that changes simulated scores."""
+    course = course or (sampler.course if sampler is not None else None) or golf_scoring.default_course()
+    return _digest({
+        "version": CACHE_VERSION,
+        # The tables simulations actually read, not the dicts they were built from.
+        "tables": _table_digest(course),
+        "calibrated": calibrated,
+        "sampler": None if sampler is None else sampler.settings() if hasattr(sampler, "settings") else {
+            "decay": sampler.decay,
+            "tournament_weight": sampler.tournament_weight,
+            "prior_rounds": sampler.prior_rounds,
+        },
+    })
+
+
+class SimulationCache:
+    """
+    Disk cache of per-player score columns and tournament results.
+
+    Args:
+        path (str | Path): Cache directory (created if missing).
+        max_bytes (int): Size cap; least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # --- Storage ---
+
+    def _file(self, key, suffix):
+        return self.path / f"{key}{suffix}"
+
+    def _load(self, key, suffix):
+        file = self._file(key, suffix)
+        try:
+            if suffix == ".npz":
+                with np.load(file, allow_pickle=False) as archive:
+                    data = dict(archive)
+            else:
+                data = np.load(file, allow_pickle=False)
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        os.utime(file)  # mark as recently used
+        self.hits += 1
+        return data
+
+    def _store(self, key, suffix, data):
+        file = self._file(key, suffix)
+        tmp = file.with_name(file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            if suffix == ".npz":
+                np.savez(f, **data)
+            else:
+                np.save(f, data)
+        os.replace(tmp, file)
+
+    def size(self):
+        return sum(f.stat().st_size for f in self.path.iterdir() if f.is_file())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = [(f.stat().st_mtime, f.stat().st_size, f) for f in self.path.iterdir()
+                   if f.suffix in (".npy", ".npz")]
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for f in self.path.iterdir():
+            if f.suffix in (".npy", ".npz"):
+                f.unlink()
+
+    # --- Keys ---
+
+    def player_keys(self, field, n_sims, seed, model):
+        return [
+            _digest([model, n_sims, seed, player.name, player_data_version(player), float(h)])
+            for player, h in zip(field.players, field.course_handicaps)
+        ]
+
+    # --- Simulation ---
+
+    def player_scores(self, field, n_sims, seed, calibrated=True, sampler=None, course=None):
+        """
+        (n_sims, n_players) score matrix for a compiled field, simulating only
+        the players whose columns are not cached yet.
+        """
+        if seed is None:
+            raise ValueError("A seed is required for cached simulations.")
+        model = model_fingerprint(calibrated, sampler, course)
+        keys = self.player_keys(field, n_sims, seed, model)
+        scores = np.empty((n_sims, field.n_players))
+        for j, (key, player) in enumerate(zip(keys, field.players)):
+            column = self._load(key, ".npy")
+            if column is None:
+                column = self._simulate_player(player, field.course_handicaps[j], n_sims, seed,
+                                               calibrated, sampler, course)
+                self._store(key, ".npy", column)
+            scores[:, j] = column
+        self.evict()
+        return scores
+
+    @staticmethod
+    def _simulate_player(player, handicap, n_sims, seed, calibrated, sampler, course):
+        rng = player_stream(seed, player.name)
+        if sampler is None:
+            column = golf_scoring.simulate_rounds([handicap], n_sims, rng, calibrated=calibrated,
+                                                  course=course)
+        elif hasattr(sampler, "outcome_tables"):
+            column = sampler.sample([player], n_sims, rng, [handicap], calibrated)
+        else:
+            column = sample_history(sampler.tables([player]), n_sims, rng, [handicap],
+                                    calibrated, course or sampler.course)
+        return np.asarray(column, dtype=float)[:, 0]
+
+    def simulate_tournament(self, c_teams, n_sims, seed, calibrated=True, sampler=None, course=None):
+        """
+        Cached equivalent of golf_simulation.simulate_tournament.
+
+        Uses per-player random streams, so results differ from (but are
+        distributed like) simulate_tournament with the same seed.
+        """
+        field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+        if seed is None:
+            raise ValueError("A seed is required for cached simulations.")
+        model = model_fingerprint(calibrated, sampler, course)
+        key = _digest([model, n_sims, seed, field.team_names, field.mm_names,
+                       field.mm_players.tolist(), field.team_mm.tolist(),
+                       self.player_keys(field, n_sims, seed, model)])
+        cached = self._load(key, ".npz")
+        if cached is not None:
+            return TournamentResult(list(field.team_names), int(cached["n_sims"]),
+                                    cached["finish_counts"], cached["score_sums"],
+                                    cached["score_hist"])
+
+        player_scores = self.player_scores(field, n_sims, seed, calibrated, sampler, course)
+        tie_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+        result = score_field(field, player_scores, tie_rng)
+        self._store(key, ".npz", {"n_sims": np.array(result.n_sims),
+                                  "finish_counts": result.finish_counts,
+                                  "score_sums": result.score_sums,
+                                  "score_hist": result.score_hist})
+        self.evict()
+        return result
@@ -1,16 +1,419 @@
 # golf_classes.py
 
+import itertools
+import math
+from array import array
+from numbers import Real
+
 import numpy as np
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
 
+# Every change to any player's rounds draws a new number, so a rounds_version
+# identifies one state of one player's rounds for the life of the process.
+_versions = itertools.count(1)
+
+
+def _real(value):
+    """True for a numeric, non-NaN value (bools excluded)."""
+    return isinstance(value, Real) and not isinstance(value, bool) and value == value
+
+
+# Net scores are counted per whole stroke over this range; scores outside it
+# fall into the end slots, which still order them exactly.
+NET_SCORE_RANGE = (0, 200)
+
+
+class NetSummary:
+    """
+    Running count, sum and sum of squares of a set of net scores, plus a
+    Fenwick tree of score counts over NET_SCORE_RANGE (one slot per whole
+    stroke) for rank statistics. add, discard, rank and quantile are
+    O(log range); fractional scores are kept exactly within their slot.
+    """
+
+    __slots__ = ('n', 'total', 'total_sq', '_tree', '_slots')
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._tree = None  # allocated on the first add
+        self._slots = {}   # slot -> {score: count}
+
+    @staticmethod
+    def _slot(value):
+        low, high = NET_SCORE_RANGE
+        return int(math.floor(min(max(value, low), high))) - low
+
+    def _update(self, slot, delta):
+        tree = self._tree
+        i = slot + 1
+        while i <= len(tree):
+            tree[i - 1] += delta
+            i += i & -i
+
+    def _below(self, slot):
+        """Number of scores in slots before slot."""
+        tree, i, n = self._tree, slot, 0
+        while i > 0:
+            n += tree[i - 1]
+            i -= i & -i
+        return n
+
+    def _kth(self, k):
+        """The k-th smallest score (0-based), by binary lifting on the tree."""
+        tree, pos = self._tree, 0
+        step = 1 << (len(tree).bit_length() - 1)
+        while step:
+            if pos + step <= len(tree) and tree[pos + step - 1] <= k:
+                pos += step
+                k -= tree[pos - 1]
+            step >>= 1
+        for value, count in sorted(self._slots[pos].items()):
+            if k < count:
+                return value
+            k -= count
+
+    def add(self, value):
+        self.n += 1
+        self.total += value
+        self.total_sq += value * value
+        if self._tree is None:
+            self._tree = array('i', bytes(4 * (NET_SCORE_RANGE[1] - NET_SCORE_RANGE[0] + 1)))
+        slot = self._slot(value)
+        counts = self._slots.setdefault(slot, {})
+        counts[value] = counts.get(value, 0) + 1
+        self._update(slot, 1)
+
+    def discard(self, value):
+        slot = self._slot(value)
+        counts = self._slots[slot]
+        if counts[value] == 1:
+            del counts[value]
+            if not counts:
+                del self._slots[slot]
+        else:
+            counts[value] -= 1
+        self._update(slot, -1)
+        self.n -= 1
+        self.total -= value
+        self.total_sq -= value * value
+
+    @property
+    def values(self):
+        """The scores in ascending order (a new list)."""
+        out = []
+        for slot in sorted(self._slots):
+            for value, count in sorted(self._slots[slot].items()):
+                out.extend([value] * count)
+        return out
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else None
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), or None below two scores."""
+        if self.n < 2:
+            return None
+        return max(self.total_sq - self.total * self.total / self.n, 0.0) / (self.n - 1)
+
+    def rank(self, value):
+        """Number of scores strictly below value."""
+        if not self.n:
+            return 0
+        slot = self._slot(value)
+        return self._below(slot) + sum(c for v, c in self._slots.get(slot, {}).items() if v < value)
+
+    def quantile(self, q):
+        """Linearly interpolated quantile (as np.quantile), or None if empty."""
+        if not self.n:
+            return None
+        pos = q * (self.n - 1)
+        lo = math.floor(pos)
+        hi = min(lo + 1, self.n - 1)
+        low = self._kth(lo)
+        return low + (self._kth(hi) - low) * (pos - lo)
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+
+class _Moments:
+    __slots__ = ('n', 'total', 'total_sq')
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, value, sign=1):
+        self.n += sign
+        self.total += sign * value
+        self.total_sq += sign * value * value
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else None
+
+
+class RoundStats:
+    """
+    Aggregates of one player's rounds, updated as rounds are added, removed
+    or edited instead of rescanning player.rounds.
+
+    For tournament (True) and casual (False) rounds:
+
+        counted[flag]   NetSummary of completed, non-duplicate rounds with a
+                        numeric net (compute_sand_bag_factor)
+        posted[flag]    NetSummary of every round with a numeric net
+                        (score_randomness_test, sandbag_stats)
+        stableford[flag]  Stableford points of non-duplicate rounds with 18
+                        hole scores and a handicap (the HistorySampler filter),
+                        rescored in one batch when first read
+
+    irregular counts rounds whose net is set but not a number (or NaN).
+    """
+
+    def __init__(self, rounds=()):
+        self.reset(rounds)
+
+    def reset(self, rounds=()):
+        """Recompute everything from a list of rounds."""
+        self.version = next(_versions)
+        self.counted = {True: NetSummary(), False: NetSummary()}
+        self.posted = {True: NetSummary(), False: NetSummary()}
+        self._stableford = {True: _Moments(), False: _Moments()}
+        self.irregular = 0
+        self._entries = {}   # id(round) -> [contribution, multiplicity]
+        self._pending = {}   # id(round) -> round awaiting Stableford rescoring
+        for rnd in rounds:
+            self.add(rnd)
+
+    @staticmethod
+    def _contribution(rnd):
+        net = getattr(rnd, 'net', None)
+        tournament = bool(getattr(rnd, 'tournament_flag', False))
+        duplicate = bool(getattr(rnd, 'duplicate', False))
+        scored = _real(net)
+        counted = scored and bool(getattr(rnd, 'completed', False)) and not duplicate
+        holes = getattr(rnd, '_hole_scores', None)
+        handicap = getattr(rnd, 'handicap', None)
+        rateable = (not duplicate and holes is not None and len(holes) == 18 and _real(handicap)
+                    and (isinstance(holes, array) or all(isinstance(h, Real) for h in holes)))
+        return [tournament, net if scored else None, counted, net is not None and not scored, rateable, None]
+
+    def add(self, rnd):
+        key = id(rnd)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[1] += 1
+            self._apply(entry[0], 1)
+        else:
+            contribution = self._contribution(rnd)
+            self._entries[key] = [contribution, 1]
+            self._apply(contribution, 1)
+            if contribution[4]:
+                self._pending[key] = rnd
+        self.version = next(_versions)
+
+    def discard(self, rnd):
+        """Remove one occurrence of rnd; False if it is not tracked."""
+        key = id(rnd)
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        self._apply(entry[0], -1)
+        entry[1] -= 1
+        if not entry[1]:
+            del self._entries[key]
+            self._pending.pop(key, None)
+        self.version = next(_versions)
+        return True
+
+    def update(self, rnd, name, value):
+        """Set rnd.<name> = value, moving the round's contribution if it is tracked."""
+        entry = self._entries.get(id(rnd))
+        if entry is None:
+            object.__setattr__(rnd, name, value)
+            return
+        copies = entry[1]
+        for _ in range(copies):
+            self.discard(rnd)
+        object.__setattr__(rnd, name, value)
+        for _ in range(copies):
+            self.add(rnd)
+
+    def _apply(self, contribution, sign):
+        tournament, net, counted, irregular, _, points = contribution
+        if net is not None:
+            summary = self.posted[tournament]
+            summary.add(net) if sign > 0 else summary.discard(net)
+            if counted:
+                summary = self.counted[tournament]
+                summary.add(net) if sign > 0 else summary.discard(net)
+        self.irregular += sign * irregular
+        if points is not None:
+            self._stableford[tournament].add(points, sign)
+
+    def _rescore_pending(self):
+        if not self._pending:
+            return
+        from golf_scoring import compute_real_stableford_batch
+        keys = list(self._pending)
+        rounds = list(self._pending.values())
+        points = compute_real_stableford_batch(
+            np.array([[int(h) for h in r.hole_scores] for r in rounds]),
+            np.array([r.handicap for r in rounds], dtype=float))
+        for key, value in zip(keys, points.tolist()):
+            contribution, copies = self._entries[key]
+            contribution[5] = float(value)
+            self._stableford[contribution[0]].add(float(value), copies)
+        self._pending.clear()
+
+    def stableford_mean(self, tournament=None):
+        """Mean Stableford points of tournament, casual or (None) all rateable rounds."""
+        self._rescore_pending()
+        groups = [self._stableford[tournament]] if tournament is not None else list(self._stableford.values())
+        n = sum(g.n for g in groups)
+        return sum(g.total for g in groups) / n if n else None
+
+    def stableford_count(self, tournament=None):
+        self._rescore_pending()
+        groups = [self._stableford[tournament]] if tournament is not None else list(self._stableford.values())
+        return sum(g.n for g in groups)
+
+
+class RoundList(list):
+    """
+    player.rounds: a list that keeps its player's RoundStats current.
+
+    append / insert / remove / pop update the stats incrementally (O(log n)
+    per round, see NetSummary); slice
+    assignment and other bulk edits rebuild them.
+    """
+
+    _stats = None
+
+    def _rebuild(self):
+        if self._stats is not None:
+            self._stats.reset(self)
+
+    def append(self, rnd):
+        super().append(rnd)
+        if self._stats is not None:
+            self._stats.add(rnd)
+
+    def insert(self, index, rnd):
+        super().insert(index, rnd)
+        if self._stats is not None:
+            self._stats.add(rnd)
+
+    def extend(self, rounds):
+        for rnd in rounds:
+            self.append(rnd)
+
+    def __iadd__(self, rounds):
+        self.extend(rounds)
+        return self
+
+    def remove(self, rnd):
+        super().remove(rnd)
+        if self._stats is not None:
+            self._stats.discard(rnd)
+
+    def pop(self, index=-1):
+        rnd = super().pop(index)
+        if self._stats is not None:
+            self._stats.discard(rnd)
+        return rnd
+
+    def clear(self):
+        super().clear()
+        self._rebuild()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._rebuild()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._rebuild()
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._rebuild()
+        return self
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reordered()
+
+    def reverse(self):
+        super().reverse()
+        self._reordered()
+
+    def _reordered(self):
+        if self._stats is not None:
+            self._stats.version = next(_versions)
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
 class Player:
+    """
+    A golfer and their rounds.
+
+    player.rounds is a RoundList and player.stats its RoundStats, kept up to
+    date as rounds are appended or removed and as a round's fields (duplicate,
+    completed, net, ...) are set. rounds_version changes with every such edit.
+    """
+
     def __init__(self, name, sand_bag_factor=None):
         self.name = name
         self.rounds = []  # List of PlayerRoundInfo
         self.sand_bag_factor = sand_bag_factor
 
+    @property
+    def rounds(self):
+        return self._rounds
+
+    @rounds.setter
+    def rounds(self, rounds):
+        self._rounds = RoundList(rounds)
+        self._rounds._stats = self.stats = RoundStats(self._rounds)
+
+    @property
+    def rounds_version(self):
+        """Unique token of the current state of this player's rounds."""
+        return self.stats.version
+
+    @property
+    def sand_bag_factor(self):
+        """
+        Set directly, or by compute_sand_bag_factor; a computed factor is
+        recomputed with the same arguments once the rounds have changed.
+        """
+        value, args, version = self._sand_bag
+        if args is not None and version != self.stats.version:
+            self.compute_sand_bag_factor(*args)
+            value = self._sand_bag[0]
+        return value
+
+    @sand_bag_factor.setter
+    def sand_bag_factor(self, value):
+        self._sand_bag = (value, None, None)
+        self._sand_bag_token = next(_versions)
+
+    def _sand_bag_key(self):
+        """Changes whenever sand_bag_factor may have changed (see MMTeam)."""
+        return self._sand_bag_token, self.stats.version if self._sand_bag[1] is not None else None
+
     def compute_sand_bag_factor(self, min_rounds=5, scale_factor=0.5):
         """
         Compute sand_bag_factor for the Player.
@@ -18,55 +421,159 @@ class Player:
         If the number of tournament or casual rounds is below min_rounds,
         scale the result by scale_factor.
         """
-        # Only include rounds that are completed and have a numeric net
-        tournament_scores = [
-            r.net for r in self.rounds
-            if r.tournament_flag
-            and getattr(r, "completed", False)
-            and isinstance(r.net, (int, float))
-        ]
-        casual_scores = [
-            r.net for r in self.rounds
-            if not r.tournament_flag
-            and getattr(r, "completed", False)
-            and isinstance(r.net, (int, float))
-        ]
-
-        if tournament_scores and casual_scores:
-            mean_tourn = sum(tournament_scores) / len(tournament_scores)
-            mean_casual = sum(casual_scores) / len(casual_scores)
-            delta = mean_tourn - mean_casual
+        # Completed, non-duplicate rounds with a numeric net (see RoundStats.counted)
+        tournament_scores = self.stats.counted[True]
+        casual_scores = self.stats.counted[False]
+
+        if tournament_scores.n and casual_scores.n:
+            delta = tournament_scores.mean - casual_scores.mean
 
             # Dampen if either category has too few rounds
-            if len(tournament_scores) < min_rounds or len(casual_scores) < min_rounds:
+            if tournament_scores.n < min_rounds or casual_scores.n < min_rounds:
                 delta *= scale_factor
-
-            self.sand_bag_factor = delta
         else:
             # Not enough data in one or both categories
-            self.sand_bag_factor = None
+            delta = None
+        self._sand_bag = (delta, (min_rounds, scale_factor), self.stats.version)
+        self._sand_bag_token = next(_versions)
+
+    def round_arrays(self):
+        """Return this player's rounds as contiguous column arrays (see rounds_to_arrays)."""
+        return rounds_to_arrays(self.rounds)
+
+    def __getstate__(self):
+        state = {k: v for k, v in self.__dict__.items()
+                 if k not in ('_rounds', 'stats', '_sand_bag', '_sand_bag_token')}
+        state.update(rounds=list(self.rounds), sand_bag_factor=self._sand_bag[0])
+        return state
+
+    def __setstate__(self, state):
+        # Also reads pickles from before rounds / sand_bag_factor were properties.
+        state = dict(state)
+        self.sand_bag_factor = state.pop('sand_bag_factor', None)
+        self.rounds = state.pop('rounds', None) or []
+        self.__dict__.update(state)
+
+
+def _compact_scores(scores):
+    """Store hole scores as a signed-byte array; fall back to a list for odd values."""
+    if scores is None or isinstance(scores, array):
+        return scores
+    try:
+        ints = [int(s) for s in scores]
+        if all(i == s for i, s in zip(ints, scores)):
+            return array('b', ints)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return list(scores)
 
 
 class PlayerRoundInfo:
+    # Slots instead of a per-instance __dict__: a season of club rounds is
+    # tens of thousands of these, and hole scores are kept as array('b').
+    __slots__ = ('player', 'tournament_name', 'tournament_flag', 'round_number', 'handicap',
+                 'tee', '_hole_scores', 'total', 'net', 'date', 'index', 'cr', 'sr',
+                 'course_played', 'duplicate', 'completed')
+
     def __init__(self, player, tournament_name, round_number, handicap, tee, hole_scores,
                  total, net, tournament_flag=False, date=None, index=None, cr=None,
                  sr=None, course_played=None):
-        self.player = player
-        self.tournament_name = tournament_name
-        self.tournament_flag = tournament_flag
-        self.round_number = round_number
-        self.handicap = handicap
-        self.tee = tee
-        self.hole_scores = hole_scores
-        self.total = total
-        self.net = net
-        self.date = date
-        self.index = index
-        self.cr = cr
-        self.sr = sr
-        self.course_played = course_played
+        # Set slots directly: a new round is not in any player's stats yet.
+        set_slot = object.__setattr__
+        set_slot(self, 'player', player)
+        set_slot(self, 'tournament_name', tournament_name)
+        set_slot(self, 'tournament_flag', tournament_flag)
+        set_slot(self, 'round_number', round_number)
+        set_slot(self, 'handicap', handicap)
+        set_slot(self, 'tee', tee)
+        set_slot(self, '_hole_scores', _compact_scores(hole_scores))
+        set_slot(self, 'total', total)
+        set_slot(self, 'net', net)
+        set_slot(self, 'date', date)
+        set_slot(self, 'index', index)
+        set_slot(self, 'cr', cr)
+        set_slot(self, 'sr', sr)
+        set_slot(self, 'course_played', course_played)
+        set_slot(self, 'duplicate', False)
+        set_slot(self, 'completed', False)
+
+    def __setattr__(self, name, value):
+        # Keep the owning player's RoundStats in step with edits to a round
+        # already in player.rounds (duplicate, completed, net, ...).
+        if name != 'player':
+            stats = getattr(getattr(self, 'player', None), 'stats', None)
+            if isinstance(stats, RoundStats):
+                if name == 'hole_scores':
+                    name, value = '_hole_scores', _compact_scores(value)
+                stats.update(self, name, value)
+                return
+        object.__setattr__(self, name, value)
+
+    @property
+    def hole_scores(self):
+        return self._hole_scores
+
+    @hole_scores.setter
+    def hole_scores(self, scores):
+        self._hole_scores = _compact_scores(scores)
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__
+                 if name != '_hole_scores' and hasattr(self, name)}
+        state['hole_scores'] = self.hole_scores
+        return state
+
+    def __setstate__(self, state):
+        # Pickles written before __slots__ carry a plain __dict__ state.
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
         self.duplicate = False
         self.completed = False
+        for name, value in state.items():
+            if name == '_hole_scores':
+                name = 'hole_scores'
+            if name == 'hole_scores' or name in self.__slots__:
+                setattr(self, name, value)
+
+
+def _float_or_nan(value):
+    if isinstance(value, Real) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+def rounds_to_arrays(rounds, float_dtype=np.float32):
+    """
+    Column arrays for a list of PlayerRoundInfo.
+
+    Returns:
+        dict with 'handicap', 'index', 'cr', 'sr', 'total', 'net' (float_dtype,
+        NaN if missing), 'round_number' (int16), 'tournament_flag', 'completed',
+        'duplicate', 'has_holes' (bool), 'date' (datetime64[D], NaT if missing)
+        and 'hole_scores' (n x 18 int8, zeros when has_holes is False).
+    """
+    n = len(rounds)
+    arrays = {name: np.full(n, np.nan, dtype=float_dtype)
+              for name in ('handicap', 'index', 'cr', 'sr', 'total', 'net')}
+    arrays['round_number'] = np.zeros(n, dtype=np.int16)
+    for name in ('tournament_flag', 'completed', 'duplicate', 'has_holes'):
+        arrays[name] = np.zeros(n, dtype=bool)
+    arrays['date'] = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+    arrays['hole_scores'] = np.zeros((n, 18), dtype=np.int8)
+
+    for i, r in enumerate(rounds):
+        for name in ('handicap', 'index', 'cr', 'sr', 'total', 'net'):
+            arrays[name][i] = _float_or_nan(getattr(r, name))
+        arrays['round_number'][i] = r.round_number or 0
+        arrays['tournament_flag'][i] = bool(r.tournament_flag)
+        arrays['completed'][i] = bool(getattr(r, 'completed', False))
+        arrays['duplicate'][i] = bool(getattr(r, 'duplicate', False))
+        if r.date is not None:
+            arrays['date'][i] = np.datetime64(r.date, 'D')
+        if r.hole_scores is not None and len(r.hole_scores) == 18:
+            arrays['has_holes'][i] = True
+            arrays['hole_scores'][i] = [int(x) for x in r.hole_scores]
+    return arrays
 
 class Tournament:
     def __init__(self, name):
@@ -83,14 +590,35 @@ class MMTeam:
     def __init__(self, name, player1, player2):
         self.name = name
         self.players = [player1, player2]
-        self.aggregate_sand_bag_factor = None
+
+    def _aggregate_key(self):
+        return tuple(p._sand_bag_key() for p in self.players)
+
+    @property
+    def aggregate_sand_bag_factor(self):
+        """
+        Sum of both players' sand_bag_factors (None unless both are known),
+        cached until either player's factor or rounds change.
+        """
+        cached = getattr(self, '_aggregate', None)
+        if cached is not None and cached[0] == self._aggregate_key():
+            return cached[1]
+        factors = [p.sand_bag_factor for p in self.players if p.sand_bag_factor is not None]
+        value = sum(factors) if len(factors) == 2 else None
+        self._aggregate = (self._aggregate_key(), value)
+        return value
+
+    @aggregate_sand_bag_factor.setter
+    def aggregate_sand_bag_factor(self, value):
+        # An assigned value holds until a player's factor or rounds change.
+        self._aggregate = (self._aggregate_key(), value)
 
     def compute_aggregate_sand_bag_factor(self):
         """
         Sum the sand_bag_factors of both players.
         """
-        factors = [p.sand_bag_factor for p in self.players if p.sand_bag_factor is not None]
-        self.aggregate_sand_bag_factor = sum(factors) if len(factors) == 2 else None
+        self._aggregate = None
+        return self.aggregate_sand_bag_factor
 
 class CTeam:
     def __init__(self, name, mm_teams):
@@ -98,19 +626,33 @@ class CTeam:
             raise ValueError("A CTeam must have exactly 3 MMTeams.")
         self.name = name
         self.mm_teams = mm_teams
-        self.aggregate_sand_bag_factor = None
 
-    def compute_aggregate_score(self):
+    def _aggregate_key(self):
+        return tuple(team._aggregate_key() for team in self.mm_teams)
+
+    @property
+    def aggregate_sand_bag_factor(self):
         """
-        Use best 2 MMTeam sand_bag_factors (lower is better) to compute aggregate.
+        Best 2 MMTeam sand_bag_factors (lower is better), cached until any
+        player's factor or rounds change.
         """
+        cached = getattr(self, '_aggregate', None)
+        if cached is not None and cached[0] == self._aggregate_key():
+            return cached[1]
         factors = [team.aggregate_sand_bag_factor for team in self.mm_teams
                    if team.aggregate_sand_bag_factor is not None]
-        if len(factors) < 2:
-            self.aggregate_sand_bag_factor = None
-        else:
-            self.aggregate_sand_bag_factor = sum(sorted(factors)[:2])
-
-
+        value = sum(sorted(factors)[:2]) if len(factors) >= 2 else None
+        self._aggregate = (self._aggregate_key(), value)
+        return value
 
+    @aggregate_sand_bag_factor.setter
+    def aggregate_sand_bag_factor(self, value):
+        # An assigned value holds until a player's factor or rounds change.
+        self._aggregate = (self._aggregate_key(), value)
 
+    def compute_aggregate_score(self):
+        """
+        Use best 2 MMTeam sand_bag_factors (lower is better) to compute aggregate.
+        """
+        self._aggregate = None
+        return self.aggregate_sand_bag_factor
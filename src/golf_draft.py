@@ -0,0 +1,318 @@
+# golf_draft.py
+"""
+Snake-draft simulator for forming C teams from MM pairs.
+
+Draft model: MM pairs are ranked by Day-1 score. The top n_teams pairs
+captain one C team each; captains pick in Day-1 order (or weakest first),
+round 1 in pick order and round 2 reversed, until every team has 3 MM pairs.
+Picks are sampled from a softmax over each pair's expected Day-2 points, so
+temperature=0 is a greedy draft and temperature=None is uniformly random.
+
+Drafts are scored against one shared matrix of simulated MM team scores, so
+a draft costs a best-2-of-3 gather and a max instead of a new Monte Carlo
+run. When picks change, only the affected team rows are re-scored.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from golf_simulation import player_course_handicap
+from golf_scoring import simulate_rounds
+
+DRAFT_ROUNDS = 2  # picks per captain after their own pair
+DEFAULT_DRAFT_SIMS = 2000
+REPORT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def mm_score_matrix(mm_teams, n_sims=DEFAULT_DRAFT_SIMS, rng=None, calibrated=True, sampler=None):
+    """
+    Simulated Day-2 scores of every MM pair.
+
+    Args:
+        mm_teams (list[MMTeam]): MM pairs in the draft.
+        n_sims (int): Simulated rounds.
+        rng (np.random.Generator | int | None): Random source or seed.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        sampler (HistorySampler | None): Draw from player history instead.
+
+    Returns:
+        (n_sims, n_mm) float array.
+    """
+    rng = np.random.default_rng(rng)
+    players, index, pairs = [], {}, []
+    for mm in mm_teams:
+        for player in mm.players:
+            if id(player) not in index:
+                index[id(player)] = len(players)
+                players.append(player)
+        pairs.append([index[id(p)] for p in mm.players])
+    handicaps = [player_course_handicap(p) for p in players]
+    missing = [p.name for p, h in zip(players, handicaps) if h is None]
+    if missing:
+        raise ValueError(f"No course handicap for player(s): {', '.join(missing)}")
+
+    if sampler is None:
+        scores = simulate_rounds(handicaps, n_sims, rng, calibrated=calibrated)
+    else:
+        scores = sampler.sample(players, n_sims, rng, handicaps, calibrated)
+    return scores[:, np.asarray(pairs)].sum(axis=-1)
+
+
+class DraftEvaluator:
+    """
+    Day-2 win probabilities of drafted teams from a shared MM score matrix.
+
+    Scores are stored MM-major, (n_mm, n_sims), so gathering a team's three
+    pairs reads contiguous rows; best 2 of 3 is the sum minus the minimum.
+    """
+
+    def __init__(self, mm_scores):
+        self.mm_scores = np.ascontiguousarray(np.asarray(mm_scores, dtype=np.float32).T)
+        self.strength = self.mm_scores.mean(axis=1)
+
+    @property
+    def n_mm(self):
+        return self.mm_scores.shape[0]
+
+    def team_scores(self, teams):
+        """(..., n_teams, n_sims) best-2-of-3 scores for (..., n_teams, 3) MM indices."""
+        a, b, c = (self.mm_scores[teams[..., k]] for k in range(3))
+        return a + b + c - np.minimum(np.minimum(a, b), c)
+
+    def rescore(self, team_scores, teams, changed):
+        """Recompute only the changed team rows of team_scores, in place."""
+        changed = np.atleast_1d(changed)
+        team_scores[..., changed, :] = self.team_scores(teams[..., changed, :])
+        return team_scores
+
+    @staticmethod
+    def win_probs(team_scores):
+        """(..., n_teams) win probability per team; ties split the win evenly."""
+        winners = team_scores == team_scores.max(axis=-2, keepdims=True)
+        return (winners / winners.sum(axis=-2, keepdims=True)).mean(axis=-1)
+
+    def evaluate(self, teams):
+        return self.win_probs(self.team_scores(teams))
+
+
+def snake_order(n_teams, rounds=DRAFT_ROUNDS):
+    """Captain slot making each pick: 0..n-1, n-1..0, ..."""
+    order = []
+    for r in range(rounds):
+        slots = range(n_teams) if r % 2 == 0 else range(n_teams - 1, -1, -1)
+        order.extend(slots)
+    return order
+
+
+def sample_drafts(captains, pool, strength, rng, n_drafts, temperature=1.0, fixed=None):
+    """
+    Sample snake drafts.
+
+    Every captain picks from a softmax over strength / temperature among the
+    pairs still available. Sequential softmax picks without replacement are
+    the same as sorting strength / temperature + Gumbel noise (Gumbel-top-k),
+    so a whole batch of drafts is one argsort.
+
+    Args:
+        captains (array-like): MM index of each captain, in pick order.
+        pool (array-like): MM indices available to draft.
+        strength (ndarray): Expected points per MM index (pick preference).
+        rng (np.random.Generator): Random source.
+        n_drafts (int): Drafts to sample.
+        temperature (float | None): 0 = greedy, None = uniform.
+        fixed (dict[int, int] | None): Pick number -> MM index forced at that pick.
+
+    Returns:
+        (n_drafts, n_teams, 3) array of MM indices, row i = captain i's team.
+    """
+    n_teams = len(captains)
+    order = np.asarray(snake_order(n_teams))
+    fixed = fixed or {}
+    free_picks = np.array([k for k in range(len(order)) if k not in fixed], dtype=np.intp)
+    free_pool = np.array([m for m in pool if m not in set(fixed.values())], dtype=np.intp)
+
+    pref = np.asarray(strength, dtype=float)[free_pool]
+    if temperature is None:
+        keys = rng.random((n_drafts, len(free_pool)))
+    elif temperature == 0:
+        keys = np.broadcast_to(pref, (n_drafts, len(free_pool)))
+    else:
+        keys = pref / temperature + rng.gumbel(size=(n_drafts, len(free_pool)))
+
+    picks = np.empty((n_drafts, len(order)), dtype=np.intp)
+    picks[:, free_picks] = free_pool[np.argsort(-keys, axis=1, kind="stable")]
+    for k, m in fixed.items():
+        picks[:, k] = m
+
+    teams = np.empty((n_drafts, n_teams, 1 + DRAFT_ROUNDS), dtype=np.intp)
+    teams[:, :, 0] = captains
+    for r in range(DRAFT_ROUNDS):
+        round_picks = picks[:, r * n_teams:(r + 1) * n_teams]
+        teams[:, order[r * n_teams:(r + 1) * n_teams], 1 + r] = round_picks
+    return teams
+
+
+def sample_draft(captains, pool, strength, rng, temperature=1.0, fixed=None):
+    """One draft from sample_drafts, as an (n_teams, 3) array."""
+    return sample_drafts(captains, pool, strength, rng, 1, temperature, fixed)[0]
+
+
+# Drafts scored per vectorized batch (bounds the (batch, n_teams, n_sims) temporaries).
+DRAFT_BATCH = 64
+
+
+def _sample_chunk(evaluator, captains, pool, n_drafts, seed_seq, temperature):
+    rng = np.random.default_rng(seed_seq)
+    teams = sample_drafts(captains, pool, evaluator.strength, rng, n_drafts, temperature)
+    return np.concatenate([evaluator.evaluate(teams[i:i + DRAFT_BATCH])
+                           for i in range(0, n_drafts, DRAFT_BATCH)])
+
+
+_worker_evaluator = None
+
+
+def _init_worker(evaluator):
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _run_chunk(captains, pool, n_drafts, seed_seq, temperature):
+    return _sample_chunk(_worker_evaluator, captains, pool, n_drafts, seed_seq, temperature)
+
+
+@dataclass
+class DraftReport:
+    """Win probability distribution of every draft position over sampled drafts."""
+    captains: List[str]     # captain MM team name per draft position
+    win_probs: np.ndarray   # (n_drafts, n_teams)
+
+    @property
+    def n_drafts(self):
+        return len(self.win_probs)
+
+    def summary(self):
+        """One dict per draft position: mean, std and REPORT_PERCENTILES of win probability."""
+        pct = np.percentile(self.win_probs, REPORT_PERCENTILES, axis=0)
+        rows = []
+        for i, name in enumerate(self.captains):
+            row = {"position": i + 1, "captain": name,
+                   "mean": float(self.win_probs[:, i].mean()),
+                   "std": float(self.win_probs[:, i].std())}
+            row.update({f"p{q}": float(pct[k, i]) for k, q in enumerate(REPORT_PERCENTILES)})
+            rows.append(row)
+        return rows
+
+
+class DraftSimulator:
+    """
+    Samples snake drafts of MM pairs and scores the resulting C teams.
+
+    Args:
+        mm_teams (list[MMTeam]): MM pairs ranked by Day-1 score, best first.
+        n_teams (int): Number of C teams (the top n_teams pairs captain).
+        weakest_first (bool): Captains pick in reverse Day-1 order.
+        n_sims (int): Simulated Day-2 rounds in the shared score matrix.
+        rng (np.random.Generator | int | None): Seed for the score matrix.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        sampler (HistorySampler | None): Draw from player history instead.
+    """
+
+    def __init__(self, mm_teams, n_teams, weakest_first=False, n_sims=DEFAULT_DRAFT_SIMS,
+                 rng=None, calibrated=True, sampler=None):
+        if len(mm_teams) != n_teams * (1 + DRAFT_ROUNDS):
+            raise ValueError(f"A {n_teams}-team draft needs {n_teams * (1 + DRAFT_ROUNDS)} "
+                             f"MM pairs, got {len(mm_teams)}.")
+        self.mm_teams = list(mm_teams)
+        self.n_teams = n_teams
+        captains = np.arange(n_teams)
+        self.captains = captains[::-1].copy() if weakest_first else captains
+        self.pool = np.arange(n_teams, len(mm_teams))
+        self.evaluator = DraftEvaluator(
+            mm_score_matrix(self.mm_teams, n_sims, rng, calibrated, sampler))
+
+    def captain_names(self):
+        return [self.mm_teams[c].name for c in self.captains]
+
+    def team_names(self, teams):
+        """MM team names of a drafted (n_teams, 3) array."""
+        return [[self.mm_teams[m].name for m in row] for row in teams]
+
+    def sample(self, n_drafts=10000, temperature=1.0, seed=None, workers=1, chunk_size=1000):
+        """
+        Sample n_drafts drafts and score each one.
+
+        Chunks are seeded from SeedSequence(seed).spawn(), so a seed gives
+        the same report for any worker count.
+
+        Returns:
+            DraftReport
+        """
+        root = np.random.SeedSequence(seed)
+        sizes = [chunk_size] * (n_drafts // chunk_size)
+        if n_drafts % chunk_size:
+            sizes.append(n_drafts % chunk_size)
+        children = root.spawn(len(sizes))
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1 or len(sizes) <= 1:
+            chunks = [_sample_chunk(self.evaluator, self.captains, self.pool, n, child, temperature)
+                      for n, child in zip(sizes, children)]
+        else:
+            n = len(sizes)
+            with ProcessPoolExecutor(max_workers=min(workers, n), initializer=_init_worker,
+                                     initargs=(self.evaluator,)) as pool:
+                chunks = list(pool.map(_run_chunk, [self.captains] * n, [self.pool] * n, sizes,
+                                       children, [temperature] * n))
+        wins = np.concatenate(chunks) if chunks else np.zeros((0, self.n_teams))
+        return DraftReport(self.captain_names(), wins)
+
+    def recommend_pick(self, picks, position, n_rollouts=500, temperature=1.0, seed=None):
+        """
+        Expected win probability of each available MM pair for the next pick.
+
+        Args:
+            picks (list[int]): MM indices picked so far, in pick order.
+            position (int): Draft position (0-based) we are picking for.
+            n_rollouts (int): Sampled completions of the draft per candidate.
+            temperature (float | None): Pick model for the other captains.
+
+        Returns:
+            List of (mm_team_name, expected_win_prob), best first.
+        """
+        pick_no = len(picks)
+        order = snake_order(self.n_teams)
+        if pick_no >= len(order) or order[pick_no] != position:
+            raise ValueError(f"Pick {pick_no + 1} does not belong to draft position {position + 1}.")
+        taken = set(picks)
+        candidates = [m for m in self.pool if m not in taken]
+        rng = np.random.default_rng(seed)
+        strength = self.evaluator.strength
+
+        results = []
+        for candidate in candidates:
+            fixed = dict(enumerate(picks))
+            fixed[pick_no] = candidate
+            teams = sample_drafts(self.captains, self.pool, strength, rng, n_rollouts,
+                                  temperature, fixed)
+            wins = np.concatenate([self.evaluator.evaluate(teams[i:i + DRAFT_BATCH])[:, position]
+                                   for i in range(0, n_rollouts, DRAFT_BATCH)])
+            results.append((self.mm_teams[candidate].name, float(wins.mean())))
+        results.sort(key=lambda r: -r[1])
+        return results
+
+    def swap_gain(self, teams, a, b):
+        """
+        Change in every team's win probability from swapping two drafted MM
+        pairs, given as (team, slot) tuples; only the two affected team
+        rows are re-scored.
+        """
+        base_scores = self.evaluator.team_scores(teams)
+        base = self.evaluator.win_probs(base_scores)
+        swapped = teams.copy()
+        swapped[a], swapped[b] = teams[b], teams[a]
+        self.evaluator.rescore(base_scores, swapped, [a[0], b[0]])
+        return self.evaluator.win_probs(base_scores) - base
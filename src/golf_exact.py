@@ -0,0 +1,234 @@
+# golf_exact.py
+"""
+Exact Day-2 score distributions for the parametric round model.
+
+Every hole outcome of simulate_rounds is an independent categorical draw (with
+the triple-bogey reduction as a sixth category, see extend_cdfs), so a
+player's 18-hole Stableford total has an exact distribution: the convolution
+of 18 per-hole point PMFs. These are built once per course for every course
+handicap row. From them:
+
+    MM team   = convolution of its two players' PMFs
+    C team    = best 2 of 3 MM teams, conditioned on which MM team is lowest
+    P(win)    = sum_v P(X_i = v) * E[1 / (1 + #others tied at v); others <= v]
+
+with no Monte Carlo noise. Teams are assumed independent, so every player
+may appear in only one MM team of the field.
+
+Calibrated scores add a constant per player, which shifts a PMF's support
+off the integers; PMFs therefore carry their support values explicitly.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from golf_scoring import default_course
+from golf_simulation import CompiledField, compile_field
+
+# Support values are rounded to this many decimals so that sums of calibration
+# offsets compare equal regardless of addition order.
+VALUE_DECIMALS = 9
+
+
+@dataclass
+class ScorePMF:
+    """Discrete score distribution: P(score == values[k]) = probs[k], values ascending."""
+    values: np.ndarray
+    probs: np.ndarray
+
+    @classmethod
+    def lattice(cls, offset, probs):
+        """PMF on offset, offset + 1, ..., with leading / trailing zeros trimmed."""
+        probs = np.asarray(probs, dtype=float)
+        nonzero = np.flatnonzero(probs > 0)
+        lo, hi = (nonzero[0], nonzero[-1] + 1) if len(nonzero) else (0, 1)
+        values = np.round(offset + np.arange(lo, hi, dtype=float), VALUE_DECIMALS)
+        return cls(values, probs[lo:hi])
+
+    @property
+    def is_lattice(self):
+        return len(self.values) < 2 or np.allclose(np.diff(self.values), 1.0)
+
+    @property
+    def mean(self):
+        return float(self.values @ self.probs)
+
+    @property
+    def std(self):
+        return float(np.sqrt(((self.values - self.mean) ** 2) @ self.probs))
+
+    def shift(self, constant):
+        return ScorePMF(np.round(self.values + constant, VALUE_DECIMALS), self.probs)
+
+    def __add__(self, other):
+        """Distribution of the sum of two independent scores."""
+        if self.is_lattice and other.is_lattice:
+            return ScorePMF.lattice(self.values[0] + other.values[0], np.convolve(self.probs, other.probs))
+        return merge_pmfs([(np.add.outer(self.values, other.values).ravel(),
+                            np.multiply.outer(self.probs, other.probs).ravel())])
+
+
+def merge_pmfs(parts):
+    """Combine (values, probs) pieces into one ScorePMF, summing equal values."""
+    values = np.round(np.concatenate([v for v, _ in parts]), VALUE_DECIMALS)
+    probs = np.concatenate([p for _, p in parts])
+    support, inverse = np.unique(values, return_inverse=True)
+    return ScorePMF(support, np.bincount(inverse, weights=probs, minlength=len(support)))
+
+
+def course_pmfs(course=None):
+    """
+    Exact uncalibrated Stableford PMFs for every handicap row of a course
+    (default: default_course()).
+
+    Returns:
+        (offset, table): table[row, k] = P(total == offset + k).
+    """
+    return _course_pmfs(course or default_course())
+
+
+@lru_cache(maxsize=None)
+def _course_pmfs(course):
+    probs = np.diff(course.outcome_cdfs, prepend=0.0, axis=-1)  # (H, 6)
+    low = int(course.hole_points.min())
+    points = course.hole_points - low                            # (H, 18, 6)
+    n_rows = len(probs)
+
+    hole_pmfs = np.zeros((n_rows, 18, int(points.max()) + 1))
+    rows, holes = np.indices(points.shape[:2])
+    for c in range(points.shape[-1]):
+        np.add.at(hole_pmfs, (rows, holes, points[..., c]), probs[:, None, c])
+
+    table = np.zeros((n_rows, 18 * (hole_pmfs.shape[-1] - 1) + 1))
+    for row in range(n_rows):
+        pmf = np.ones(1)
+        for hole in range(18):
+            pmf = np.convolve(pmf, hole_pmfs[row, hole])
+        table[row] = pmf
+    return 18 * low, table
+
+
+def player_pmf(course_handicap, calibrated=False, course=None):
+    """Exact Stableford PMF of one simulated round at a course handicap."""
+    course = course or default_course()
+    row = int(course.handicap_rows(course_handicap))
+    offset, table = course_pmfs(course)
+    pmf = ScorePMF.lattice(offset, table[row])
+    return pmf.shift(course.calibration[row]) if calibrated else pmf
+
+
+def best_two_of_three(a, b, c):
+    """
+    Exact PMF of the sum of the two highest of three independent lattice scores.
+
+    The lowest score is dropped; conditioning on which one is lowest (the
+    first of equal lowest scores) leaves a convolution of the other two
+    truncated below it.
+    """
+    pmfs = [a, b, c]
+    if not all(p.is_lattice for p in pmfs):
+        raise ValueError("best_two_of_three needs lattice PMFs (player or MM team scores).")
+    parts = []
+    for low in range(3):
+        x, y = (k for k in range(3) if k != low)
+        # A score before the dropped one must be strictly higher, else it
+        # would be the first lowest; a score after it may tie.
+        sides = ["right" if k < low else "left" for k in (x, y)]
+        x, y = pmfs[x], pmfs[y]
+        acc = np.zeros(len(x.probs) + len(y.probs) - 1)
+        for m, pm in zip(pmfs[low].values, pmfs[low].probs):
+            i = np.searchsorted(x.values, m, side=sides[0])
+            j = np.searchsorted(y.values, m, side=sides[1])
+            if i < len(x.probs) and j < len(y.probs):
+                acc[i + j:] += pm * np.convolve(x.probs[i:], y.probs[j:])
+        parts.append((x.values[0] + y.values[0] + np.arange(len(acc)), acc))
+    merged = merge_pmfs(parts)
+    keep = merged.probs > 0
+    return ScorePMF(merged.values[keep], merged.probs[keep])
+
+
+def win_probabilities(pmfs):
+    """
+    Exact P(win) of independent team scores, ties split evenly (as rank_teams
+    breaks them at random).
+
+    For a team scoring v, the chance of winning is the integral over z in
+    [0, 1] of prod_j (P(X_j < v) + P(X_j = v) z) over the other teams, a
+    polynomial of degree n - 1 integrated exactly with Gauss-Legendre nodes.
+    """
+    n = len(pmfs)
+    grid = np.unique(np.concatenate([p.values for p in pmfs]))
+    eq = np.zeros((n, len(grid)))
+    for i, p in enumerate(pmfs):
+        eq[i, np.searchsorted(grid, p.values)] = p.probs
+    below = np.cumsum(eq, axis=1) - eq
+
+    nodes, weights = np.polynomial.legendre.leggauss(max(1, (n + 1) // 2))
+    nodes, weights = (nodes + 1) / 2, weights / 2
+    others = np.zeros((n, len(grid)))
+    for z, w in zip(nodes, weights):
+        terms = below + eq * z
+        ones = np.ones((1, len(grid)))
+        before = np.vstack([ones, np.cumprod(terms, axis=0)[:-1]])            # prod over j < i
+        after = np.vstack([np.cumprod(terms[::-1], axis=0)[::-1][1:], ones])  # prod over j > i
+        others += w * before * after
+    return (eq * others).sum(axis=1)
+
+
+@dataclass
+class ExactResult:
+    """Exact C team score distributions and win probabilities for a field."""
+    team_names: List[str]
+    team_pmfs: List[ScorePMF]
+    mm_pmfs: List[ScorePMF]
+    player_pmfs: List[ScorePMF]
+    win_prob: np.ndarray
+
+    @property
+    def expected_points(self):
+        return np.array([p.mean for p in self.team_pmfs])
+
+    def summary(self):
+        """List of dicts sorted by win probability, best first."""
+        rows = [{"team": name, "win_prob": float(self.win_prob[i]),
+                 "expected_points": float(self.team_pmfs[i].mean), "std": self.team_pmfs[i].std}
+                for i, name in enumerate(self.team_names)]
+        rows.sort(key=lambda r: -r["win_prob"])
+        return rows
+
+
+def exact_tournament(c_teams, calibrated=True, course=None):
+    """
+    Exact equivalent of simulate_tournament for the parametric model.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Teams; every player may
+            appear in only one MM team.
+        calibrated (bool): Add CALIBRATION_CORRECTIONS per player.
+        course (CourseModel | None): Course / tee tables (default: default_course()).
+
+    Returns:
+        ExactResult
+    """
+    field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+    used = field.mm_players[field.team_mm.ravel()].ravel()
+    if len(np.unique(used)) != len(used):
+        raise ValueError("Exact scoring assumes independent teams: a player appears in more than one MM team.")
+
+    players = [player_pmf(h, calibrated, course) for h in field.course_handicaps]
+    mm = [players[a] + players[b] for a, b in field.mm_players]
+    teams = [best_two_of_three(*(mm[k] for k in row)) for row in field.team_mm]
+    return ExactResult(list(field.team_names), teams, mm, players, win_probabilities(teams))
+
+
+def print_exact_results(result, top_n=None):
+    """Pretty-print exact win probabilities and expected points."""
+    rows = result.summary()[:top_n]
+    print("\n🎯 Exact Day-2 distribution:\n")
+    print(f"{'Rank':<5} {'Team':<25} {'Win %':>8} {'Exp Pts':>9} {'Std':>7}")
+    print("-" * 58)
+    for i, r in enumerate(rows, 1):
+        print(f"{i:<5} {r['team']:<25} {r['win_prob'] * 100:>7.2f} {r['expected_points']:>9.2f} {r['std']:>7.2f}")
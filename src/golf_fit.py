@@ -0,0 +1,225 @@
+# golf_fit.py
+"""
+Player-specific hole-outcome models fitted from hole-by-hole scores.
+
+HANDICAP_PROFILES gives every player in a handicap band the same outcome
+weights on every hole. Here each player's gross outcomes (birdie or better,
+par, bogey, double, triple or worse) are counted per hole from every
+non-duplicate round with 18 hole scores (unplayed holes, scored 0, are
+skipped), in one bincount over all rounds:
+
+    counts[player, hole, outcome]
+
+Holes are pooled into stroke-index buckets (buckets=18 keeps every hole on
+its own) and the pooled frequencies are shrunk toward the band profile of
+the player's course handicap with prior_strength pseudo-rounds:
+
+    p[hole] = (counts[bucket] + m * strength * band) / (n[bucket] + m * strength)
+
+with m holes in the bucket.
+
+HoleOutcomeModel.outcome_tables turns these into a dense (n_players, 18, 6)
+float32 table of extended CDFs (extend_cdfs), which simulate_rounds samples
+from directly; strokes received and the triple-bogey reduction still follow
+the course handicap. CALIBRATION_CORRECTIONS belong to the band profiles, so
+a calibrated draw only adds them in proportion to the prior's weight.
+
+Fits are incremental: a player's counts are recomputed only when their
+Player.rounds_version has changed since the last fit.
+
+Usage:
+    model = HoleOutcomeModel(prior_strength=15)
+    result = simulate_tournament(c_teams, 10000, sampler=model)
+"""
+
+from dataclasses import dataclass
+from numbers import Real
+
+import numpy as np
+
+from golf_instrument import count, stage, timed
+from golf_scoring import OUTCOMES, TBOGEY, default_course, extend_cdfs
+
+# Gross-to-par delta of the first outcome (birdie or better).
+FIRST_DELTA = -1
+N_OUTCOMES = len(OUTCOMES)
+
+
+def band_probabilities(course, rows):
+    """(len(rows), 5) HANDICAP_PROFILES outcome probabilities of course handicap rows."""
+    probs = np.diff(course.outcome_cdfs[rows], prepend=0.0, axis=-1)
+    # Merge the two triple-bogey categories of extend_cdfs back into one.
+    return np.concatenate([probs[:, :TBOGEY], probs[:, TBOGEY:].sum(axis=1, keepdims=True)], axis=1)
+
+
+def hole_buckets(stroke_index, buckets):
+    """Bucket (0 = hardest) of each hole when holes are grouped by stroke index."""
+    return ((np.asarray(stroke_index) - 1) * buckets) // 18
+
+
+def count_outcomes(hole_scores, player, n_players, hole_pars):
+    """
+    Outcome counts per player and hole in one pass.
+
+    Args:
+        hole_scores (ndarray): (n_rounds, 18) gross hole scores, 0 for holes not played.
+        player (ndarray): (n_rounds,) player row of each round.
+        n_players (int): Number of player rows.
+        hole_pars (ndarray): (18,) par per hole.
+
+    Returns:
+        (n_players, 18, 5) int32 counts.
+    """
+    hole_scores = np.asarray(hole_scores, dtype=np.int32)
+    outcome = np.clip(hole_scores - hole_pars, FIRST_DELTA, FIRST_DELTA + N_OUTCOMES - 1) - FIRST_DELTA
+    cell = (np.asarray(player, dtype=np.intp)[:, None] * 18 + np.arange(18)) * N_OUTCOMES + outcome
+    counts = np.bincount(cell[hole_scores > 0], minlength=n_players * 18 * N_OUTCOMES)
+    return counts.reshape(n_players, 18, N_OUTCOMES).astype(np.int32)
+
+
+def _usable_holes(rnd):
+    if getattr(rnd, "duplicate", False) or rnd.hole_scores is None or len(rnd.hole_scores) != 18:
+        return None
+    if not all(isinstance(s, Real) for s in rnd.hole_scores):
+        return None
+    return rnd.hole_scores
+
+
+@dataclass
+class HoleOutcomeTables:
+    """Fitted outcome CDFs for a fixed list of players (picklable, no Player objects)."""
+    course_handicaps: np.ndarray  # (n_players,)
+    cdfs: np.ndarray              # (n_players, 18, 6) float32 extended CDFs
+    n_holes: np.ndarray           # (n_players, 18) holes observed per hole's bucket
+    prior_weight: np.ndarray      # (n_players,) mean weight of the band prior
+    expected_points: np.ndarray   # (n_players,) mean uncalibrated Stableford score
+
+
+class HoleOutcomeModel:
+    """
+    Per-player, per-hole outcome probabilities fitted from hole-by-hole rounds.
+
+    Args:
+        prior_strength (float): Pseudo-rounds of the handicap band profile
+            mixed into every bucket.
+        buckets (int): Stroke-index buckets holes are pooled into (18 = per hole).
+        course (CourseModel | None): Course / tee the hole scores were played on
+            (default: default_course()).
+    """
+
+    def __init__(self, prior_strength=15.0, buckets=18, course=None):
+        if not 1 <= buckets <= 18:
+            raise ValueError("buckets must be between 1 and 18.")
+        self.prior_strength = prior_strength
+        self.buckets = buckets
+        self.course = course
+        self._fits = {}  # name -> (rounds_version, (18, 5) counts)
+
+    @timed("fit.outcomes")
+    def fit(self, players):
+        """
+        Count hole outcomes for every player whose rounds changed since the
+        last fit (all of them on the first call).
+
+        Args:
+            players (Iterable[Player] | dict[str, Player]): Players to fit.
+
+        Returns:
+            int: Number of players refitted.
+        """
+        players = list(players.values()) if isinstance(players, dict) else list(players)
+        stale = [p for p in players
+                 if p.name not in self._fits or self._fits[p.name][0] != p.rounds_version]
+        if not stale:
+            return 0
+
+        with stage("collect"):
+            holes, owner = [], []
+            for i, p in enumerate(stale):
+                for r in p.rounds:
+                    scores = _usable_holes(r)
+                    if scores is not None:
+                        holes.append(scores)
+                        owner.append(i)
+        with stage("count"):
+            course = self.course or default_course()
+            counts = count_outcomes(np.array(holes, dtype=np.int32).reshape(-1, 18), owner,
+                                    len(stale), course.hole_pars)
+        for p, c in zip(stale, counts):
+            self._fits[p.name] = (p.rounds_version, c)
+        count("players", len(stale))
+        count("rounds", len(holes))
+        return len(stale)
+
+    def counts(self, players):
+        """(n_players, 18, 5) outcome counts, fitting stale players first."""
+        self.fit(players)
+        return np.stack([self._fits[p.name][1] for p in players]) if players else \
+            np.zeros((0, 18, N_OUTCOMES), dtype=np.int32)
+
+    def outcome_tables(self, players, course_handicaps):
+        """
+        Shrunk per-hole outcome CDFs for a list of players.
+
+        Args:
+            players (list[Player]): Players, e.g. CompiledField.players.
+            course_handicaps (array-like): Handicap of each player, which picks
+                the band prior and the strokes received.
+
+        Returns:
+            HoleOutcomeTables
+        """
+        course = self.course or default_course()
+        handicaps = np.asarray(course_handicaps, dtype=float).reshape(-1)
+        rows = course.handicap_rows(handicaps)
+        counts = self.counts(list(players)).astype(float)
+
+        bucket = hole_buckets(course.stroke_index, self.buckets)
+        pooled = np.zeros((len(counts), self.buckets, N_OUTCOMES))
+        np.add.at(pooled, (slice(None), bucket), counts)
+        pooled = pooled[:, bucket]                                    # (n, 18, 5)
+        n_holes = pooled.sum(axis=-1)
+
+        # prior_strength pseudo-rounds of the band profile on every hole of the bucket
+        strength = self.prior_strength * np.bincount(bucket, minlength=self.buckets)[bucket]  # (18,)
+        prior = strength[None, :, None] * band_probabilities(course, rows)[:, None, :]
+        probs = (pooled + prior) / (n_holes + strength)[..., None]
+        cdfs = np.cumsum(probs, axis=-1)
+        cdfs[..., -1] = 1.0
+        cdfs = extend_cdfs(cdfs).astype(np.float32)
+
+        point_probs = np.diff(cdfs, prepend=0.0, axis=-1)
+        expected = (course.hole_points[rows] * point_probs).sum(axis=(1, 2))
+        prior_weight = (strength / (n_holes + strength)).mean(axis=1)
+        return HoleOutcomeTables(handicaps, cdfs, n_holes, prior_weight, expected)
+
+    def sample(self, players, n_sims, rng=None, course_handicaps=None, calibrated=True):
+        """
+        Draw n_sims rounds for every player (same interface as HistorySampler.sample).
+
+        Returns:
+            (n_sims, n_players) float array of Stableford scores.
+        """
+        if course_handicaps is None:
+            raise ValueError("course_handicaps are required for fitted hole outcomes.")
+        return sample_outcomes(self.outcome_tables(players, course_handicaps), n_sims, rng,
+                               calibrated, self.course)
+
+    def settings(self):
+        """Settings that change simulated scores (for golf_cache keys)."""
+        return {"model": "hole_outcomes", "prior_strength": self.prior_strength, "buckets": self.buckets}
+
+
+def calibration_offsets(tables, calibrated=True, course=None):
+    """Per-player calibration added to fitted draws: the band correction times the prior's weight."""
+    if not calibrated:
+        return np.zeros(len(tables.course_handicaps))
+    course = course or default_course()
+    return tables.prior_weight * course.calibration[course.handicap_rows(tables.course_handicaps)]
+
+
+def sample_outcomes(tables, n_sims, rng=None, calibrated=True, course=None):
+    """Draw (n_sims, n_players) scores from fitted HoleOutcomeTables."""
+    course = course or default_course()
+    scores = course.simulate_rounds(tables.course_handicaps, n_sims, rng, cdfs=tables.cdfs)
+    return scores + calibration_offsets(tables, calibrated, course)
@@ -0,0 +1,964 @@
+# golf_ingest.py
+"""
+Incremental ingestion of event workbooks and posted-score reports.
+
+Every source (a workbook sheet, or a single-sheet posted report) is
+fingerprinted with a content hash and recorded in a JSON manifest together
+with the round keys it contributed. On the next run unchanged sources are
+skipped without parsing; changed sources are parsed and only rounds whose
+key (player, date, course, total) is new are added, so a weekly update costs
+time proportional to the new rows.
+
+A round whose key was already contributed by a *different* source is still
+added but flagged PlayerRoundInfo.duplicate = True.
+
+Large posted-score reports can instead be streamed straight into a
+golf_store.RoundStore with stream_posted_report: the file is read in
+fixed-size row batches (openpyxl read-only mode, or chunked CSV), each batch
+is cleaned with vectorized pandas operations and appended as columns, so
+memory stays bounded by the batch size and no PlayerRoundInfo objects are
+built.
+
+Event workbooks are read with openpyxl in read-only mode, each workbook
+opened once per worker; ingest_workbooks parses the changed sheets of several
+workbooks in a process pool and applies them in workbook / sheet order, so the
+result does not depend on the worker count. With a SheetCache, parsed sheets
+are kept as typed .npz files keyed by the sheet's content hash, and a rebuild
+from scratch skips Excel parsing for every sheet that has not changed.
+
+C team sheets are loaded with load_c_teams_from_excel, which resolves every
+player name in the sheet through a shared golf_names.NameIndex.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+from golf_classes import CTeam, MMTeam, Player, PlayerRoundInfo, Tournament, Round
+from golf_instrument import call_recorded, count, merge_stages, stage, timed, worker_options
+from golf_names import name_index
+from golf_scoring import strokes_allocated_per_hole
+from golf_store import empty_columns, intern_strings
+
+POSTED_TOURNAMENT = "individual"
+
+# Rows per batch when streaming a posted report, and the columns it reads.
+POSTED_BATCH_ROWS = 5000
+POSTED_COLUMNS = ["Golfer Name", "AGS", "Course Handicap", "Date Played", "Handicap Index",
+                  "Course Rating", "Slope Rating", "Course Played", "Holes Played"]
+
+# Known tournament dates in the posted reports (see rename_tournaments_by_date).
+TOURNAMENT_DATES = {
+    datetime(2024, 7, 10).date(): "July Stag 24",
+    datetime(2024, 6, 12).date(): "US Open Stag 24",
+    datetime(2024, 6, 7).date(): "24 mm Day 1 24",
+    datetime(2024, 6, 8).date(): "24 mm Day 2 24",
+    datetime(2024, 5, 8).date(): "Husky Stag 24",
+    datetime(2024, 8, 23).date(): "Club Champ Friday 24",
+    datetime(2024, 8, 24).date(): "Club Champ Saturday 24",
+    datetime(2024, 9, 25).date(): "Trophy Stag 24",
+    datetime(2024, 4, 13).date(): "Masters 24",
+    datetime(2025, 4, 12).date(): "Masters 2025",
+    datetime(2025, 5, 7).date(): "Husky Stag 2025",
+}
+
+_MR_PREFIX = re.compile(r"^Mr\.?\s+")
+
+# (player 1, player 2) column pairs of the three MM teams in a C team sheet row.
+TEAM_PLAYER_COLUMNS = [(1, 3), (5, 7), (9, 11)]
+_XLSX_NS = {
+    "m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+# --- Fingerprints ---
+
+def file_fingerprint(path):
+    """SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sheet_fingerprints(path):
+    """
+    Content hash per sheet name without parsing cell data.
+
+    For .xlsx files each sheet's XML part is hashed together with the shared
+    strings table; other formats fall back to the whole-file hash.
+    """
+    path = Path(path)
+    if path.suffix.lower() not in (".xlsx", ".xlsm"):
+        digest = file_fingerprint(path)
+        return {name: digest for name in pd.ExcelFile(path).sheet_names}
+
+    with zipfile.ZipFile(path) as zf:
+        workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", _XLSX_NS)}
+        shared = zf.read("xl/sharedStrings.xml") if "xl/sharedStrings.xml" in zf.namelist() else b""
+        shared_digest = hashlib.sha256(shared).digest()
+
+        fingerprints = {}
+        for sheet in workbook.findall("m:sheets/m:sheet", _XLSX_NS):
+            target = targets[sheet.get(f"{{{_XLSX_NS['r']}}}id")].lstrip("/")
+            member = target if target.startswith("xl/") else f"xl/{target}"
+            h = hashlib.sha256(shared_digest)
+            h.update(zf.read(member))
+            fingerprints[sheet.get("name")] = h.hexdigest()
+    return fingerprints
+
+
+# --- Row parsing (pure: DataFrame -> list of round dicts) ---
+
+def _clean(value):
+    return None if pd.isnull(value) else value
+
+
+def parse_event_sheet(df, sheet_name, verbose=False):
+    """
+    Parse an event sheet (hole-by-hole scores) into round dicts.
+
+    Hole scores reported as net are converted back to gross. Rows with an
+    "NH" handicap are skipped.
+    """
+    df = df.copy()
+    df.columns = df.columns.map(str)
+
+    gross_col = next((col for col in df.columns if col.strip().lower() in ['total', 'gross', 'gross score']), None)
+    if gross_col is None:
+        raise ValueError(f"❌ Could not find a 'Gross' column in sheet: {sheet_name}")
+
+    numeric_holes = [str(i) for i in range(1, 19)]
+    if all(h in df.columns for h in numeric_holes):
+        hole_cols = numeric_holes
+    elif all(f"Hole{i}" in df.columns for i in range(1, 19)):
+        hole_cols = [f"Hole{i}" for i in range(1, 19)]
+    else:
+        hole_cols = [col for col in df.columns if re.fullmatch(r"(Hole)?[1-9]|1[0-8]", col.strip())]
+
+    if df.empty:
+        return []
+
+    # Scores are net when the holes don't add up to the reported gross
+    first_data_row = df.iloc[1] if df.iloc[0].isnull().all() else df.iloc[0]
+    try:
+        hole_scores_first = [int(first_data_row[col]) for col in hole_cols]
+    except (ValueError, TypeError):
+        print(f"❌ Invalid hole score in first row of sheet: {sheet_name}. Skipping this sheet.")
+        return []
+    scores_are_net = abs(sum(hole_scores_first) - first_data_row[gross_col]) > 1e-3
+    if verbose:
+        print(f"📄 Loaded '{sheet_name}' as {'NET' if scores_are_net else 'GROSS'} hole-by-hole scoring")
+
+    rows = []
+    tournament_name = None
+    for idx, row in df.iterrows():
+        try:
+            event_name = row.get('Event')
+            if not event_name:
+                raise ValueError("Missing event name in 'Event' column.")
+            if str(row['Handicap']).strip().upper() == "NH":
+                print(f"⚠️ Skipping row with NH handicap in sheet '{sheet_name}', row {idx + 2} (Excel row number).")
+                continue
+            if tournament_name is None:
+                tournament_name = f"{event_name}"
+
+            handicap = int(row['Handicap']) if pd.notnull(row['Handicap']) else None
+            gross = int(row[gross_col]) if pd.notnull(row[gross_col]) else None
+            raw_hole_scores = [int(row[col]) for col in hole_cols]
+            if scores_are_net:
+                strokes = strokes_allocated_per_hole(handicap)
+                hole_scores = [raw_hole_scores[i] + strokes[i + 1] for i in range(18)]
+            else:
+                hole_scores = raw_hole_scores
+
+            rows.append(dict(
+                player=str(row['Player']).strip(),
+                tournament_name=tournament_name,
+                tournament_flag=True,
+                handicap=handicap,
+                tee=_clean(row['Tee']),
+                hole_scores=hole_scores,
+                total=gross,
+                net=gross - handicap,
+                date=pd.to_datetime(row['Date']).date() if pd.notnull(row.get('Date')) else None,
+                index=float(row['Index']) if pd.notnull(row.get('Index')) else None,
+                cr=float(row['CR']) if pd.notnull(row.get('CR')) else None,
+                sr=int(row['SR']) if pd.notnull(row.get('SR')) else None,
+                course_played=None,
+                completed=all(score > 0 for score in raw_hole_scores),
+            ))
+        except Exception as e:
+            print(f"❌ Error in sheet '{sheet_name}', row {idx + 2} (Excel row number): {e}")
+    return rows
+
+
+def parse_posted_report(df):
+    """Parse a cleaned posted-score report into round dicts."""
+    rows = []
+    for _, row in df.iterrows():
+        if pd.isnull(row['Golfer Name']) or pd.isnull(row['AGS']):
+            continue
+        handicap = _clean(row['Course Handicap'])
+        rows.append(dict(
+            player=_MR_PREFIX.sub("", str(row['Golfer Name'])).strip(),
+            tournament_name=POSTED_TOURNAMENT,
+            tournament_flag=False,
+            handicap=handicap,
+            tee=None,
+            hole_scores=[],
+            total=row['AGS'],
+            net=row['AGS'] - handicap if handicap is not None else None,
+            date=pd.to_datetime(row['Date Played']).date() if pd.notnull(row['Date Played']) else None,
+            index=_clean(row['Handicap Index']),
+            cr=_clean(row['Course Rating']),
+            sr=_clean(row['Slope Rating']),
+            course_played=_clean(row['Course Played']),
+            completed=row['Holes Played'] == 18,
+        ))
+    return rows
+
+
+# --- Round keys and the manifest ---
+
+_KEY_SEP = "\x1f"
+
+
+def round_key(player_name, date, course, total):
+    """Dedup key: (player, date, course, total) joined into one string."""
+    day = date.isoformat() if date is not None else ""
+    total = "" if total is None else f"{float(total):g}"
+    return _KEY_SEP.join([str(player_name), day, str(course or ""), total])
+
+
+def _split_key(key):
+    """(player|date|total, course): the course is matched separately so a
+    round with an unknown course still matches the same round elsewhere."""
+    player, day, course, total = key.split(_KEY_SEP)
+    return _KEY_SEP.join([player, day, total]), course
+
+
+def _rnd_key(rnd):
+    return round_key(rnd.player.name, rnd.date, rnd.course_played, rnd.total)
+
+
+class IngestionManifest:
+    """
+    JSON record of ingested sources.
+
+    sources["<file>::<sheet>"] = {"fingerprint": str, "keys": [round_key, ...]}
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sources = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.sources = json.load(f).get("sources", {})
+
+    @staticmethod
+    def source_id(file_path, sheet_name):
+        return f"{Path(file_path).name}::{sheet_name}"
+
+    def is_current(self, source_id, fingerprint):
+        entry = self.sources.get(source_id)
+        return entry is not None and entry["fingerprint"] == fingerprint
+
+    def save(self):
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"sources": self.sources}, f)
+        os.replace(tmp, self.path)
+
+
+class Ingestor:
+    """
+    Applies parsed rows to players / tournaments, tracking which source
+    contributed which round.
+
+    Args:
+        players (dict[str, Player]): Existing players, updated in place.
+        tournaments (dict[str, Tournament]): Existing tournaments, updated in place.
+        manifest (IngestionManifest | str | Path): Manifest or its JSON path.
+        store (RoundStore | None): Optional round store that new rounds are appended to.
+    """
+
+    def __init__(self, players, tournaments, manifest, store=None):
+        self.players = players
+        self.tournaments = tournaments
+        self.manifest = manifest if isinstance(manifest, IngestionManifest) else IngestionManifest(manifest)
+        self.store = store
+        # (player, date, total) -> course -> source ids that contributed it
+        self._owners = defaultdict(lambda: defaultdict(set))
+        for source_id, entry in self.manifest.sources.items():
+            for key in entry["keys"]:
+                self._index(key, source_id)
+
+    def _index(self, key, source_id):
+        loose, course = _split_key(key)
+        self._owners[loose][course].add(source_id)
+
+    def _seen_elsewhere(self, key, source_id):
+        """True if another source already contributed this round."""
+        if key.split(_KEY_SEP)[1] == "":
+            return False  # undated rounds (older event sheets) can't be matched
+        loose, course = _split_key(key)
+        for other_course, owners in self._owners.get(loose, {}).items():
+            if other_course == course or "" in (course, other_course):
+                if owners - {source_id}:
+                    return True
+        return False
+
+    def _get_or_create_player(self, name):
+        if name not in self.players:
+            self.players[name] = Player(name)
+        return self.players[name]
+
+    def _tournament_round(self, name):
+        tournament = self.tournaments.get(name)
+        if tournament is None:
+            tournament = self.tournaments[name] = Tournament(name)
+        for rnd in tournament.rounds:
+            if isinstance(rnd, Round):
+                return rnd
+        round_obj = Round(name, round_number=1)
+        tournament.rounds.append(round_obj)
+        return round_obj
+
+    def apply(self, source_id, fingerprint, rows):
+        """
+        Add new rows from a source, drop rounds the source no longer contains.
+
+        Returns:
+            (added, duplicates, removed) counts.
+        """
+        old_keys = set(self.manifest.sources.get(source_id, {}).get("keys", []))
+        new_keys = []
+        added, duplicates = [], 0
+
+        for row in rows:
+            key = round_key(row["player"], row["date"], row["course_played"], row["total"])
+            new_keys.append(key)
+            if key in old_keys:
+                continue
+            is_duplicate = self._seen_elsewhere(key, source_id)
+            self._index(key, source_id)
+            old_keys.add(key)
+
+            player = self._get_or_create_player(row["player"])
+            rnd = PlayerRoundInfo(
+                player=player,
+                tournament_name=row["tournament_name"],
+                tournament_flag=row["tournament_flag"],
+                round_number=1,
+                handicap=row["handicap"],
+                tee=row["tee"],
+                hole_scores=row["hole_scores"],
+                total=row["total"],
+                net=row["net"],
+                date=row["date"],
+                index=row["index"],
+                cr=row["cr"],
+                sr=row["sr"],
+                course_played=row["course_played"],
+            )
+            rnd.completed = row["completed"]
+            rnd.duplicate = is_duplicate
+            duplicates += is_duplicate
+            rename_round_by_date(rnd, self.tournaments)
+            player.rounds.append(rnd)
+            if rnd.tournament_name == row["tournament_name"]:
+                self._tournament_round(rnd.tournament_name).player_rounds.append(rnd)
+            added.append(rnd)
+
+        removed = self._remove_stale(source_id, old_keys - set(new_keys))
+        self.manifest.sources[source_id] = {"fingerprint": fingerprint, "keys": sorted(set(new_keys))}
+        if self.store is not None and added:
+            self.store.append(added)
+        return len(added), duplicates, removed
+
+    def _remove_stale(self, source_id, stale_keys):
+        """
+        Remove one round per key the source no longer contains (its row was
+        deleted or edited). If another source still has the same round, the
+        remaining copy is no longer a duplicate.
+        """
+        removed = 0
+        for key in stale_keys:
+            loose, course = _split_key(key)
+            self._owners[loose][course].discard(source_id)
+            player = self.players.get(key.split(_KEY_SEP)[0])
+            if player is None:
+                continue
+            matches = [r for r in player.rounds if _rnd_key(r) == key]
+            if not matches:
+                continue
+            rnd = next((r for r in matches if not r.duplicate), matches[0])
+            player.rounds.remove(rnd)
+            self._drop_from_tournament(rnd)
+            removed += 1
+            remaining = [r for r in matches if r is not rnd]
+            if remaining and not any(not r.duplicate for r in remaining):
+                remaining[0].duplicate = False
+
+        if removed and self.store is not None:
+            print(f"⚠️ {removed} stale rounds removed from players; rebuild the round store to drop them there too.")
+        return removed
+
+    def _drop_from_tournament(self, rnd):
+        tournament = self.tournaments.get(rnd.tournament_name)
+        if tournament is None:
+            return
+        for item in list(tournament.rounds):
+            if item is rnd:
+                tournament.rounds.remove(item)
+            elif isinstance(item, Round):
+                item.player_rounds[:] = [r for r in item.player_rounds if r is not rnd]
+
+    # --- Sources ---
+
+    @timed("ingest.workbook")
+    def ingest_workbook(self, file_path, sheets=None, verbose=False, cache=None):
+        """
+        Ingest an event workbook sheet by sheet, parsing only changed sheets.
+
+        Returns:
+            dict[str, tuple]: (added, duplicates, removed) per parsed sheet.
+        """
+        jobs = [(file_path, sheets)] if sheets is not None else [file_path]
+        return self.ingest_workbooks(jobs, workers=1, cache=cache, verbose=verbose)[file_path]
+
+    @timed("ingest.workbooks")
+    def ingest_workbooks(self, workbooks, workers=None, cache=None, verbose=False):
+        """
+        Ingest several event workbooks, parsing their changed sheets in parallel.
+
+        Sheets are applied in the order given (workbooks in order, sheets in
+        workbook order), so players and tournaments come out the same for any
+        worker count.
+
+        Args:
+            workbooks (list): Workbook paths, or (path, [sheet, ...]) to ingest
+                only some sheets.
+            workers (int | None): Worker processes (default: os.cpu_count()); 1 parses inline.
+            cache (SheetCache | str | Path | None): Parsed-sheet cache or its directory.
+            verbose (bool): Print each sheet's scoring mode.
+
+        Returns:
+            dict: {workbook path: {sheet: (added, duplicates, removed)}}.
+        """
+        if cache is not None and not isinstance(cache, SheetCache):
+            cache = SheetCache(cache)
+        jobs = []
+        for item in workbooks:
+            file_path, sheets = item if isinstance(item, tuple) else (item, None)
+            fingerprints = cache.fingerprints(file_path) if cache is not None else sheet_fingerprints(file_path)
+            for sheet in sheets or list(fingerprints):
+                source_id = IngestionManifest.source_id(file_path, sheet)
+                if not self.manifest.is_current(source_id, fingerprints[sheet]):
+                    jobs.append((file_path, sheet, fingerprints[sheet]))
+
+        parsed = parse_workbooks(jobs, workers, cache, verbose)
+
+        reports = {item[0] if isinstance(item, tuple) else item: {} for item in workbooks}
+        for (file_path, sheet, fingerprint), rows in zip(jobs, parsed):
+            source_id = IngestionManifest.source_id(file_path, sheet)
+            with stage("apply"):
+                reports[file_path][sheet] = self.apply(source_id, fingerprint, rows)
+            count("rows", len(rows))
+        self.manifest.save()
+        for file_path, report in reports.items():
+            _print_report(file_path, report)
+        return reports
+
+    @timed("ingest.posted")
+    def ingest_posted_report(self, file_path):
+        """Ingest a posted-score report, skipping it if unchanged."""
+        fingerprint = file_fingerprint(file_path)
+        source_id = IngestionManifest.source_id(file_path, "posted")
+        report = {}
+        if not self.manifest.is_current(source_id, fingerprint):
+            with stage("read_excel"):
+                df = pd.read_excel(file_path)
+            with stage("parse"):
+                rows = parse_posted_report(df)
+            with stage("apply"):
+                report["posted"] = self.apply(source_id, fingerprint, rows)
+            count("rows", len(rows))
+        self.manifest.save()
+        _print_report(file_path, report)
+        return report
+
+
+# --- Parallel workbook loading and the parsed-sheet cache ---
+
+# Bump when parse_event_sheet output changes, so cached sheets are parsed again.
+SHEET_CACHE_VERSION = 1
+
+# Round dict fields of a cached sheet by storage type.
+_TEXT_FIELDS = ("player", "tournament_name", "tee", "course_played")
+_INT_FIELDS = ("handicap", "total", "net", "sr")
+_FLOAT_FIELDS = ("index", "cr")
+_BOOL_FIELDS = ("tournament_flag", "completed")
+
+
+def _excel_value(value):
+    """Cell value as pd.read_excel returns it: whole floats become ints."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def sheet_frame(worksheet):
+    """
+    DataFrame of an openpyxl worksheet with the header in the first row, as
+    pd.read_excel builds it (blank rows dropped, unnamed columns "Unnamed: i").
+    """
+    rows = [[_excel_value(v) for v in row] for row in worksheet.iter_rows(values_only=True)]
+    if not rows:
+        return pd.DataFrame()
+    header = [f"Unnamed: {i}" if h is None else h for i, h in enumerate(rows[0])]
+    data = [row for row in rows[1:] if any(v is not None for v in row)]
+    return pd.DataFrame(data, columns=header)
+
+
+def _encode_rows(rows):
+    """Round dicts of one sheet -> typed arrays (None as NaN / NaT / a mask)."""
+    arrays = {}
+    for name in _TEXT_FIELDS:
+        values = [r[name] for r in rows]
+        arrays[name] = np.array(["" if v is None else str(v) for v in values], dtype=str)
+        arrays[f"{name}_none"] = np.array([v is None for v in values], dtype=bool)
+    for name in _INT_FIELDS + _FLOAT_FIELDS:
+        arrays[name] = np.array([np.nan if r[name] is None else r[name] for r in rows], dtype=float)
+    for name in _BOOL_FIELDS:
+        arrays[name] = np.array([bool(r[name]) for r in rows], dtype=bool)
+    arrays["date"] = np.array([r["date"] for r in rows], dtype="datetime64[D]")
+    lengths = [len(r["hole_scores"]) for r in rows]
+    holes = np.zeros((len(rows), max(lengths + [0])), dtype=np.int16)
+    for i, scores in enumerate(r["hole_scores"] for r in rows):
+        holes[i, :len(scores)] = scores
+    arrays["hole_scores"] = holes
+    arrays["n_holes"] = np.array(lengths, dtype=np.int16)
+    return arrays
+
+
+def _decode_rows(arrays):
+    """Inverse of _encode_rows."""
+    fields = {}
+    for name in _TEXT_FIELDS:
+        fields[name] = [None if none else v
+                        for v, none in zip(arrays[name].tolist(), arrays[f"{name}_none"].tolist())]
+    for name in _INT_FIELDS:
+        fields[name] = [None if v != v else int(v) for v in arrays[name].tolist()]
+    for name in _FLOAT_FIELDS:
+        fields[name] = [None if v != v else v for v in arrays[name].tolist()]
+    for name in _BOOL_FIELDS:
+        fields[name] = arrays[name].tolist()
+    fields["date"] = arrays["date"].tolist()
+    fields["hole_scores"] = [h[:n] for h, n in zip(arrays["hole_scores"].tolist(), arrays["n_holes"].tolist())]
+    return [dict(zip(fields, values)) for values in zip(*fields.values())]
+
+
+class SheetCache:
+    """
+    Parsed event sheets on disk, one typed .npz file (no pickles) per sheet.
+
+    Entries are keyed by workbook name, sheet name and the sheet's content
+    fingerprint (see sheet_fingerprints). The fingerprints are remembered per
+    workbook together with its size and mtime, so an untouched workbook is
+    not even unzipped. Text fields (player, tee, ...) are stored as strings.
+
+    Args:
+        path (str | Path): Cache directory (created if missing).
+    """
+
+    INDEX_FILE = "workbooks.json"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        index_file = self.path / self.INDEX_FILE
+        self._index = {}
+        if index_file.exists():
+            with open(index_file) as f:
+                self._index = json.load(f)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprints(self, file_path):
+        """sheet_fingerprints(file_path), recomputed only when the file's size or mtime changed."""
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        entry = self._index.get(str(path))
+        if entry is None or entry["stamp"] != stamp:
+            entry = self._index[str(path)] = {"stamp": stamp, "sheets": sheet_fingerprints(path)}
+            tmp = self.path / (self.INDEX_FILE + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self.path / self.INDEX_FILE)
+        return entry["sheets"]
+
+    def _file(self, file_path, sheet, fingerprint):
+        key = _KEY_SEP.join([Path(file_path).name, sheet, fingerprint, str(SHEET_CACHE_VERSION)])
+        return self.path / f"{hashlib.sha256(key.encode()).hexdigest()}.npz"
+
+    def load(self, file_path, sheet, fingerprint):
+        """Cached round dicts of a sheet, or None."""
+        try:
+            with np.load(self._file(file_path, sheet, fingerprint), allow_pickle=False) as archive:
+                rows = _decode_rows(archive)
+        except (FileNotFoundError, ValueError, OSError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return rows
+
+    def store(self, file_path, sheet, fingerprint, rows):
+        file = self._file(file_path, sheet, fingerprint)
+        tmp = file.with_name(file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **_encode_rows(rows))
+        os.replace(tmp, file)
+
+
+def _parse_workbook_sheets(file_path, sheets, verbose=False):
+    """Open a workbook once (read-only) and parse the given event sheets."""
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        parsed = []
+        for sheet in sheets:
+            with stage("read_excel"):
+                df = sheet_frame(workbook[sheet])
+            with stage("parse"):
+                parsed.append(parse_event_sheet(df, sheet, verbose))
+        return parsed
+    finally:
+        workbook.close()
+
+
+def _parse_workbook_sheets_recorded(file_path, sheets, verbose, options):
+    return call_recorded(options, _parse_workbook_sheets, file_path, sheets, verbose)
+
+
+def parse_workbooks(jobs, workers=None, cache=None, verbose=False):
+    """
+    Parse event sheets from one or more workbooks in a process pool.
+
+    Cached sheets are loaded from the cache; the rest are grouped by workbook
+    and split into at most `workers` tasks per workbook, each of which opens
+    its workbook once. Newly parsed sheets are written to the cache.
+
+    Args:
+        jobs (list[tuple]): (file_path, sheet, fingerprint) per sheet.
+        workers (int | None): Worker processes (default: os.cpu_count()); 1 parses inline.
+        cache (SheetCache | None): Parsed-sheet cache.
+        verbose (bool): Print each sheet's scoring mode.
+
+    Returns:
+        list[list[dict]]: Round dicts per job, in the order of jobs.
+    """
+    results = [None] * len(jobs)
+    if cache is not None:
+        with stage("sheet_cache"):
+            results = [cache.load(*job) for job in jobs]
+    missing = defaultdict(list)
+    for i, rows in enumerate(results):
+        if rows is None:
+            missing[jobs[i][0]].append(i)
+
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for file_path, indices in missing.items():
+        n_tasks = min(workers, len(indices))
+        tasks += [(file_path, indices[k::n_tasks]) for k in range(n_tasks)]
+    paths = [str(file_path) for file_path, _ in tasks]
+    sheets = [[jobs[i][1] for i in indices] for _, indices in tasks]
+
+    if workers == 1 or len(tasks) <= 1:
+        outputs = [_parse_workbook_sheets(p, s, verbose) for p, s in zip(paths, sheets)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            options = [worker_options()] * len(tasks)
+            outputs = []
+            for parsed, stages in pool.map(_parse_workbook_sheets_recorded, paths, sheets,
+                                           [verbose] * len(tasks), options):
+                merge_stages(stages)
+                outputs.append(parsed)
+
+    for (_, indices), parsed in zip(tasks, outputs):
+        for i, rows in zip(indices, parsed):
+            results[i] = rows
+            if cache is not None:
+                cache.store(*jobs[i], rows)
+        count("sheets", len(indices))
+    return results
+
+
+# --- Streaming posted reports ---
+
+def iter_posted_batches(file_path, batch_size=POSTED_BATCH_ROWS):
+    """
+    Yield a posted-score report as DataFrames of at most batch_size rows
+    holding the POSTED_COLUMNS.
+
+    .csv files use pandas' chunked reader; .xlsx files are streamed row by row
+    with openpyxl in read-only mode, so the whole sheet is never in memory.
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == ".csv":
+        yield from pd.read_csv(path, usecols=POSTED_COLUMNS, chunksize=batch_size)
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = ["" if h is None else str(h).strip() for h in next(rows, ())]
+        missing = [col for col in POSTED_COLUMNS if col not in header]
+        if missing:
+            raise ValueError(f"❌ Posted report {path.name} is missing column(s): {', '.join(missing)}")
+        positions = [header.index(col) for col in POSTED_COLUMNS]
+        batch = []
+        for row in rows:
+            batch.append([row[i] if i < len(row) else None for i in positions])
+            if len(batch) == batch_size:
+                yield pd.DataFrame(batch, columns=POSTED_COLUMNS)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=POSTED_COLUMNS)
+    finally:
+        workbook.close()
+
+
+def _parse_dates(values):
+    """Dates column -> datetime64[D] (NaT where missing)."""
+    try:
+        dates = pd.to_datetime(values)
+    except (ValueError, TypeError):
+        dates = pd.to_datetime(values, format="mixed", errors="coerce")
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]")
+
+
+def _numeric(values):
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+
+def posted_batch_columns(batch, strings):
+    """
+    Clean one batch of a posted report into round store columns, vectorized.
+
+    Produces what parse_posted_report and Ingestor.apply would store: the
+    "Mr." prefix is stripped from names, rows without a name or AGS are
+    dropped, net is AGS minus course handicap, and rounds played on a
+    TOURNAMENT_DATES date are renamed to that tournament.
+
+    Args:
+        batch (DataFrame): Rows with the POSTED_COLUMNS.
+        strings (dict[str, list[str]]): The store's string tables, extended in place.
+
+    Returns:
+        dict[str, ndarray] for RoundStore.append_columns.
+    """
+    batch = batch[batch["Golfer Name"].notna() & batch["AGS"].notna()]
+    n = len(batch)
+    cols = empty_columns(n)
+    names = batch["Golfer Name"].astype(str).str.replace(_MR_PREFIX, "", regex=True).str.strip()
+    cols["player"] = intern_strings(strings, "player", names.to_numpy(dtype=object))
+    cols["course"] = intern_strings(strings, "course", batch["Course Played"].to_numpy(dtype=object))
+    cols["total"] = _numeric(batch["AGS"])
+    cols["handicap"] = _numeric(batch["Course Handicap"])
+    cols["net"] = cols["total"] - cols["handicap"]
+    cols["index"] = _numeric(batch["Handicap Index"])
+    cols["cr"] = _numeric(batch["Course Rating"])
+    cols["sr"] = _numeric(batch["Slope Rating"])
+    cols["date"] = _parse_dates(batch["Date Played"])
+    cols["completed"] = _numeric(batch["Holes Played"]) == 18
+    cols["round_number"][:] = 1
+
+    tournament = np.full(n, POSTED_TOURNAMENT, dtype=object)
+    event_days = np.array(list(TOURNAMENT_DATES), dtype="datetime64[D]")
+    renamed = np.flatnonzero(np.isin(cols["date"], event_days))
+    for i in renamed:
+        tournament[i] = TOURNAMENT_DATES[cols["date"][i].item()]
+    cols["tournament_flag"][renamed] = True
+    cols["tournament"] = intern_strings(strings, "tournament", tournament)
+    return cols
+
+
+@timed("ingest.posted_stream")
+def stream_posted_report(file_path, store, manifest=None, batch_size=POSTED_BATCH_ROWS):
+    """
+    Stream a posted-score report (.xlsx or .csv) straight into a RoundStore.
+
+    With a manifest, an unchanged file is skipped and rows this source already
+    contributed are not appended again. Rows matching a round already in the
+    store (same player, date and total, course equal or unknown) are appended
+    flagged duplicate, as Ingestor.apply does. The store is append-only: rows
+    deleted from the report are not removed (rebuild the store for that).
+
+    Args:
+        file_path (str | Path): Posted report.
+        store (RoundStore): Store the rows are appended to.
+        manifest (IngestionManifest | str | Path | None): Manifest or its JSON path.
+        batch_size (int): Rows read, cleaned and appended at a time.
+
+    Returns:
+        (added, duplicates) counts.
+    """
+    if manifest is not None and not isinstance(manifest, IngestionManifest):
+        manifest = IngestionManifest(manifest)
+    fingerprint = file_fingerprint(file_path)
+    source_id = IngestionManifest.source_id(file_path, "posted")
+    if manifest is not None and manifest.is_current(source_id, fingerprint):
+        _print_report(file_path, {})
+        return 0, 0
+    old_keys = set(manifest.sources.get(source_id, {}).get("keys", [])) if manifest is not None else set()
+
+    # (player, day, total) -> courses of the rounds already in the store
+    stored = defaultdict(set)
+    days = store.column("date").astype("int64").tolist()
+    for p, d, t, c, dated in zip(store.column("player").tolist(), days, store.column("total").tolist(),
+                                 store.column("course").tolist(), ~np.isnat(store.column("date"))):
+        if dated:
+            stored[(p, d, t)].add(c)
+
+    strings = store.meta["strings"]
+    new_keys, added, duplicates = [], 0, 0
+    for batch in iter_posted_batches(file_path, batch_size):
+        with stage("clean"):
+            cols = posted_batch_columns(batch, strings)
+        with stage("dedup"):
+            names, courses = strings["player"], strings["course"]
+            n = len(cols["player"])
+            keep = np.zeros(n, dtype=bool)
+            rows = zip(cols["player"].tolist(), cols["date"].tolist(), cols["date"].astype("int64").tolist(),
+                       cols["total"].tolist(), cols["course"].tolist())
+            for i, (p, day, day_id, t, c) in enumerate(rows):
+                key = round_key(names[p], day, courses[c] if c >= 0 else None, t)
+                new_keys.append(key)
+                if key in old_keys:
+                    continue
+                old_keys.add(key)
+                keep[i] = True
+                if day is not None:
+                    seen = stored.get((p, day_id, t))
+                    cols["duplicate"][i] = bool(seen) and (c in seen or -1 in seen or c < 0)
+        with stage("append"):
+            cols = {name: values[keep] for name, values in cols.items()}
+            added += store.append_columns(cols)
+            duplicates += int(cols["duplicate"].sum())
+        count("rows", n)
+
+    if manifest is not None:
+        manifest.sources[source_id] = {"fingerprint": fingerprint, "keys": sorted(set(new_keys))}
+        manifest.save()
+    _print_report(file_path, {"posted": (added, duplicates, 0)})
+    return added, duplicates
+
+
+# --- Team sheets ---
+
+def _team_sheet_pairs(df):
+    """(row index, team name, [(player1, player2)] * 3) for each row of a C team sheet."""
+    for idx, row in df.iterrows():
+        pairs = [(row.iloc[c1], row.iloc[c2]) for c1, c2 in TEAM_PLAYER_COLUMNS]
+        yield idx, str(row.iloc[0]), pairs
+
+
+@timed("ingest.c_teams")
+def load_c_teams_from_excel(file_path, players, fuzzy=True):
+    """
+    Load C teams (3 MM teams of 2 players each) from a team sheet.
+
+    All player names in the sheet are resolved in one NameIndex pass.
+    Rows with a missing or unknown player are reported and skipped.
+
+    Returns:
+        (c_teams, mm_teams): dicts keyed by team name.
+    """
+    df = pd.read_excel(file_path, header=0)
+    rows = list(_team_sheet_pairs(df))
+    names = [n for _, _, pairs in rows for pair in pairs for n in pair if isinstance(n, str)]
+    resolved = name_index(players).resolve_many(names, fuzzy=fuzzy)
+
+    c_teams, mm_teams = {}, {}
+    for idx, c_team_name, pairs in rows:
+        try:
+            mm_team_objs = []
+            for player1_name, player2_name in pairs:
+                if not isinstance(player1_name, str) or not isinstance(player2_name, str):
+                    raise ValueError("Missing or invalid player name")
+                player1, player2 = resolved[player1_name], resolved[player2_name]
+                if not player1 or not player2:
+                    raise ValueError(f"Missing player object(s): {player1_name}, {player2_name}")
+                mm_team_name = f"{player1_name}/{player2_name}"
+                mm_team = MMTeam(name=mm_team_name, player1=player1, player2=player2)
+                mm_teams[mm_team_name] = mm_team
+                mm_team_objs.append(mm_team)
+            c_teams[c_team_name] = CTeam(name=c_team_name, mm_teams=mm_team_objs)
+        except ValueError as e:
+            print(f"⚠️ Error on row {idx + 2}: {e}")
+
+    print(f"✅ Loaded {len(c_teams)} CTeams and {len(mm_teams)} MMTeams from file.")
+    return c_teams, mm_teams
+
+
+def check_unmatched_cteam_players(file_path, players):
+    """
+    List team sheet names that do not match a player exactly or canonically.
+
+    Returns:
+        DataFrame with columns "Unmatched Name" and "Suggestions".
+    """
+    df = pd.read_excel(file_path, header=0)
+    names_in_sheet = set()
+    for c1, c2 in TEAM_PLAYER_COLUMNS:
+        for col in (c1, c2):
+            if col < len(df.columns):
+                names_in_sheet.update(df.iloc[:, col].dropna().astype(str).tolist())
+    print(f"✅ Found {len(names_in_sheet)} unique player names in the team sheet")
+
+    index = name_index(players)
+    report = [(name, index.suggestions(name))
+              for name in sorted(names_in_sheet) if index.lookup(name) is None]
+    return pd.DataFrame(report, columns=["Unmatched Name", "Suggestions"])
+
+
+def rename_round_by_date(rnd, tournaments, replacements=TOURNAMENT_DATES):
+    """Rename a round to the tournament played on its date, if any."""
+    new_name = replacements.get(rnd.date)
+    if not new_name:
+        return False
+    rnd.tournament_name = new_name
+    rnd.tournament_flag = True
+    if new_name not in tournaments:
+        tournaments[new_name] = Tournament(name=new_name)
+    tournaments[new_name].rounds.append(rnd)
+    return True
+
+
+def _print_report(file_path, report):
+    name = Path(file_path).name
+    if not report:
+        print(f"⏭️ {name}: unchanged")
+        return
+    for source, (added, duplicates, removed) in report.items():
+        print(f"✅ {name} [{source}]: +{added} rounds ({duplicates} duplicates), -{removed} stale")
@@ -0,0 +1,360 @@
+# golf_instrument.py
+"""
+Opt-in timers, counters and profiling for the ingestion and simulation stages.
+
+Instrumented code marks its stages with
+
+    with stage("sample"):
+        ...
+    count("rows", n)
+
+or decorates a function with @timed("ingest.workbook"). Nested stages are
+reported by path, e.g. "simulate_tournament/sample". While nothing is
+recording, stage() returns a shared no-op context and count() returns at
+once, so the hooks cost one global lookup.
+
+Recording is turned on with the instrument() context manager:
+
+    with instrument(profile=True, memory=True) as rec:
+        simulate_tournament(c_teams, 100000)
+    rec.print_report()
+    rec.save("instrument.json")
+
+or for a whole process with the environment variable
+
+    GOLF_INSTRUMENT=1                  timers and counters
+    GOLF_INSTRUMENT=profile,memory     plus cProfile and tracemalloc peaks
+    GOLF_INSTRUMENT_REPORT=run.json    also write the JSON report at exit
+
+which prints the per-stage table when the process exits.
+
+Process pools record in the workers too: the parent passes worker_options()
+to each task, the worker runs it through call_recorded and returns its stages
+with the result, and the parent adds them with merge_stages. Worker stages
+are summed over workers, so their seconds can exceed the wall time; cProfile
+covers the parent process only.
+"""
+
+import atexit
+import contextlib
+import functools
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+ENV_VAR = "GOLF_INSTRUMENT"
+REPORT_ENV_VAR = "GOLF_INSTRUMENT_REPORT"
+PROFILE_TOP = 25
+
+_NULL_STAGE = contextlib.nullcontext()
+_recorder = None
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "peak_bytes", "counters")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self.counters = {}
+
+    def as_dict(self):
+        return {"calls": self.calls, "seconds": self.seconds,
+                "peak_mb": self.peak_bytes / 2 ** 20, "counters": dict(self.counters)}
+
+
+class _Frame:
+    __slots__ = ("path", "start", "mem_start", "peak")
+
+    def __init__(self, path, mem_start):
+        self.path = path
+        self.start = time.perf_counter()
+        self.mem_start = mem_start
+        self.peak = mem_start
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "frame")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.frame = self.recorder._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder._exit(self.frame)
+        return False
+
+
+class Recorder:
+    """
+    Collects per-stage wall time, call counts, counters and (optionally)
+    tracemalloc peaks and a cProfile of everything run while recording.
+
+    Stage stacks are per thread, so a background simulation (see
+    golf_valuation.LiveValuation) is reported under its own top-level stages.
+    """
+
+    def __init__(self, profile=False, memory=False):
+        self.profile = profile
+        self.memory = memory
+        self.stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = None
+        self._started_tracemalloc = False
+        self._profile_stats = None
+        self.started = None
+        self.seconds = None
+
+    # --- Lifecycle ---
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if self._profiler is not None:
+            import pstats
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            self._profile_stats = out.getvalue()
+            self._profiler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    # --- Stages ---
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        stack = self._stack()
+        path = f"{stack[-1].path}/{name}" if stack else name
+        mem = 0
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            mem = current
+        frame = _Frame(path, mem)
+        stack.append(frame)
+        return frame
+
+    def _exit(self, frame):
+        elapsed = time.perf_counter() - frame.start
+        stack = self._stack()
+        stack.pop()
+        peak = 0
+        if self.memory and tracemalloc.is_tracing():
+            absolute = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            peak = absolute - frame.mem_start
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, absolute)
+        with self._lock:
+            stats = self.stages.get(frame.path)
+            if stats is None:
+                stats = self.stages[frame.path] = StageStats()
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.peak_bytes = max(stats.peak_bytes, peak)
+
+    def count(self, name, n=1):
+        stack = self._stack()
+        path = stack[-1].path if stack else ""
+        with self._lock:
+            stats = self.stages.get(path)
+            if stats is None:
+                stats = self.stages[path] = StageStats()
+            stats.counters[name] = stats.counters.get(name, 0) + n
+
+    def merge(self, stages):
+        """
+        Add stages recorded elsewhere (a report's "stages", e.g. from a worker
+        process) under the current thread's stage, as if they had run inline.
+        """
+        stack = self._stack()
+        prefix = stack[-1].path if stack else ""
+        with self._lock:
+            for path, s in stages.items():
+                full = "/".join(p for p in (prefix, path) if p)
+                stats = self.stages.get(full)
+                if stats is None:
+                    stats = self.stages[full] = StageStats()
+                stats.calls += s["calls"]
+                stats.seconds += s["seconds"]
+                stats.peak_bytes = max(stats.peak_bytes, int(s["peak_mb"] * 2 ** 20))
+                for name, n in s["counters"].items():
+                    stats.counters[name] = stats.counters.get(name, 0) + n
+
+    # --- Report ---
+
+    def report(self):
+        """
+        Structured report.
+
+        Keys: seconds (recorded wall time), memory (whether peaks were traced),
+        stages ({path: calls, seconds, peak_mb, counters}) and profile_stats
+        (cProfile text, or None).
+        """
+        with self._lock:
+            stages = {path: s.as_dict() for path, s in sorted(self.stages.items())}
+        return {"seconds": self.seconds, "memory": self.memory, "stages": stages,
+                "profile_stats": self._profile_stats}
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=1)
+
+    def print_report(self):
+        report = self.report()
+        total = report["seconds"]
+        print("\n⏱️ Instrumented stages" + (f" ({total:.3f} s recorded)" if total else ""))
+        print(f"{'Stage':<48} {'Calls':>7} {'Seconds':>10} {'Peak MB':>9}  Counters")
+        for path, s in report["stages"].items():
+            if not path:
+                path = "(top level)"
+            counters = ", ".join(f"{k}={v:,}" for k, v in s["counters"].items())
+            peak = f"{s['peak_mb']:>9.1f}" if self.memory else f"{'':>9}"
+            print(f"{path:<48} {s['calls']:>7,} {s['seconds']:>10.4f} {peak}  {counters}")
+        if report["profile_stats"]:
+            print(report["profile_stats"])
+
+
+# --- Hooks used by instrumented code ---
+
+def stage(name):
+    """Context manager timing one stage; a no-op unless recording."""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_STAGE
+    return _Stage(recorder, name)
+
+
+def count(name, n=1):
+    """Add n to a counter of the current stage; a no-op unless recording."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, n)
+
+
+def timed(name=None):
+    """Decorator running the function as a stage (default name: its __qualname__)."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return fn(*args, **kwargs)
+            with _Stage(recorder, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def recording():
+    """The active Recorder, or None."""
+    return _recorder
+
+
+def worker_options():
+    """Recording settings to pass to worker processes, or None when not recording."""
+    recorder = _recorder
+    return None if recorder is None else {"memory": recorder.memory}
+
+
+def call_recorded(options, fn, *args):
+    """
+    Run fn(*args) in a worker process, recording its stages if options (from
+    worker_options) is not None.
+
+    Returns:
+        (result, stages): stages is the worker's report()["stages"], or None;
+        hand it to merge_stages in the parent.
+    """
+    if options is None:
+        return fn(*args), None
+    with instrument(memory=options["memory"]) as recorder:
+        result = fn(*args)
+    return result, recorder.report()["stages"]
+
+
+def merge_stages(stages):
+    """Add a worker's stages to the active recorder, under the current stage."""
+    recorder = _recorder
+    if recorder is not None and stages:
+        recorder.merge(stages)
+
+
+@contextlib.contextmanager
+def instrument(profile=False, memory=False, report_path=None):
+    """
+    Record every instrumented stage run inside the block.
+
+    Args:
+        profile (bool): Also run cProfile over the block.
+        memory (bool): Also record tracemalloc peak memory per stage.
+        report_path (str | Path | None): Write the JSON report here on exit.
+
+    Yields:
+        Recorder
+    """
+    global _recorder
+    previous = _recorder
+    recorder = Recorder(profile=profile, memory=memory).start()
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+        recorder.stop()
+        if report_path is not None:
+            recorder.save(report_path)
+
+
+def _from_environment():
+    global _recorder
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return
+    options = {v.strip() for v in value.split(",")}
+    recorder = Recorder(profile="profile" in options, memory="memory" in options).start()
+    _recorder = recorder
+
+    def finish():
+        recorder.stop()
+        recorder.print_report()
+        report_path = os.environ.get(REPORT_ENV_VAR)
+        if report_path:
+            recorder.save(report_path)
+    atexit.register(finish)
+
+
+_from_environment()
@@ -0,0 +1,223 @@
+# golf_names.py
+"""
+Persistent player-name index for ingestion and team matching.
+
+A NameIndex is built once over a players dict and answers exact, normalized
+and fuzzy lookups without rescanning the roster:
+
+    exact       name.strip().lower(), as get_player_by_name always did
+    canonical   "Mr." stripped, "Last, First" -> "first last", spaces collapsed
+    fuzzy       trigram inverted index -> candidate names -> SequenceMatcher
+
+Names are stored, not Player objects, so replacing players[name] is picked
+up automatically. Lookups notice added or removed players by the size of the
+players dict and apply the difference incrementally; a rename (or a removal
+plus an add) keeps the size, so call index.add(name) or index.sync(force=True)
+after one.
+"""
+
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+_MR_PREFIX = re.compile(r"^mr\.?\s+")
+_SPACES = re.compile(r"\s+")
+
+# Candidates scored with SequenceMatcher per fuzzy lookup.
+MAX_FUZZY_CANDIDATES = 64
+
+
+def exact_key(name):
+    """Key used by get_player_by_name: stripped and lower-cased."""
+    return str(name).strip().lower()
+
+
+def canonical_name(name):
+    """
+    Normalize a roster or sheet name for matching.
+
+    >>> canonical_name("  Mr. SMITH,  John ")
+    'john smith'
+    """
+    key = _SPACES.sub(" ", exact_key(name))
+    key = _MR_PREFIX.sub("", key)
+    if key.count(",") == 1:
+        last, first = (part.strip() for part in key.split(","))
+        if last and first:
+            key = f"{first} {last}"
+    return key
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Name lookups over a players dict (see module docstring).
+
+    Args:
+        players (dict[str, Player]): Roster to index; kept by reference.
+    """
+
+    def __init__(self, players):
+        self.players = players
+        self._exact = {}                       # exact key -> player name
+        self._canonical = {}                   # canonical key -> player name
+        self._keys = {}                        # player name -> canonical key
+        self._grams = defaultdict(set)         # trigram -> canonical keys
+        self._by_canonical = defaultdict(set)  # canonical key -> player names
+        self._by_last = defaultdict(set)       # last name -> player names
+        for name in players:
+            self._add(name)
+
+    def __len__(self):
+        return len(self._keys)
+
+    # --- Maintenance ---
+
+    def _add(self, name):
+        key = canonical_name(name)
+        # Later names win on collisions, like the dict rebuilt by get_player_by_name.
+        self._exact[exact_key(name)] = name
+        self._canonical[key] = name
+        self._keys[name] = key
+        self._by_canonical[key].add(name)
+        for gram in trigrams(key):
+            self._grams[gram].add(key)
+        parts = key.split()
+        if len(parts) >= 2:
+            self._by_last[parts[-1]].add(name)
+
+    def _remove(self, name):
+        key = self._keys.pop(name)
+        if self._exact.get(exact_key(name)) == name:
+            del self._exact[exact_key(name)]
+        self._by_canonical[key].discard(name)
+        remaining = self._by_canonical[key]
+        if remaining:
+            self._canonical[key] = next(iter(remaining))
+        else:
+            del self._by_canonical[key]
+            self._canonical.pop(key, None)
+            for gram in trigrams(key):
+                self._grams[gram].discard(key)
+        parts = key.split()
+        if len(parts) >= 2:
+            self._by_last[parts[-1]].discard(name)
+
+    def add(self, name):
+        """Index a newly added player name."""
+        if name not in self._keys:
+            self._add(name)
+
+    def sync(self, force=False):
+        """
+        Bring the index in line with the players dict after adds or removals;
+        only the difference is applied. Changes that keep the number of
+        players (renames) are only seen with force=True.
+        """
+        if not force and len(self.players) == len(self._keys):
+            return
+        for name in self._keys.keys() - self.players.keys():
+            self._remove(name)
+        for name in self.players.keys() - self._keys.keys():
+            self._add(name)
+
+    # --- Lookups ---
+
+    def _player(self, name):
+        return self.players.get(name) if name is not None else None
+
+    def lookup(self, name):
+        """Exact or canonical match (no fuzzy), as a player name or None."""
+        found = self._exact.get(exact_key(name))
+        if found is None:
+            found = self._canonical.get(canonical_name(name))
+        return found
+
+    def get(self, name, fuzzy=False, cutoff=0.8):
+        """Player for a name (see get_player_by_name), or None."""
+        self.sync()
+        return self._get(name, fuzzy, cutoff)
+
+    def _get(self, name, fuzzy, cutoff):
+        found = self.lookup(name)
+        if found is None and fuzzy:
+            matches = self._fuzzy(canonical_name(name), 1, cutoff)
+            if matches:
+                found = self._canonical[matches[0][1]]
+        return self._player(found)
+
+    def _fuzzy(self, key, n, cutoff):
+        """[(score, canonical key)] of the n best matches with score >= cutoff."""
+        shared = Counter()
+        for gram in trigrams(key):
+            shared.update(self._grams.get(gram, ()))
+        matcher = SequenceMatcher()
+        matcher.set_seq2(key)
+        scored = []
+        for candidate, _ in shared.most_common(MAX_FUZZY_CANDIDATES):
+            matcher.set_seq1(candidate)
+            if (matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff):
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, candidate))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return scored[:n]
+
+    def close_matches(self, name, n=5, cutoff=0.7):
+        """
+        Closest players to a name, like get_close_player_matches.
+
+        Returns:
+            List of tuples: (match_score, player_name, Player object), best first.
+        """
+        self.sync()
+        return self._close_matches(name, n, cutoff)
+
+    def _close_matches(self, name, n, cutoff):
+        matches = []
+        for score, key in self._fuzzy(canonical_name(name), n, cutoff):
+            for player_name in sorted(self._by_canonical[key]):
+                matches.append((score, player_name, self.players[player_name]))
+        return matches[:n]
+
+    def suggestions(self, name, n=3, cutoff=0.7):
+        """Player names sharing the last name, or else the closest fuzzy matches."""
+        self.sync()
+        parts = canonical_name(name).split()
+        if len(parts) >= 2 and self._by_last.get(parts[-1]):
+            return sorted(self._by_last[parts[-1]])
+        return [player_name for _, player_name, _ in self._close_matches(name, n, cutoff)]
+
+    def resolve_many(self, names, fuzzy=True, cutoff=0.8):
+        """
+        Resolve a whole sheet of names in one call.
+
+        Returns:
+            dict of each distinct input name -> Player or None.
+        """
+        self.sync()
+        resolved = {}
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self._get(name, fuzzy, cutoff)
+        return resolved
+
+
+# Index of the most recently used players dict. Dicts cannot be weakly
+# referenced, so only one is kept alive rather than one per id(players).
+_last_index = None
+
+
+def name_index(players):
+    """Shared NameIndex for a players dict, built on first use and kept in sync."""
+    global _last_index
+    index = _last_index
+    if index is None or index.players is not players:
+        index = _last_index = NameIndex(players)
+    else:
+        index.sync()
+    return index
@@ -0,0 +1,155 @@
+# golf_runner.py
+"""
+Multi-core sharded runner for the Day-2 tournament simulation.
+
+The requested simulation count is cut into fixed-size shards, and every shard
+gets its own np.random.SeedSequence child. Shards are merged in order, so a
+given seed produces bit-identical results no matter how many workers run them.
+
+Usage:
+    python src/golf_runner.py --sims 200000 --workers 8 --seed 2025
+    python src/golf_runner.py --exact
+    python src/golf_runner.py --sims 20000 --variance
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from golf_instrument import call_recorded, merge_stages, stage, timed, worker_options
+from golf_simulation import (CompiledField, TournamentResult, compile_field,
+                             print_tournament_results, score_field)
+from golf_scoring import simulate_rounds
+
+DEFAULT_SHARD_SIZE = 10000
+DEFAULT_TEAM_FILE = Path(__file__).resolve().parent.parent / "Data" / "golf_team_data.pkl"
+
+_worker_field = None
+
+
+def _init_worker(field):
+    global _worker_field
+    _worker_field = field
+
+
+@timed("shard")
+def _run_shard(n_sims, seed_seq, calibrated, field=None):
+    """Simulate one shard from its own SeedSequence."""
+    field = field if field is not None else _worker_field
+    rng = np.random.default_rng(seed_seq)
+    with stage("sample"):
+        player_scores = simulate_rounds(field.course_handicaps, n_sims, rng, calibrated=calibrated)
+    with stage("aggregate"):
+        return score_field(field, player_scores, rng)
+
+
+def _run_shard_recorded(n_sims, seed_seq, calibrated, options):
+    return call_recorded(options, _run_shard, n_sims, seed_seq, calibrated)
+
+
+def shard_sizes(n_sims, shard_size=DEFAULT_SHARD_SIZE):
+    """Split n_sims into full shards plus one remainder shard."""
+    full, rest = divmod(n_sims, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+
+def run_sharded(c_teams, n_sims, seed=None, workers=None,
+                shard_size=DEFAULT_SHARD_SIZE, calibrated=True):
+    """
+    Simulate n_sims tournaments across a process pool.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Teams to simulate.
+        n_sims (int): Total number of tournaments.
+        seed (int | None): Root seed; None draws fresh entropy.
+        workers (int | None): Worker processes (default: os.cpu_count()); 1 runs inline.
+        shard_size (int): Tournaments per shard. Changing it changes the random
+            streams, so keep it fixed when comparing seeds.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+
+    Returns:
+        (TournamentResult, entropy): merged result and the root seed entropy,
+        which reproduces the run when passed back as seed.
+    """
+    field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+    root = np.random.SeedSequence(seed)
+    sizes = shard_sizes(n_sims, shard_size)
+    children = root.spawn(len(sizes))
+    workers = workers or os.cpu_count() or 1
+
+    result = TournamentResult.empty(field.team_names)
+    if workers == 1 or len(sizes) <= 1:
+        for n, child in zip(sizes, children):
+            result.merge(_run_shard(n, child, calibrated, field))
+        return result, root.entropy
+
+    # Player objects stay in the parent; workers only need the index arrays.
+    light_field = replace(field, players=[])
+    with ProcessPoolExecutor(max_workers=min(workers, len(sizes)),
+                             initializer=_init_worker, initargs=(light_field,)) as pool:
+        options = [worker_options()] * len(sizes)
+        for shard, stages in pool.map(_run_shard_recorded, sizes, children,
+                                      [calibrated] * len(sizes), options):
+            merge_stages(stages)
+            result.merge(shard)
+    return result, root.entropy
+
+
+def main(argv=None):
+    from golf_utils import load_pickle
+
+    parser = argparse.ArgumentParser(description="Simulate Day-2 Calcutta win probabilities.")
+    parser.add_argument("--sims", type=int, default=100000, help="number of simulated tournaments")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=None, help="root seed for reproducible runs")
+    parser.add_argument("--teams", type=Path, default=DEFAULT_TEAM_FILE, help="team pickle file")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--uncalibrated", action="store_true",
+                        help="skip CALIBRATION_CORRECTIONS")
+    parser.add_argument("--top", type=int, default=None, help="only print the top N teams")
+    parser.add_argument("--exact", action="store_true",
+                        help="compute exact win probabilities instead of simulating")
+    parser.add_argument("--variance", choices=("iid", "antithetic", "stratified"), nargs="?",
+                        const="stratified", default=None,
+                        help="variance-reduced estimator with control variates (single process; "
+                             "default stratified)")
+    args = parser.parse_args(argv)
+
+    team_data = load_pickle(args.teams)
+    if not team_data or not team_data.get("c_teams"):
+        parser.error(f"No c_teams found in {args.teams}")
+
+    if args.exact:
+        from golf_exact import exact_tournament, print_exact_results
+        start = time.perf_counter()
+        result = exact_tournament(team_data["c_teams"], calibrated=not args.uncalibrated)
+        print_exact_results(result, top_n=args.top)
+        print(f"\n⏱️ Exact distributions in {time.perf_counter() - start:.2f}s")
+        return
+
+    if args.variance:
+        from golf_variance import print_variance_results, simulate_tournament_vr
+        start = time.perf_counter()
+        result = simulate_tournament_vr(team_data["c_teams"], args.sims, method=args.variance,
+                                        rng=args.seed, calibrated=not args.uncalibrated)
+        print_variance_results(result, top_n=args.top)
+        print(f"\n⏱️ {args.sims:,} {args.variance} sims in {time.perf_counter() - start:.2f}s")
+        return
+
+    start = time.perf_counter()
+    result, entropy = run_sharded(team_data["c_teams"], args.sims, seed=args.seed,
+                                  workers=args.workers, shard_size=args.shard_size,
+                                  calibrated=not args.uncalibrated)
+    elapsed = time.perf_counter() - start
+
+    print_tournament_results(result, top_n=args.top)
+    print(f"\n⏱️ {args.sims:,} sims on {args.workers} worker(s) in {elapsed:.2f}s (seed {entropy})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# golf_sampler.py
+"""
+Bootstrap-from-history round sampler.
+
+Each player's empirical Stableford scores (rounds with 18 hole scores, rescored
+with compute_real_stableford_batch) and their recency / tournament weights are
+computed once and kept with a Vose alias table. A whole field is then drawn as
+an (n_sims, n_players) matrix in one call.
+
+Players with little history are mixed with the parametric simulate_rounds
+model: each simulated round comes from history with probability
+n_rounds / (n_rounds + prior_rounds), otherwise from the parametric model.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from numbers import Real
+
+import numpy as np
+
+from golf_instrument import count, stage, timed
+from golf_scoring import compute_real_stableford_batch, simulate_rounds
+
+
+def alias_table(weights):
+    """
+    Vose alias table for a discrete distribution.
+
+    Args:
+        weights (array-like): Non-negative weights, not all zero.
+
+    Returns:
+        (prob, alias): float64 acceptance probabilities and int32 aliases.
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    scaled = weights * n / weights.sum()
+    prob = np.ones(n)
+    alias = np.arange(n, dtype=np.int32)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Leftovers are 1 up to rounding error.
+    return prob, alias
+
+
+@dataclass
+class PlayerHistory:
+    """Cached empirical distribution of one player's Stableford scores."""
+    fingerprint: int     # Player.rounds_version the history was built from
+    scores: np.ndarray   # (n,) Stableford points, oldest first
+    weights: np.ndarray  # (n,) normalized sampling weights
+    prob: np.ndarray     # (n,) alias acceptance probabilities
+    alias: np.ndarray    # (n,) alias indices
+
+    @property
+    def n_rounds(self):
+        return len(self.scores)
+
+
+@dataclass
+class HistoryTables:
+    """Padded alias tables for a fixed list of players (picklable, no Player objects)."""
+    scores: np.ndarray         # (n_players, k) padded with 0
+    prob: np.ndarray           # (n_players, k)
+    alias: np.ndarray          # (n_players, k)
+    n_rounds: np.ndarray       # (n_players,)
+    history_share: np.ndarray  # (n_players,) probability a round is drawn from history
+
+
+class HistorySampler:
+    """
+    Draws Day-2 player scores from each player's own round history.
+
+    Args:
+        decay (float): Weight multiplier per newer round, as in the notebook's
+            sample_score_weighted (1.0 = uniform).
+        tournament_weight (float): Extra weight for tournament rounds.
+        prior_rounds (float): Pseudo-rounds of the parametric model mixed in;
+            0 uses history only for players that have any.
+        course (CourseModel | None): Course / tee used to rescore history and
+            for the parametric draws.
+    """
+
+    def __init__(self, decay=0.9, tournament_weight=1.0, prior_rounds=5, course=None):
+        self.decay = decay
+        self.tournament_weight = tournament_weight
+        self.prior_rounds = prior_rounds
+        self.course = course
+        self._cache = {}
+
+    def history(self, player):
+        """Return the cached PlayerHistory, rebuilding it if player.rounds changed."""
+        fingerprint = player.rounds_version
+        cached = self._cache.get(player.name)
+        if cached is None or cached.fingerprint != fingerprint:
+            cached = self._build_history(player, fingerprint)
+            self._cache[player.name] = cached
+        return cached
+
+    def invalidate(self, player=None):
+        """Drop one player's cached history, or all of them."""
+        if player is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(getattr(player, "name", player), None)
+
+    def _build_history(self, player, fingerprint):
+        usable = [
+            (r.date or date.min, i, r) for i, r in enumerate(player.rounds)
+            if not getattr(r, "duplicate", False)
+            and len(r.hole_scores) == 18
+            and all(isinstance(s, Real) for s in r.hole_scores)
+            and isinstance(r.handicap, Real) and r.handicap == r.handicap
+        ]
+        usable.sort(key=lambda t: t[:2])
+        rounds = [r for _, _, r in usable]
+        n = len(rounds)
+        if n == 0:
+            empty = np.zeros(0)
+            return PlayerHistory(fingerprint, empty, empty, empty, np.zeros(0, dtype=np.int32))
+
+        with stage("rescore"):
+            scores = compute_real_stableford_batch(
+                np.array([list(r.hole_scores) for r in rounds]),
+                np.array([r.handicap for r in rounds], dtype=float),
+                course=self.course,
+            ).astype(float)
+            count("rounds", n)
+        weights = self.decay ** np.arange(n - 1, -1, -1, dtype=float)
+        weights[[bool(r.tournament_flag) for r in rounds]] *= self.tournament_weight
+        weights /= weights.sum()
+        prob, alias = alias_table(weights)
+        return PlayerHistory(fingerprint, scores, weights, prob, alias)
+
+    @timed("sampler.tables")
+    def tables(self, players):
+        """Build padded HistoryTables for a list of players."""
+        histories = [self.history(p) for p in players]
+        k = max([h.n_rounds for h in histories] + [1])
+        n_players = len(histories)
+        scores = np.zeros((n_players, k))
+        prob = np.ones((n_players, k))
+        alias = np.zeros((n_players, k), dtype=np.int32)
+        n_rounds = np.zeros(n_players, dtype=np.int32)
+        for i, h in enumerate(histories):
+            n = h.n_rounds
+            scores[i, :n] = h.scores
+            prob[i, :n] = h.prob
+            alias[i, :n] = h.alias
+            n_rounds[i] = n
+        if self.prior_rounds > 0:
+            history_share = n_rounds / (n_rounds + self.prior_rounds)
+        else:
+            history_share = (n_rounds > 0).astype(float)
+        return HistoryTables(scores, prob, alias, n_rounds, history_share)
+
+    def sample(self, players, n_sims, rng=None, course_handicaps=None, calibrated=True):
+        """
+        Draw n_sims rounds for every player.
+
+        Args:
+            players (list[Player]): Players to sample (e.g. CompiledField.players).
+            n_sims (int): Rounds per player.
+            rng (np.random.Generator | int | None): Random source or seed.
+            course_handicaps (array-like | None): Handicaps for the parametric
+                share; required unless every player is drawn from history only.
+            calibrated (bool): Calibrate the parametric share.
+
+        Returns:
+            (n_sims, n_players) float array of Stableford scores.
+        """
+        return sample_history(self.tables(players), n_sims, rng, course_handicaps,
+                              calibrated, self.course)
+
+
+def history_from_uniforms(tables, u_slot, u_alias):
+    """
+    Alias-table draws from given (n_sims, n_players) uniforms: u_slot picks
+    a round slot, u_alias decides between the slot and its alias.
+    """
+    rows = np.arange(len(tables.n_rounds))
+    n = np.maximum(tables.n_rounds, 1)
+    slot = np.minimum((u_slot * n).astype(np.intp), n - 1)
+    keep = u_alias < tables.prob[rows, slot]
+    slot = np.where(keep, slot, tables.alias[rows, slot])
+    return tables.scores[rows, slot]
+
+
+def expected_history_score(tables):
+    """(n_players,) mean of the history draws (0 for players without history)."""
+    n = np.maximum(tables.n_rounds, 1)[:, None]
+    rows = np.arange(len(tables.n_rounds))[:, None]
+    valid = np.arange(tables.scores.shape[1])[None, :] < tables.n_rounds[:, None]
+    per_slot = tables.prob * tables.scores + (1 - tables.prob) * tables.scores[rows, tables.alias]
+    return np.where(valid, per_slot, 0.0).sum(axis=1) / n[:, 0]
+
+
+def sample_history(tables, n_sims, rng=None, course_handicaps=None, calibrated=True, course=None):
+    """Draw (n_sims, n_players) scores from precompiled HistoryTables (see HistorySampler.sample)."""
+    rng = np.random.default_rng(rng)
+    n_players = len(tables.n_rounds)
+    scores = history_from_uniforms(tables, rng.random((n_sims, n_players)), rng.random((n_sims, n_players)))
+
+    if np.all(tables.history_share >= 1.0):
+        return scores
+    if course_handicaps is None:
+        raise ValueError("course_handicaps are required for players with thin history.")
+    parametric = simulate_rounds(course_handicaps, n_sims, rng, calibrated=calibrated, course=course)
+    from_history = rng.random((n_sims, n_players)) < tables.history_share
+    return np.where(from_history, scores, parametric)
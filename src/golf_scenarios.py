@@ -0,0 +1,363 @@
+# golf_scenarios.py
+"""
+What-if scenarios over the loaded c_teams, evaluated together with common
+random numbers.
+
+A scenario is a list of edits applied in order to the base field:
+
+    Withdraw(player)                      the player scores 0 points
+    Substitute(player, replacement, h)    another Player takes the slot
+    SetHandicap(player, h)                the player plays off a new handicap
+    SwapPairs(mm_a, mm_b)                 two MM teams trade C teams
+
+Every simulated round is a function of per-player uniforms (see
+golf_variance.uniform_model), drawn from the player's own stream
+golf_cache.player_stream(seed, name). Score columns are kept per
+(player, course handicap): the base field is simulated once, a scenario only
+simulates the columns its edits introduce, and a handicap change replays the
+same holes with different strokes. Every scenario also reuses the base
+tie-break draws.
+
+Scoring follows golf_draft's rescore: only the MM teams whose players changed,
+and the C teams that contain them or had MM teams swapped, are recomputed.
+Deltas against the base are then paired differences over the same sims, with
+standard errors
+
+    SE(delta_i) = std(X_i[scenario] - X_i[base]) / sqrt(n_sims)
+
+which are far smaller than comparing two independent simulations.
+
+Usage:
+    what_if = ScenarioEvaluator(c_teams, n_sims=20000, seed=7)
+    table = what_if.evaluate({
+        "Smith out": [Withdraw("John Smith")],
+        "Jones 12": [SetHandicap("Ann Jones", 12)],
+        "Swap": [SwapPairs("Smith/Jones", "Brown/Green")],
+    })
+    print_scenario_table(table)
+"""
+
+from dataclasses import dataclass, field as dataclass_field
+from typing import List, Optional, Union
+
+import numpy as np
+
+from golf_cache import player_stream
+from golf_classes import Player
+from golf_instrument import count, stage, timed
+from golf_simulation import (CompiledField, best_of, compile_field, player_course_handicap,
+                             rank_teams, tally_scores)
+from golf_valuation import DEFAULT_PAYOUTS
+from golf_variance import uniform_model
+
+# Columns simulated per batch, to bound the (n_sims, batch, dims) uniforms.
+COLUMN_BATCH = 64
+
+
+@dataclass
+class Withdraw:
+    """The player withdraws; their slot scores 0 points."""
+    player: Union[str, Player]
+
+
+@dataclass
+class Substitute:
+    """
+    replacement plays in the player's slot (handicap defaults to their
+    latest); they must not already be in the field.
+    """
+    player: Union[str, Player]
+    replacement: Player
+    handicap: Optional[float] = None
+
+
+@dataclass
+class SetHandicap:
+    """The player plays off a different course handicap."""
+    player: Union[str, Player]
+    handicap: float
+
+
+@dataclass
+class SwapPairs:
+    """Two MM teams (by name) trade places between their C teams."""
+    mm_a: str
+    mm_b: str
+
+
+@dataclass
+class Scenario:
+    name: str
+    edits: list = dataclass_field(default_factory=list)
+
+
+@dataclass
+class ScenarioTable:
+    """Base values and paired deltas for every (scenario, team)."""
+    scenario_names: List[str]
+    team_names: List[str]
+    n_sims: int
+    base_win_prob: np.ndarray    # (n_teams,)
+    base_ev: np.ndarray          # (n_teams,)
+    base_points: np.ndarray      # (n_teams,) expected C team score
+    win_prob: np.ndarray         # (n_scenarios, n_teams)
+    ev: np.ndarray               # (n_scenarios, n_teams)
+    expected_points: np.ndarray  # (n_scenarios, n_teams)
+    win_se: np.ndarray           # (n_scenarios, n_teams) SE of win_prob - base_win_prob
+    ev_se: np.ndarray            # (n_scenarios, n_teams) SE of ev - base_ev
+    touched: np.ndarray          # (n_scenarios, n_teams) team composition changed
+
+    @property
+    def delta_win_prob(self):
+        return self.win_prob - self.base_win_prob
+
+    @property
+    def delta_ev(self):
+        return self.ev - self.base_ev
+
+    @property
+    def delta_points(self):
+        return self.expected_points - self.base_points
+
+    def rows(self, touched_only=False):
+        """
+        One dict per scenario and team, largest EV change first within each scenario.
+
+        Keys: scenario, team, win_prob, delta_win_prob, win_se, ev, delta_ev,
+        ev_se, expected_points, delta_points, touched.
+        """
+        rows = []
+        for s, scenario in enumerate(self.scenario_names):
+            block = []
+            for i, team in enumerate(self.team_names):
+                if touched_only and not self.touched[s, i]:
+                    continue
+                block.append({
+                    "scenario": scenario,
+                    "team": team,
+                    "win_prob": float(self.win_prob[s, i]),
+                    "delta_win_prob": float(self.delta_win_prob[s, i]),
+                    "win_se": float(self.win_se[s, i]),
+                    "ev": float(self.ev[s, i]),
+                    "delta_ev": float(self.delta_ev[s, i]),
+                    "ev_se": float(self.ev_se[s, i]),
+                    "expected_points": float(self.expected_points[s, i]),
+                    "delta_points": float(self.delta_points[s, i]),
+                    "touched": bool(self.touched[s, i]),
+                })
+            block.sort(key=lambda r: -abs(r["delta_ev"]))
+            rows.extend(block)
+        return rows
+
+
+def _find(names, name, kind):
+    matches = [i for i, n in enumerate(names) if n == name]
+    if not matches:
+        raise KeyError(f"Unknown {kind}: {name}")
+    if len(matches) > 1:
+        raise ValueError(f"Ambiguous {kind}: {name}")
+    return matches[0]
+
+
+class ScenarioEvaluator:
+    """
+    Evaluates batches of what-if scenarios against one base field.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Base field.
+        n_sims (int): Simulated tournaments shared by every scenario.
+        seed (int): Seed of the per-player streams and the tie-breaks.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        sampler (HistorySampler | HoleOutcomeModel | None): Round model, as
+            in simulate_tournament.
+        payouts (sequence[float]): Pot fraction per finishing position.
+        pot (float): Net pot EVs are quoted in (1.0 = fraction of the pot).
+    """
+
+    def __init__(self, c_teams, n_sims=10000, seed=0, calibrated=True, sampler=None,
+                 payouts=DEFAULT_PAYOUTS, pot=1.0):
+        if seed is None:
+            raise ValueError("A seed is required for common random numbers.")
+        self.field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+        self.n_sims = n_sims
+        self.seed = seed
+        self.calibrated = calibrated
+        self.sampler = sampler
+        self.pot = pot
+        n_teams = self.field.n_teams
+        self._payout_table = np.zeros(n_teams)
+        k = min(len(payouts), n_teams)
+        self._payout_table[:k] = payouts[:k]
+        self._columns = {}  # (name, handicap) -> (n_sims,) scores; None key -> withdrawn
+
+        base = [(p, h) for p, h in zip(self.field.players, self.field.course_handicaps)]
+        self._base_keys = [self._key(p, h) for p, h in base]
+        self._simulate(base)
+        tie_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+        self._ties = tie_rng.random((n_sims, n_teams))
+        self._base_mm = self._mm_scores(self._base_keys, self.field.mm_players)
+        self._base_scores = best_of(self._base_mm[:, self.field.team_mm], 2)
+        self._base_positions = self._rank(self._base_scores)
+        self.base = tally_scores(self.field.team_names, self._base_scores,
+                                 positions=self._base_positions)
+
+    @staticmethod
+    def _key(player, handicap):
+        return None if player is None else (player.name, float(handicap))
+
+    def _rank(self, scores):
+        return rank_teams(scores, ties=self._ties)
+
+    @timed("scenarios.columns")
+    def _simulate(self, entries):
+        """Simulate the (player, handicap) columns not computed yet."""
+        todo = {}
+        for player, h in entries:
+            key = self._key(player, h)
+            if key is not None and key not in self._columns:
+                todo[key] = player
+        if not todo:
+            return
+        todo = list(todo.items())
+        for start in range(0, len(todo), COLUMN_BATCH):
+            batch = todo[start:start + COLUMN_BATCH]
+            players = [player for _, player in batch]
+            handicaps = np.array([h for (_, h), _ in batch])
+            mini = CompiledField([], [], players, handicaps,
+                                 np.zeros((0, 2), dtype=np.intp), np.zeros((0, 3), dtype=np.intp))
+            dims, scores_from, _ = uniform_model(mini, self.calibrated, self.sampler)
+            with stage("uniforms"):
+                # Same stream per name, so every handicap of a player sees the same holes.
+                u = np.stack([player_stream(self.seed, name).random((self.n_sims, dims), dtype=np.float32)
+                              for (name, _), _ in batch], axis=1)
+            scores = np.asarray(scores_from(u), dtype=float)
+            for j, (key, _) in enumerate(batch):
+                self._columns[key] = scores[:, j]
+        count("columns", len(todo))
+
+    def _column(self, key):
+        return np.zeros(self.n_sims) if key is None else self._columns[key]
+
+    def _mm_scores(self, keys, mm_players, rows=None):
+        rows = range(len(mm_players)) if rows is None else rows
+        out = np.empty((self.n_sims, len(rows)))
+        for k, m in enumerate(rows):
+            a, b = mm_players[m]
+            out[:, k] = self._column(keys[a]) + self._column(keys[b])
+        return out
+
+    def _apply(self, scenario):
+        """(slots, team_mm) after a scenario's edits; slots are (Player | None, handicap)."""
+        field = self.field
+        slots = list(zip(field.players, field.course_handicaps.tolist()))
+        team_mm = field.team_mm.copy()
+        for edit in scenario.edits:
+            if isinstance(edit, SwapPairs):
+                a = _find(field.mm_names, edit.mm_a, "MM team")
+                b = _find(field.mm_names, edit.mm_b, "MM team")
+                pos_a, pos_b = np.argwhere(team_mm == a), np.argwhere(team_mm == b)
+                for t, k in pos_a:
+                    team_mm[t, k] = b
+                for t, k in pos_b:
+                    team_mm[t, k] = a
+                continue
+            name = getattr(edit.player, "name", edit.player)
+            slot = _find([p.name if p is not None else None for p, _ in slots], name, "player")
+            if isinstance(edit, Withdraw):
+                slots[slot] = (None, 0.0)
+            elif isinstance(edit, SetHandicap):
+                slots[slot] = (slots[slot][0], float(edit.handicap))
+            elif isinstance(edit, Substitute):
+                if any(p is not None and p.name == edit.replacement.name for p, _ in slots):
+                    raise ValueError(f"Substitute already in the field: {edit.replacement.name}")
+                h = edit.handicap
+                if h is None:
+                    h = player_course_handicap(edit.replacement)
+                if h is None:
+                    raise ValueError(f"No course handicap for player(s): {edit.replacement.name}")
+                slots[slot] = (edit.replacement, float(h))
+            else:
+                raise TypeError(f"Unknown scenario edit: {edit!r}")
+        return slots, team_mm
+
+    @timed("scenarios.evaluate")
+    def evaluate(self, scenarios):
+        """
+        Evaluate scenarios against the base field.
+
+        Args:
+            scenarios (list[Scenario] | dict[str, list]): Scenarios, or a
+                mapping of scenario name to its edits.
+
+        Returns:
+            ScenarioTable
+        """
+        if isinstance(scenarios, dict):
+            scenarios = [Scenario(name, list(edits)) for name, edits in scenarios.items()]
+        applied = [self._apply(s) for s in scenarios]
+        # Every new column of every scenario in one batched pass.
+        self._simulate([entry for slots, _ in applied for entry in slots])
+
+        field = self.field
+        n, n_teams = self.n_sims, field.n_teams
+        base_pay = self._payout_table[self._base_positions]
+        base_win = self._base_positions == 0
+        shape = (len(scenarios), n_teams)
+        win_prob, ev, points = np.empty(shape), np.empty(shape), np.empty(shape)
+        win_se, ev_se = np.zeros(shape), np.zeros(shape)
+        touched = np.zeros(shape, dtype=bool)
+
+        for s, (slots, team_mm) in enumerate(applied):
+            keys = [self._key(p, h) for p, h in slots]
+            changed_slots = [i for i, k in enumerate(keys) if k != self._base_keys[i]]
+            changed_mm = np.flatnonzero(np.isin(field.mm_players, changed_slots).any(axis=1))
+            changed = np.flatnonzero((team_mm != field.team_mm).any(axis=1)
+                                     | np.isin(team_mm, changed_mm).any(axis=1))
+            touched[s, changed] = True
+            count("scenario_teams", len(changed))
+
+            if len(changed) == 0:
+                result = self.base
+                win_prob[s], points[s] = result.win_prob, result.expected_points
+                ev[s] = self.base_share * self.pot
+                continue
+
+            mm = self._base_mm.copy()
+            mm[:, changed_mm] = self._mm_scores(keys, field.mm_players, changed_mm)
+            scores = self._base_scores.copy()
+            scores[:, changed] = best_of(mm[:, team_mm[changed]], 2)
+            positions = self._rank(scores)
+            result = tally_scores(field.team_names, scores, positions=positions)
+
+            pay = self._payout_table[positions]
+            win_prob[s], points[s] = result.win_prob, result.expected_points
+            ev[s] = pay.mean(axis=0) * self.pot
+            win_se[s] = np.std((positions == 0).astype(float) - base_win, axis=0) / np.sqrt(n)
+            ev_se[s] = np.std(pay - base_pay, axis=0) * self.pot / np.sqrt(n)
+
+        return ScenarioTable([s.name for s in scenarios], list(field.team_names), n,
+                             self.base.win_prob, self.base_share * self.pot,
+                             self.base.expected_points, win_prob, ev, points,
+                             win_se, ev_se, touched)
+
+    @property
+    def base_share(self):
+        """(n_teams,) expected pot share of every team in the base field."""
+        return self.base.finish_prob @ self._payout_table
+
+
+def print_scenario_table(table, top_n=5):
+    """Pretty-print the teams whose odds move most in each scenario."""
+    rows = table.rows()
+    print(f"\n🔀 What-if scenarios ({table.n_sims:,} common sims):")
+    for scenario in table.scenario_names:
+        block = [r for r in rows if r["scenario"] == scenario][:top_n]
+        print(f"\n{scenario}\n")
+        print(f"{'Team':<25} {'Win %':>7} {'Δ Win %':>9} {'± SE':>6} {'EV':>9} {'Δ EV':>9} {'± SE':>7}")
+        print("-" * 78)
+        for r in block:
+            mark = "*" if r["touched"] else " "
+            print(f"{r['team'][:23] + mark:<25} {r['win_prob'] * 100:>7.2f} "
+                  f"{r['delta_win_prob'] * 100:>+9.2f} {r['win_se'] * 100:>6.2f} "
+                  f"{r['ev']:>9.3f} {r['delta_ev']:>+9.3f} {r['ev_se']:>7.3f}")
+    print("\n* team composition changed")
@@ -1,5 +1,9 @@
 
+import math
 import random
+from numbers import Integral, Real
+
+import numpy as np
 
 # Define the outcome probabilities by handicap bracket (from your chart)
 HANDICAP_PROFILES = {
@@ -50,13 +54,30 @@ HOLE_STROKE_INDEX = {
 }
 
 
-def get_handicap_profile(course_handicap):
-    """Find matching profile by course handicap."""
+def _scan_handicap_profile(course_handicap):
+    """Find matching profile by scanning the brackets."""
     for lower, upper in HANDICAP_PROFILES:
         if lower <= course_handicap <= upper:
             return HANDICAP_PROFILES[(lower, upper)]
     return HANDICAP_PROFILES[(36, 99)]  # Default to highest bracket if over 99
 
+
+# Whole course handicaps 0-99 resolve with a list lookup instead of a scan.
+_PROFILE_BY_HANDICAP = [_scan_handicap_profile(h) for h in range(100)]
+
+
+def get_handicap_profile(course_handicap):
+    """Find matching profile by course handicap."""
+    if isinstance(course_handicap, Integral) and 0 <= course_handicap < len(_PROFILE_BY_HANDICAP):
+        return _PROFILE_BY_HANDICAP[course_handicap]
+    return _scan_handicap_profile(course_handicap)
+
+
+def _is_table_handicap(course_handicap):
+    """True if course_handicap can be served from DEFAULT_COURSE's strokes table."""
+    return isinstance(course_handicap, Real) and not math.isnan(course_handicap)
+
+
 def select_hole_outcome(profile):
     """Randomly select an outcome using weighted probabilities."""
     outcomes = list(profile.keys())
@@ -66,6 +87,8 @@ def select_hole_outcome(profile):
 
 def strokes_allocated_per_hole(course_handicap):
     """Calculate strokes per hole accounting for handicaps >18."""
+    if _is_table_handicap(course_handicap):
+        return DEFAULT_COURSE.strokes_allocated_per_hole(course_handicap)
     strokes_per_hole = {}
     for hole, stroke_index in HOLE_STROKE_INDEX.items():
         strokes = 1 if course_handicap >= stroke_index else 0
@@ -111,6 +134,8 @@ def simulate_round(course_handicap):
 
 
 def compute_real_stableford(rnd):
+    if _is_table_handicap(rnd.handicap) and len(rnd.hole_scores) == 18:
+        return DEFAULT_COURSE.stableford(rnd.hole_scores, rnd.handicap)
     strokes_per_hole = strokes_allocated_per_hole(rnd.handicap)
     total_stableford = 0
     for hole in range(1, 19):
@@ -142,13 +167,302 @@ def calibrated_simulate_round(course_handicap):
     return simulated_score  # fallback if no band found
 
 
-
-
-
-
-
-
-
-
-
-
+# --- Vectorized simulation ---
+# Same model as simulate_round / calibrated_simulate_round, but every table is
+# precomputed per whole course handicap so a call simulates n_sims x n_players
+# rounds with array operations instead of a Python loop per hole.
+
+OUTCOMES = ['birdie', 'par', 'bogey', 'dbogey', 'tbogey']
+OUTCOME_STROKES = {'birdie': -1, 'par': 0, 'bogey': 1, 'dbogey': 2, 'tbogey': 3}
+TBOGEY = OUTCOMES.index('tbogey')
+TBOGEY_REDUCTION = 0.7
+MAX_COURSE_HANDICAP = 54
+
+
+def extend_cdfs(cdfs):
+    """
+    Split the triple-bogey band of outcome CDFs into reduced / unreduced parts.
+
+    A single uniform u then picks one of six categories: the five OUTCOMES, with
+    a triple bogey keeping its handicap reduction for the first
+    TBOGEY_REDUCTION of its band and losing it for the rest.
+
+    Args:
+        cdfs (ndarray): (..., 5) cumulative probabilities over OUTCOMES.
+
+    Returns:
+        (..., 6) cumulative probabilities.
+    """
+    cdfs = np.asarray(cdfs, dtype=float)
+    before = cdfs[..., TBOGEY - 1]
+    split = before + TBOGEY_REDUCTION * (cdfs[..., TBOGEY] - before)
+    return np.concatenate([cdfs[..., :TBOGEY], split[..., None], cdfs[..., TBOGEY:]], axis=-1)
+
+
+# Points by net-to-par, clipped to [-3, 2]: index = clip(net_to_par, -3, 2) + 3
+POINTS_BY_NET_TO_PAR = np.array([stableford_points(n) for n in range(-3, 3)], dtype=np.int32)
+_POINTS_BY_NET_TO_PAR = {n: stableford_points(n) for n in range(-3, 3)}
+
+
+class CourseModel:
+    """
+    Scoring tables for one course / tee, built once from hole pars and the
+    stroke index and indexed by whole course handicap 0..max_handicap.
+
+    Attributes:
+        hole_pars (18,): Par per hole.
+        stroke_index (18,): Stroke index per hole (1 = hardest).
+        strokes (H, 18): Strokes received per hole.
+        outcome_cdfs (H, 6): extend_cdfs of the HANDICAP_PROFILES weights.
+        hole_points (H, 18, 6): Stableford points per hole and outcome category;
+            the last column is a triple bogey whose handicap reduction failed.
+        calibration (H,): Calibration correction by handicap (0 if no band).
+        calibration_bands (tuple): ((low, high), correction) pairs the
+            calibration was built from.
+        expected_points (H,): Mean uncalibrated simulated Stableford score.
+
+    Args:
+        calibration (dict | None): Bands in the CALIBRATION_CORRECTIONS format
+            (default: CALIBRATION_CORRECTIONS as it is now).
+    """
+
+    def __init__(self, hole_pars, stroke_index, name=None, max_handicap=MAX_COURSE_HANDICAP,
+                 calibration=None):
+        if isinstance(stroke_index, dict):
+            stroke_index = [stroke_index[hole] for hole in range(1, 19)]
+        self.name = name
+        self.max_handicap = max_handicap
+        self.hole_pars = np.asarray(hole_pars, dtype=np.int32)
+        self.stroke_index = np.asarray(stroke_index, dtype=np.int32)
+
+        h = np.arange(max_handicap + 1)[:, None]
+        si = self.stroke_index[None, :]
+        self.strokes = ((h >= si).astype(np.int32) + ((h > 18) & (h - 18 >= si))).astype(np.int32)
+
+        if calibration is None:
+            calibration = CALIBRATION_CORRECTIONS
+        self.calibration_bands = tuple(calibration.items())
+
+        cdfs = np.empty((max_handicap + 1, len(OUTCOMES)))
+        self.calibration = np.zeros(max_handicap + 1)
+        for row in range(max_handicap + 1):
+            profile = _PROFILE_BY_HANDICAP[min(row, len(_PROFILE_BY_HANDICAP) - 1)]
+            weights = np.array([profile[o] for o in OUTCOMES], dtype=float)
+            cdfs[row] = np.cumsum(weights) / weights.sum()
+            for (low, high), correction in self.calibration_bands:
+                if low <= row <= high:
+                    self.calibration[row] = correction
+                    break
+        self.outcome_cdfs = extend_cdfs(cdfs)
+
+        deltas = np.array([OUTCOME_STROKES[o] for o in OUTCOMES] + [OUTCOME_STROKES['tbogey']])
+        net_to_par = deltas[None, None, :] - self.strokes[:, :, None]
+        net_to_par[..., -1] = OUTCOME_STROKES['tbogey']  # reduction failed: no strokes taken
+        self.hole_points = self.points_for(net_to_par)
+
+        probs = np.diff(self.outcome_cdfs, prepend=0.0, axis=-1)
+        self.expected_points = (self.hole_points * probs[:, None, :]).sum(axis=(1, 2))
+
+        # Plain-Python rows for the scalar (one round at a time) paths.
+        self._stroke_dicts = tuple(dict(zip(range(1, 19), row)) for row in self.strokes.tolist())
+        self._net_pars = tuple(tuple(row) for row in (self.strokes + self.hole_pars).tolist())
+
+    @staticmethod
+    def points_for(net_to_par):
+        """Vectorized stableford_points."""
+        return POINTS_BY_NET_TO_PAR[np.clip(net_to_par, -3, 2) + 3]
+
+    def handicap_rows(self, course_handicaps):
+        """Map course handicaps to table rows."""
+        handicaps = np.asarray(course_handicaps, dtype=float)
+        if np.isnan(handicaps).any():
+            raise ValueError("Course handicaps must not contain missing values.")
+        # Plus handicaps play off the scratch row; anything above the table
+        # already receives two strokes on every hole and the top profile.
+        return np.clip(np.floor(handicaps), 0, self.max_handicap).astype(np.intp)
+
+    def handicap_row(self, course_handicap):
+        """handicap_rows for one scalar handicap, without NumPy."""
+        if type(course_handicap) is int and 0 <= course_handicap <= self.max_handicap:
+            return course_handicap
+        if course_handicap != course_handicap:
+            raise ValueError("Course handicaps must not contain missing values.")
+        return min(max(math.floor(course_handicap), 0), self.max_handicap)
+
+    def strokes_allocated_per_hole(self, course_handicap):
+        """Same dict as golf_scoring.strokes_allocated_per_hole, from the table."""
+        return dict(self._stroke_dicts[self.handicap_row(course_handicap)])
+
+    def stableford(self, hole_scores, course_handicap):
+        """Stableford total of one round's 18 gross hole scores."""
+        points = _POINTS_BY_NET_TO_PAR
+        total = 0
+        for gross, net_par in zip(hole_scores, self._net_pars[self.handicap_row(course_handicap)]):
+            net_to_par = gross - net_par
+            p = points.get(net_to_par)
+            total += p if p is not None else stableford_points(net_to_par)
+        return int(total)
+
+    def compute_real_stableford_batch(self, hole_scores, handicaps):
+        """
+        Rescore many rounds in one vectorized pass.
+
+        Args:
+            hole_scores (ndarray): (n_rounds, 18) gross hole scores.
+            handicaps (ndarray): (n_rounds,) course handicaps.
+
+        Returns:
+            (n_rounds,) int32 Stableford totals.
+        """
+        hole_scores = np.asarray(hole_scores)
+        strokes = self.strokes[self.handicap_rows(handicaps)]
+        net_to_par = hole_scores.astype(np.int32) - strokes - self.hole_pars
+        return self.points_for(net_to_par).sum(axis=-1, dtype=np.int32)
+
+    def expected_stableford(self, course_handicaps, calibrated=False):
+        """Exact mean of simulate_rounds for each course handicap."""
+        rows = self.handicap_rows(course_handicaps)
+        expected = self.expected_points[rows]
+        return expected + self.calibration[rows] if calibrated else expected
+
+    def rounds_from_uniforms(self, course_handicaps, u, calibrated=False, cdfs=None):
+        """
+        Stableford totals for caller-supplied uniforms, e.g. antithetic or
+        stratified draws (see golf_variance).
+
+        Args:
+            course_handicaps (array-like): (n_players,) course handicaps.
+            u (ndarray): (n_sims, n_players, 18) uniforms in [0, 1].
+            calibrated (bool): Add the calibration correction.
+            cdfs (ndarray | None): (n_players, 18, 6) outcome CDFs replacing
+                the handicap profiles (see golf_fit).
+        """
+        rows = self.handicap_rows(course_handicaps).reshape(-1)
+        cdfs = self.outcome_cdfs[rows] if cdfs is None else cdfs
+        scores = stableford_from_uniforms(u, cdfs, self.hole_points[rows])
+        return scores + self.calibration[rows] if calibrated else scores
+
+    def simulate_rounds(self, course_handicaps, n_sims, rng=None, calibrated=False, chunk_size=None,
+                        cdfs=None):
+        """See golf_scoring.simulate_rounds."""
+        rng = np.random.default_rng(rng)
+        rows = self.handicap_rows(course_handicaps).reshape(-1)
+        cdfs = self.outcome_cdfs[rows] if cdfs is None else cdfs
+        hole_points = self.hole_points[rows]
+        n_players = len(rows)
+
+        if chunk_size is None:
+            chunk_size = max(1, (1 << 22) // max(1, n_players * 18))
+
+        scores = np.empty((n_sims, n_players), dtype=np.int32)
+        for start in range(0, n_sims, chunk_size):
+            stop = min(start + chunk_size, n_sims)
+            u = rng.random((stop - start, n_players, 18), dtype=np.float32)
+            scores[start:stop] = stableford_from_uniforms(u, cdfs, hole_points)
+
+        if calibrated:
+            return scores + self.calibration[rows]
+        return scores
+
+
+_COURSE_MODELS = {}
+# Distinct (course, calibration) models kept before the cache is cleared.
+MAX_COURSE_MODELS = 64
+
+
+def course_model(hole_pars, stroke_index, name=None, calibration=None):
+    """
+    Return the CourseModel for a course / tee and calibration bands (default:
+    the current CALIBRATION_CORRECTIONS), building it on first use.
+    """
+    if isinstance(stroke_index, dict):
+        stroke_index = [stroke_index[hole] for hole in range(1, 19)]
+    bands = tuple((CALIBRATION_CORRECTIONS if calibration is None else calibration).items())
+    key = (tuple(hole_pars), tuple(stroke_index), bands)
+    if key not in _COURSE_MODELS:
+        if len(_COURSE_MODELS) >= MAX_COURSE_MODELS:
+            _COURSE_MODELS.clear()
+        _COURSE_MODELS[key] = CourseModel(hole_pars, stroke_index, name=name, calibration=dict(bands))
+    return _COURSE_MODELS[key]
+
+
+# Default course tables as of import; default_course() follows later edits
+# of CALIBRATION_CORRECTIONS.
+DEFAULT_COURSE = course_model(hole_pars, HOLE_STROKE_INDEX, name="default")
+_default_course = DEFAULT_COURSE
+
+
+def default_course():
+    """The default course's CourseModel with the current CALIBRATION_CORRECTIONS."""
+    global _default_course
+    if _default_course.calibration_bands != tuple(CALIBRATION_CORRECTIONS.items()):
+        _default_course = course_model(hole_pars, HOLE_STROKE_INDEX, name="default")
+    return _default_course
+
+
+def stableford_from_uniforms(u, cdfs, hole_points):
+    """
+    Convert uniform draws into 18-hole Stableford totals.
+
+    Args:
+        u (ndarray): (n_sims, n_players, 18) uniforms, one per hole.
+        cdfs (ndarray): (n_players, 6) or (n_players, 18, 6) extended CDFs
+            (see extend_cdfs).
+        hole_points (ndarray): (n_players, 18, 6) points per hole and category.
+
+    Returns:
+        (n_sims, n_players) int32 array of Stableford totals.
+    """
+    n_players = hole_points.shape[0]
+    if cdfs.ndim == 2:
+        cdfs = cdfs[:, None, :]
+    thresholds = cdfs[..., :-1].astype(u.dtype)
+
+    category = np.zeros(u.shape, dtype=np.uint8)
+    for k in range(thresholds.shape[-1]):
+        category += u >= thresholds[..., k]
+
+    base = (np.arange(n_players)[:, None] * 18 + np.arange(18)) * hole_points.shape[-1]
+    points = hole_points.reshape(-1)[base.astype(np.int32) + category]
+    return points.sum(axis=-1, dtype=np.int32)
+
+
+def simulate_rounds(course_handicaps, n_sims, rng=None, calibrated=False, chunk_size=None,
+                    course=None, cdfs=None):
+    """
+    Simulate n_sims rounds for every player in one call.
+
+    Matches simulate_round (or calibrated_simulate_round when calibrated=True)
+    in distribution, including the 0.7 triple-bogey reduction.
+
+    Args:
+        course_handicaps (array-like): Whole course handicap per player.
+        n_sims (int): Number of rounds to simulate per player.
+        rng (np.random.Generator | int | None): Random source or seed.
+        calibrated (bool): Add CALIBRATION_CORRECTIONS for each player's band.
+        chunk_size (int | None): Sims per batch, bounds peak memory.
+        course (CourseModel | None): Course / tee tables (default: default_course()).
+        cdfs (ndarray | None): (n_players, 18, 6) per-player, per-hole outcome
+            CDFs used instead of HANDICAP_PROFILES (see golf_fit); strokes
+            received still follow the course handicap.
+
+    Returns:
+        (n_sims, n_players) array of Stableford scores (int32, or float64 if calibrated).
+    """
+    course = course or default_course()
+    return course.simulate_rounds(course_handicaps, n_sims, rng, calibrated, chunk_size, cdfs)
+
+
+def compute_real_stableford_batch(hole_scores, handicaps, course=None):
+    """
+    Rescore a whole round history in one pass.
+
+    Args:
+        hole_scores (ndarray): (n_rounds, 18) gross hole scores.
+        handicaps (ndarray): (n_rounds,) course handicaps.
+        course (CourseModel | None): Course / tee tables (default: default_course()).
+
+    Returns:
+        (n_rounds,) int32 Stableford totals, equal to compute_real_stableford per round.
+    """
+    return (course or DEFAULT_COURSE).compute_real_stableford_batch(hole_scores, handicaps)
@@ -0,0 +1,400 @@
+# golf_simulation.py
+"""
+Day-2 Calcutta Monte Carlo engine.
+
+Compiles the loaded c_teams into index arrays (players -> MM teams -> C teams)
+so that each batch of simulated tournaments is scored with whole-matrix
+operations:
+
+    MM team score  = sum of its 2 players' Stableford points
+    C team score   = best 2 of its 3 MM team scores
+    winner         = highest C team score, ties broken at random
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from numbers import Real
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from golf_classes import CTeam, Player
+from golf_instrument import count, stage, timed
+from golf_sampler import sample_history
+from golf_scoring import simulate_rounds
+
+# C team scores are histogrammed on integer bins starting here.
+SCORE_HIST_MIN = -200
+SCORE_HIST_BINS = 800
+
+
+def player_course_handicap(player):
+    """
+    Return the player's most recent numeric course handicap, or None.
+
+    Rounds without a date count as older than any dated round.
+    """
+    latest = None
+    latest_key = None
+    for i, r in enumerate(player.rounds):
+        h = r.handicap
+        if not isinstance(h, Real) or math.isnan(h):
+            continue
+        key = (r.date or date.min, i)
+        if latest_key is None or key > latest_key:
+            latest, latest_key = h, key
+    return latest
+
+
+@dataclass
+class CompiledField:
+    """Index-array view of a set of CTeams."""
+    team_names: List[str]
+    mm_names: List[str]
+    players: List[Player]
+    course_handicaps: np.ndarray  # (n_players,)
+    mm_players: np.ndarray        # (n_mm, 2) indices into players
+    team_mm: np.ndarray           # (n_teams, 3) indices into mm_names
+
+    @property
+    def n_teams(self):
+        return len(self.team_names)
+
+    @property
+    def n_players(self):
+        return len(self.players)
+
+
+@timed("compile_field")
+def compile_field(c_teams: Dict[str, CTeam], handicaps: Optional[Dict[str, float]] = None):
+    """
+    Compile c_teams into a CompiledField.
+
+    Args:
+        c_teams (dict[str, CTeam]): Mapping of team name to CTeam object.
+        handicaps (dict[str, float] | None): Optional course handicap overrides by
+            player name; otherwise each player's most recent round handicap is used.
+
+    Returns:
+        CompiledField
+    """
+    handicaps = handicaps or {}
+    player_index = {}
+    players, course_handicaps = [], []
+    mm_index = {}
+    mm_names, mm_players = [], []
+    team_names, team_mm = [], []
+    missing = []
+
+    for team_name, c_team in c_teams.items():
+        row = []
+        for mm_team in c_team.mm_teams:
+            if id(mm_team) not in mm_index:
+                pair = []
+                for player in mm_team.players:
+                    if id(player) not in player_index:
+                        h = handicaps.get(player.name, player_course_handicap(player))
+                        if h is None:
+                            missing.append(player.name)
+                        player_index[id(player)] = len(players)
+                        players.append(player)
+                        course_handicaps.append(h)
+                    pair.append(player_index[id(player)])
+                mm_index[id(mm_team)] = len(mm_names)
+                mm_names.append(mm_team.name)
+                mm_players.append(pair)
+            row.append(mm_index[id(mm_team)])
+        team_names.append(team_name)
+        team_mm.append(row)
+
+    if missing:
+        raise ValueError(f"No course handicap for player(s): {', '.join(missing)}")
+
+    return CompiledField(
+        team_names=team_names,
+        mm_names=mm_names,
+        players=players,
+        course_handicaps=np.asarray(course_handicaps, dtype=float),
+        mm_players=np.asarray(mm_players, dtype=np.intp).reshape(-1, 2),
+        team_mm=np.asarray(team_mm, dtype=np.intp).reshape(-1, 3),
+    )
+
+
+@dataclass
+class TournamentResult:
+    """Accumulated outcome counts for a batch of simulated tournaments."""
+    team_names: List[str]
+    n_sims: int
+    finish_counts: np.ndarray  # (n_teams, n_teams): times team i finished in position j
+    score_sums: np.ndarray     # (n_teams,) summed C team scores
+    score_hist: np.ndarray     # (n_teams, SCORE_HIST_BINS) counts of floor(score)
+
+    @classmethod
+    def empty(cls, team_names):
+        n = len(team_names)
+        return cls(list(team_names), 0,
+                   np.zeros((n, n), dtype=np.int64),
+                   np.zeros(n),
+                   np.zeros((n, SCORE_HIST_BINS), dtype=np.int64))
+
+    @property
+    def wins(self):
+        return self.finish_counts[:, 0]
+
+    @property
+    def win_prob(self):
+        return self.wins / max(self.n_sims, 1)
+
+    @property
+    def finish_prob(self):
+        return self.finish_counts / max(self.n_sims, 1)
+
+    @property
+    def expected_points(self):
+        return self.score_sums / max(self.n_sims, 1)
+
+    def win_interval(self, confidence=0.95):
+        """Wilson score interval (low, high) for every team's win probability."""
+        return wilson_interval(self.wins, self.n_sims, confidence)
+
+    def merge(self, other):
+        """Add another result over the same field into this one."""
+        if other.team_names != self.team_names:
+            raise ValueError("Cannot merge results for different fields.")
+        self.n_sims += other.n_sims
+        self.finish_counts += other.finish_counts
+        self.score_sums += other.score_sums
+        self.score_hist += other.score_hist
+        return self
+
+    def summary(self):
+        """List of dicts sorted by win probability, best first."""
+        rows = [
+            {"team": name,
+             "wins": int(self.wins[i]),
+             "win_prob": float(self.win_prob[i]),
+             "expected_points": float(self.expected_points[i])}
+            for i, name in enumerate(self.team_names)
+        ]
+        rows.sort(key=lambda r: -r["win_prob"])
+        return rows
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    """
+    Wilson score interval for binomial proportions.
+
+    Args:
+        successes (array-like): Success counts.
+        n (int): Number of trials.
+        confidence (float): Two-sided confidence level.
+
+    Returns:
+        (low, high) arrays.
+    """
+    successes = np.asarray(successes, dtype=float)
+    if n == 0:
+        return np.zeros_like(successes), np.ones_like(successes)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+
+def best_of(scores, k):
+    """Sum of the k highest values along the last axis."""
+    m = scores.shape[-1]
+    return np.partition(scores, m - k, axis=-1)[..., m - k:].sum(axis=-1)
+
+
+def team_scores(field, player_scores):
+    """
+    Day-2 C team scores from a (n_sims, n_players) player score matrix.
+
+    Returns:
+        (n_sims, n_teams) array: best 2 of 3 MM team sums.
+    """
+    mm_scores = player_scores[:, field.mm_players].sum(axis=-1)
+    return best_of(mm_scores[:, field.team_mm], 2)
+
+
+def rank_teams(scores, rng=None, ties=None):
+    """
+    Finish position of every team in every sim (0 = winner).
+
+    Higher scores finish first; ties are broken uniformly at random, by the
+    given ties uniforms (same shape as scores) or fresh ones from rng.
+    """
+    n_sims, n_teams = scores.shape
+    if ties is None:
+        ties = rng.random(scores.shape)
+    order = np.lexsort((ties, -scores), axis=-1)
+    positions = np.empty_like(order)
+    positions[np.arange(n_sims)[:, None], order] = np.arange(n_teams)
+    return positions
+
+
+def score_field(field, player_scores, rng=None):
+    """
+    Score a batch of simulated rounds into a TournamentResult.
+
+    Args:
+        field (CompiledField): Compiled teams.
+        player_scores (ndarray): (n_sims, n_players) Stableford scores.
+        rng (np.random.Generator | int | None): Source for tie-breaks.
+    """
+    return tally_scores(field.team_names, team_scores(field, player_scores), rng)
+
+
+def tally_scores(team_names, scores, rng=None, positions=None):
+    """
+    TournamentResult from (n_sims, n_teams) C team scores.
+
+    positions (from rank_teams) are computed with rng unless given.
+    """
+    n_sims, n_teams = scores.shape
+    if positions is None:
+        positions = rank_teams(scores, np.random.default_rng(rng))
+
+    team_idx = np.broadcast_to(np.arange(n_teams), scores.shape)
+    finish_counts = np.bincount((team_idx * n_teams + positions).ravel(),
+                                minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+    bins = np.clip(np.floor(scores).astype(np.intp) - SCORE_HIST_MIN, 0, SCORE_HIST_BINS - 1)
+    score_hist = np.bincount((team_idx * SCORE_HIST_BINS + bins).ravel(),
+                             minlength=n_teams * SCORE_HIST_BINS).reshape(n_teams, SCORE_HIST_BINS)
+
+    return TournamentResult(list(team_names), n_sims, finish_counts,
+                            scores.sum(axis=0, dtype=float), score_hist)
+
+
+def _round_source(field, calibrated, sampler, course=None):
+    """Return draw(n, rng) -> (n, n_players) player scores for the field."""
+    if sampler is None:
+        return lambda n, rng: simulate_rounds(field.course_handicaps, n, rng, calibrated=calibrated,
+                                              course=course)
+    course = course or sampler.course
+    if hasattr(sampler, "outcome_tables"):
+        from golf_fit import sample_outcomes
+        tables = sampler.outcome_tables(field.players, field.course_handicaps)
+        return lambda n, rng: sample_outcomes(tables, n, rng, calibrated, course)
+    tables = sampler.tables(field.players)
+    return lambda n, rng: sample_history(tables, n, rng, field.course_handicaps, calibrated, course)
+
+
+@timed("simulate_tournament")
+def simulate_tournament(c_teams, n_sims=10000, rng=None, calibrated=True, chunk_size=10000,
+                        sampler=None, course=None):
+    """
+    Simulate n_sims Day-2 tournaments with the parametric round model.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Teams to simulate.
+        n_sims (int): Number of tournaments.
+        rng (np.random.Generator | int | None): Random source or seed.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        chunk_size (int): Tournaments simulated per batch.
+        sampler (HistorySampler | HoleOutcomeModel | None): Draw rounds from
+            player history, or from per-player fitted hole outcomes, instead
+            of the parametric model.
+        course (CourseModel | None): Course tables and calibration bands to
+            simulate with (default: the sampler's course, else default_course()).
+
+    Returns:
+        TournamentResult
+    """
+    field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+    rng = np.random.default_rng(rng)
+    draw = _round_source(field, calibrated, sampler, course)
+    result = TournamentResult.empty(field.team_names)
+    for start in range(0, n_sims, chunk_size):
+        n = min(chunk_size, n_sims - start)
+        with stage("sample"):
+            player_scores = draw(n, rng)
+        with stage("aggregate"):
+            result.merge(score_field(field, player_scores, rng))
+        count("sims", n)
+    return result
+
+
+@timed("simulate_until_converged")
+def simulate_until_converged(c_teams, tolerance=0.01, confidence=0.95, teams=None,
+                             batch_size=5000, max_sims=500000, rng=None, calibrated=True,
+                             verbose=False, sampler=None):
+    """
+    Simulate in batches until win probabilities are known to within tolerance.
+
+    After each batch the Wilson interval of every watched team's win
+    probability is checked; simulation stops once every half-width is at most
+    tolerance, or max_sims is reached.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Teams to simulate.
+        tolerance (float): Target interval half-width, e.g. 0.01 for +/- 1 %.
+        confidence (float): Confidence level of the interval.
+        teams (list[str] | None): Only watch these teams (e.g. the ones we are
+            bidding on); None watches the whole field.
+        batch_size (int): Tournaments simulated between checks.
+        max_sims (int): Hard cap on simulated tournaments.
+        rng (np.random.Generator | int | None): Random source or seed.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        verbose (bool): Print progress after each batch.
+        sampler (HistorySampler | HoleOutcomeModel | None): Draw rounds from
+            player history, or from per-player fitted hole outcomes, instead
+            of the parametric model.
+
+    Returns:
+        (TournamentResult, converged): result.n_sims is the number of sims used.
+        With no teams to watch (an empty field, or teams=[]) nothing is
+        simulated and the empty result counts as converged.
+    """
+    field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+    rng = np.random.default_rng(rng)
+    if teams is None:
+        watched = np.arange(field.n_teams)
+    else:
+        unknown = [t for t in teams if t not in field.team_names]
+        if unknown:
+            raise ValueError(f"Unknown team(s): {', '.join(unknown)}")
+        watched = np.array([field.team_names.index(t) for t in teams], dtype=np.intp)
+    if not len(watched):
+        return TournamentResult.empty(field.team_names), True
+
+    draw = _round_source(field, calibrated, sampler)
+    result = TournamentResult.empty(field.team_names)
+    converged = False
+    while result.n_sims < max_sims:
+        n = min(batch_size, max_sims - result.n_sims)
+        with stage("sample"):
+            player_scores = draw(n, rng)
+        with stage("aggregate"):
+            result.merge(score_field(field, player_scores, rng))
+        count("sims", n)
+
+        low, high = result.win_interval(confidence)
+        widest = float(np.max((high - low)[watched]) / 2)
+        if verbose:
+            print(f"  {result.n_sims:>8,} sims: widest ±{widest * 100:.2f} %")
+        if widest <= tolerance:
+            converged = True
+            break
+
+    if verbose:
+        status = "✅ Converged" if converged else "⚠️ Stopped at max_sims"
+        print(f"{status} after {result.n_sims:,} sims (tolerance ±{tolerance * 100:.2f} %)")
+    return result, converged
+
+
+def print_tournament_results(result, top_n=None):
+    """Pretty-print win probabilities and expected points."""
+    rows = result.summary()[:top_n]
+    print(f"\n🏆 Simulated {result.n_sims:,} tournaments:\n")
+    print(f"{'Rank':<5} {'Team':<25} {'Wins':>8} {'Win %':>8} {'Exp Pts':>9}")
+    print("-" * 58)
+    for i, r in enumerate(rows, 1):
+        print(f"{i:<5} {r['team']:<25} {r['wins']:>8} {r['win_prob'] * 100:>7.2f} "
+              f"{r['expected_points']:>9.2f}")
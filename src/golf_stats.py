@@ -0,0 +1,450 @@
+# golf_stats.py
+"""
+Sandbagging statistics.
+
+score_randomness_test tests one player. For the whole population, every
+player's tournament / casual net scores are gathered into flat arrays once,
+and the Mann-Whitney U, Levene and Welch t statistics of
+score_randomness_test are computed for all players together with grouped
+NumPy operations. Exact Mann-Whitney p-values come from null
+distributions cached by (n_t, n_c).
+
+sandbag_stats(players) returns the same dict per player as
+score_randomness_test(player).
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb, log10
+from typing import Dict, List
+
+import numpy as np
+from scipy.special import ndtr, stdtr
+from scipy.stats import f as f_dist
+from scipy.stats import levene, mannwhitneyu, shapiro, ttest_ind
+
+from golf_classes import Player
+from golf_instrument import timed
+
+
+@dataclass
+class ScoreGroups:
+    """Net scores of many players, flattened and sorted by (player, score)."""
+    names: List[str]
+    player: np.ndarray      # (n_scores,) player index
+    values: np.ndarray      # (n_scores,) net scores
+    tournament: np.ndarray  # (n_scores,) True for tournament rounds
+    n_t: np.ndarray         # (n_players,)
+    n_c: np.ndarray         # (n_players,)
+    irregular: np.ndarray   # (n_players,) True if a score is NaN or non-numeric
+
+    @property
+    def n_players(self):
+        return len(self.names)
+
+
+def collect_net_scores(players: Dict[str, Player]) -> ScoreGroups:
+    """
+    Gather every player's net scores, using the same round filter as
+    score_randomness_test (any round with net not None). The sorted scores
+    come straight from each player's RoundStats.posted.
+    """
+    names, player, values, tournament, irregular = [], [], [], [], []
+    for i, (name, p) in enumerate(players.items()):
+        names.append(name)
+        for flag in (True, False):
+            scores = p.stats.posted[flag].values
+            values.extend(scores)
+            player.extend([i] * len(scores))
+            tournament.extend([flag] * len(scores))
+        irregular.append(p.stats.irregular > 0)
+
+    player = np.asarray(player, dtype=np.intp)
+    values = np.asarray(values, dtype=float)
+    tournament = np.asarray(tournament, dtype=bool)
+    order = np.lexsort((values, player))
+    player, values, tournament = player[order], values[order], tournament[order]
+    n = len(names)
+    return ScoreGroups(
+        names=names,
+        player=player,
+        values=values,
+        tournament=tournament,
+        n_t=np.bincount(player[tournament], minlength=n),
+        n_c=np.bincount(player[~tournament], minlength=n),
+        irregular=np.asarray(irregular, dtype=bool),
+    )
+
+
+def _run_bounds(player, values):
+    """Start index of each run of equal (player, value) pairs, plus the end."""
+    if len(values) == 0:
+        return np.zeros(1, dtype=np.intp)
+    change = (np.diff(player) != 0) | (np.diff(values) != 0)
+    return np.concatenate(([0], np.flatnonzero(change) + 1, [len(values)]))
+
+
+@lru_cache(maxsize=None)
+def _mwu_null_counts(n1, n2):
+    """
+    Number of arrangements giving each U = 0 .. n1*n2 (exact integers).
+
+    Coefficients of the Gaussian binomial [n1 + n2 choose n1]_q, built from
+    prod_{i=1..m} (1 - q^(n+i)) / (1 - q^i) with m = min(n1, n2).
+    """
+    m, n = min(n1, n2), max(n1, n2)
+    coeffs = [1] + [0] * (m * n)
+    for i in range(1, m + 1):
+        shift = n + i
+        for k in range(m * n, shift - 1, -1):
+            coeffs[k] -= coeffs[k - shift]
+        for k in range(i, m * n + 1):
+            coeffs[k] += coeffs[k - i]
+    return tuple(coeffs)
+
+
+@lru_cache(maxsize=None)
+def mwu_null_sf(n1, n2):
+    """Exact null survival function P(U >= k) for k = 0 .. n1*n2, cached by (n1, n2)."""
+    counts = _mwu_null_counts(n1, n2)
+    total = comb(n1 + n2, n1)
+    tail, sf = 0, []
+    for c in reversed(counts):
+        tail += c
+        sf.append(tail / total)
+    return np.array(sf[::-1])
+
+
+def mannwhitneyu_batch(groups: ScoreGroups, alternative="less"):
+    """
+    Mann-Whitney U test of tournament vs casual scores for every player.
+
+    Matches scipy.stats.mannwhitneyu(ts, cs, alternative=alternative) with
+    method="auto": exact when either sample has at most 8 scores and there
+    are no ties, otherwise the tie-corrected normal approximation with
+    continuity correction.
+
+    Returns:
+        (U1, pvalue) arrays of shape (n_players,); NaN where a cohort is empty.
+    """
+    n = groups.n_players
+    player, values = groups.player, groups.values
+
+    # Average ranks within each player's pooled sample; runs of equal
+    # (player, value) are the tie groups.
+    bounds = _run_bounds(player, values)
+    sizes = np.diff(bounds)
+    run_player = player[bounds[:-1]]
+    player_start = np.searchsorted(player, np.arange(n))
+    run_rank = (bounds[:-1] + bounds[1:] - 1) / 2 + 1 - player_start[run_player]
+    ranks = np.repeat(run_rank, sizes)
+
+    n1 = groups.n_t.astype(float)
+    n2 = groups.n_c.astype(float)
+    r1 = np.bincount(player, weights=ranks * groups.tournament, minlength=n)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    u2 = n1 * n2 - u1
+    tie_term = np.bincount(run_player, weights=sizes.astype(float) ** 3 - sizes, minlength=n)
+    has_ties = np.bincount(run_player, weights=sizes > 1, minlength=n) > 0
+
+    if alternative == "greater":
+        u, factor = u1, 1
+    elif alternative == "less":
+        u, factor = u2, 1
+    else:
+        u, factor = np.maximum(u1, u2), 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = n1 + n2
+        s = np.sqrt(n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1))))
+        p = ndtr(-(u - n1 * n2 / 2 - 0.5) / s)
+
+    exact = ~((n1 > 8) & (n2 > 8)) & ~has_ties & (n1 > 0) & (n2 > 0)
+    for i in np.flatnonzero(exact):
+        p[i] = mwu_null_sf(int(n1[i]), int(n2[i]))[int(round(u[i]))]
+
+    p = np.clip(p * factor, 0.0, 1.0)
+    empty = (n1 == 0) | (n2 == 0)
+    u1[empty] = np.nan
+    p[empty] = np.nan
+    return u1, p
+
+
+def _group_mean_var(keys, values, n_groups):
+    counts = np.bincount(keys, minlength=n_groups).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(keys, weights=values, minlength=n_groups) / counts
+        dev = values - mean[keys]
+        var = np.bincount(keys, weights=dev * dev, minlength=n_groups) / (counts - 1)
+    return counts, mean, var
+
+
+def welch_ttest_batch(groups: ScoreGroups, alternative="less"):
+    """
+    Welch's t-test of tournament vs casual means for every player.
+
+    Matches scipy.stats.ttest_ind(ts, cs, equal_var=False, alternative=...).
+
+    Returns:
+        (t, pvalue) arrays of shape (n_players,).
+    """
+    n = groups.n_players
+    keys = groups.player * 2 + groups.tournament
+    counts, mean, var = _group_mean_var(keys, groups.values, 2 * n)
+    nc, nt = counts[0::2], counts[1::2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vt, vc = var[1::2] / nt, var[0::2] / nc
+        t = (mean[1::2] - mean[0::2]) / np.sqrt(vt + vc)
+        df = (vt + vc) ** 2 / (vt ** 2 / (nt - 1) + vc ** 2 / (nc - 1))
+    if alternative == "less":
+        p = stdtr(df, t)
+    elif alternative == "greater":
+        p = stdtr(df, -t)
+    else:
+        p = 2 * stdtr(df, -np.abs(t))
+    return t, p
+
+
+def levene_batch(groups: ScoreGroups):
+    """
+    Brown-Forsythe / Levene test (center="median") of tournament vs casual
+    variances for every player, matching scipy.stats.levene(ts, cs).
+
+    Returns:
+        (W, pvalue) arrays of shape (n_players,).
+    """
+    n = groups.n_players
+    keys = groups.player * 2 + groups.tournament
+    # Values are already sorted within each player; a stable sort by group key
+    # keeps them sorted within each cohort.
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], groups.values[order]
+    counts = np.bincount(keys, minlength=2 * n)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    nonempty = counts > 0
+    lo = starts + (counts - 1) // 2
+    hi = starts + counts // 2
+    median = np.full(2 * n, np.nan)
+    median[nonempty] = (values[lo[nonempty]] + values[hi[nonempty]]) / 2
+
+    z = np.abs(values - median[keys])
+    counts, zbar, _ = _group_mean_var(keys, z, 2 * n)
+    resid = np.bincount(keys, weights=(z - zbar[keys]) ** 2, minlength=2 * n)
+
+    nc, nt = counts[0::2], counts[1::2]
+    total = nc + nt
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grand = (nc * zbar[0::2] + nt * zbar[1::2]) / total
+        between = nc * (zbar[0::2] - grand) ** 2 + nt * (zbar[1::2] - grand) ** 2
+        w = (total - 2) * between / (resid[0::2] + resid[1::2])
+    return w, f_dist.sf(w, 1, total - 2)
+
+
+def shapiro_batch(groups: ScoreGroups, players):
+    """
+    Shapiro-Wilk p-values of both cohorts for the given player indices.
+
+    Samples of equal length are stacked and tested in one scipy call.
+
+    Returns:
+        (p_t, p_c) arrays of shape (n_players,); NaN for players not requested.
+    """
+    starts = np.searchsorted(groups.player, np.arange(groups.n_players + 1))
+    by_length = {}
+    for i in players:
+        rows = slice(starts[i], starts[i + 1])
+        values, tournament = groups.values[rows], groups.tournament[rows]
+        for cohort, sample in enumerate((values[tournament], values[~tournament])):
+            by_length.setdefault(len(sample), []).append((i, cohort, sample))
+
+    p = np.full((2, groups.n_players), np.nan)
+    for samples in by_length.values():
+        pvalues = np.atleast_1d(shapiro(np.stack([s for _, _, s in samples]), axis=1).pvalue)
+        for (i, cohort, _), pvalue in zip(samples, pvalues):
+            p[cohort, i] = pvalue
+    return p[0], p[1]
+
+
+@timed("sandbag_stats")
+def sandbag_stats(players: Dict[str, Player], alt: str = "less",
+                  min_len: int = 5) -> Dict[str, dict]:
+    """
+    score_randomness_test for every player at once.
+
+    Returns:
+        dict of player name -> the dict score_randomness_test(player) returns.
+    """
+    groups = collect_net_scores(players)
+    _, p_mwu = mannwhitneyu_batch(groups, alt)
+    _, p_welch = welch_ttest_batch(groups, alt)
+    _, p_levene = levene_batch(groups)
+    # Normality only matters where the t-test could still be reported.
+    candidates = np.flatnonzero((groups.n_t >= max(min_len, 2)) & (groups.n_c >= max(min_len, 2))
+                                & (p_levene > 0.05) & ~groups.irregular)
+    p_shapiro_t, p_shapiro_c = shapiro_batch(groups, candidates)
+
+    results = {}
+    for i, name in enumerate(groups.names):
+        if groups.irregular[i]:
+            results[name] = score_randomness_test(players[name], alt=alt, min_len=min_len)
+            continue
+        n_t, n_c = int(groups.n_t[i]), int(groups.n_c[i])
+        if n_t < 2 or n_c < 2:
+            results[name] = {"error": "Need at least 2 scores in each cohort."}
+            continue
+
+        p_ttest = None
+        if p_shapiro_t[i] > 0.05 and p_shapiro_c[i] > 0.05:
+            p_ttest = np.float64(p_welch[i])
+
+        results[name] = dict(n_t=n_t, n_c=n_c, p_mwu=np.float64(p_mwu[i]), p_ttest=p_ttest,
+                             p_all_lower=1 / comb(n_t + n_c, n_t))
+    return results
+
+
+def score_randomness_test(player,
+                          alt: str = "less",
+                          min_len: int = 5
+                         ) -> Dict[str, float | None]:
+    """
+    Return one-tailed p-values that tournament scores are randomly drawn
+    from the same distribution as casual scores (shifted lower).
+
+    Keys in the result:
+        'n_t', 'n_c'          – sample sizes
+        'p_mwu'               – Mann-Whitney U p-value               (exact)
+        'p_ttest'             – Welch t-test p-value                 (approx)
+        'p_all_lower'         – Pr(all T scores < all C scores)      (exact)
+    """
+    if player.stats.irregular:
+        ts = np.array([r.net for r in player.rounds if r.tournament_flag and r.net is not None])
+        cs = np.array([r.net for r in player.rounds if not r.tournament_flag and r.net is not None])
+    else:
+        ts = np.array(player.stats.posted[True].values)
+        cs = np.array(player.stats.posted[False].values)
+    n_t, n_c = len(ts), len(cs)
+
+    if n_t < 2 or n_c < 2:
+        return {"error": "Need at least 2 scores in each cohort."}
+
+    # 1) Mann–Whitney U (rank-sum) — exact for small n
+    p_mwu = mannwhitneyu(ts, cs, alternative=alt).pvalue
+
+    # 2) Welch one-tailed t-test if data look ~normal
+    p_ttest = None
+    if n_t >= min_len and n_c >= min_len:
+        norm_ok = (shapiro(ts).pvalue > 0.05) and (shapiro(cs).pvalue > 0.05)
+        var_ok  = levene(ts, cs).pvalue > 0.05
+        if norm_ok and var_ok:
+            p_ttest = ttest_ind(ts, cs, equal_var=False, alternative=alt).pvalue
+
+    # 3) Exact probability that **all** T < all C under H0
+    #    = 1 / C(n_t + n_c, n_t)
+    p_all_lower = 1 / comb(n_t + n_c, n_t)
+
+    return dict(n_t=n_t, n_c=n_c, p_mwu=p_mwu, p_ttest=p_ttest, p_all_lower=p_all_lower)
+
+
+def sandbag_report(stats: dict,
+                   player_name: str | None = None,
+                   alpha: float = 0.05) -> str:
+    """
+    Render a friendly one-liner plus legend from the stats dict.
+    Formats very small probabilities so they never round to 0.0 %.
+    """
+    if "error" in stats:
+        return stats["error"]
+
+    # ----- helpers ---------------------------------------------------------
+    def fmt_pct(p: float) -> str:
+        """Pretty percentage with adaptive precision."""
+        pct = p * 100
+        if pct >= 0.1:         # 0.1 % – 100 %   → one decimal
+            return f"{pct:.1f} %"
+        elif pct >= 0.01:      # 0.01 % – 0.1 %  → two decimals
+            return f"{pct:.2f} %"
+        elif pct >= 0.0001:    # 0.0001 % – 0.01 % → four decimals
+            return f"{pct:.4f} %"
+        else:                  # smaller than 1 in a million
+            return f"{pct:.1e} %"
+
+    def fmt_p(p: float | None) -> str:
+        return f"{p:.3g}" if p is not None else "—"
+
+    # -----------------------------------------------------------------------
+    p_mwu   = stats["p_mwu"]
+    p_ttest = stats.get("p_ttest")
+    p_all   = stats["p_all_lower"]
+
+    name = f"{player_name} – " if player_name else ""
+    headline = (
+        f"{name}possible sandbagging: only {fmt_pct(p_mwu)} probability this is random chance"
+        if p_mwu < alpha else
+        f"{name}no evidence of sandbagging: {fmt_pct(p_mwu)} probability pattern is random"
+    )
+
+    lines = [
+        headline,
+        f"   • Mann-Whitney U p = {fmt_p(p_mwu)}  (rank-based, distribution-free)",
+        (
+            f"   • Welch t-test   p = {fmt_p(p_ttest)}  (parametric, one-tailed)"
+            if p_ttest is not None else
+            "   • Welch t-test   – skipped (sample too small or not normal)"
+        ),
+        f"   • P(all T < C)   = {fmt_pct(p_all)}  "
+        "(exact probability every tournament score beats every casual score)"
+    ]
+    return "\n".join(lines)
+
+
+def top_sandbaggers(players: Dict[str, Player],
+                    n: int = 10,
+                    alpha: float = 0.05,
+                    min_rounds: int = 2,
+                    alt: str = "less") -> List[dict]:
+    """
+    Find the N players whose tournament scores look *most* suspiciously low.
+
+    Returns a list of dicts sorted by smallest p_mwu:
+       [{
+         'name': str,
+         'stats': { … },          # full score_randomness_test result
+         'suspicion_score': float # -log10(p_mwu) for easy comparison
+       }, …]
+    """
+
+    ranked = []
+    for name, stats in sandbag_stats(players, alt=alt).items():
+
+        if "error" in stats:
+            continue                      # skip players without enough data
+
+        # Require a minimal sample size to avoid noise
+        if stats['n_t'] < min_rounds or stats['n_c'] < min_rounds:
+            continue
+
+        p = stats["p_mwu"]
+        if p < alpha:                     # suspicious
+            ranked.append({
+                "name": name,
+                "stats": stats,
+                "suspicion_score": -log10(p)   # bigger = more suspicious
+            })
+
+    # sort by strongest evidence first
+    ranked.sort(key=lambda x: x["stats"]["p_mwu"])
+    return ranked[:n]
+
+
+def print_top_sandbaggers(players: Dict[str, Player],
+                          n: int = 10,
+                          alpha: float = 0.05):
+    """Pretty-print the top N sandbaggers."""
+    suspects = top_sandbaggers(players, n=n, alpha=alpha)
+    if not suspects:
+        print("✅ No players meet the sandbagging threshold.")
+        return
+
+    print(f"🚩 Top {len(suspects)} possible sandbaggers (α = {alpha}):\n")
+    for idx, s in enumerate(suspects, 1):
+        print(f"{idx}. {sandbag_report(s['stats'], player_name=s['name'], alpha=alpha)}\n")
@@ -0,0 +1,359 @@
+# golf_store.py
+"""
+Columnar round store: one row per PlayerRoundInfo, one file per column.
+
+Layout of a store directory:
+
+    meta.json        row count, column dtypes and string tables
+    <column>.bin     raw little-endian column data, read with np.memmap
+
+Numeric columns are float64 so materialized rounds get back exactly the values
+that were stored. Columns are always read with the dtype recorded in meta.json,
+so stores written with older dtypes stay readable. The row count in meta.json
+is only updated after every column has been written, and readers only ever
+map the first n_rows rows, so rows being appended by another process (or
+left behind by a failed append) are never seen. Only append_columns writes:
+it cuts each column file back to n_rows before adding the new rows.
+
+Simulation and stats code read columns zero-copy (store.column("net")), and
+only the columns actually touched are mapped. Player / PlayerRoundInfo
+objects are materialized on demand through store.players.
+"""
+
+import json
+import math
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+from golf_classes import Player, PlayerRoundInfo, rounds_to_arrays
+
+# name -> (dtype, trailing shape)
+COLUMNS = {
+    "player": ("<i4", ()),
+    "tournament": ("<i4", ()),
+    "round_number": ("<i2", ()),
+    "tournament_flag": ("|b1", ()),
+    "completed": ("|b1", ()),
+    "duplicate": ("|b1", ()),
+    "has_holes": ("|b1", ()),
+    "hole_scores": ("|i1", (18,)),
+    "handicap": ("<f8", ()),
+    "index": ("<f8", ()),
+    "cr": ("<f8", ()),
+    "sr": ("<f8", ()),
+    "total": ("<f8", ()),
+    "net": ("<f8", ()),
+    "date": ("<M8[D]", ()),
+    "tee": ("<i4", ()),
+    "course": ("<i4", ()),
+}
+
+# Columns holding indices into meta["strings"][<table>]; -1 means None.
+STRING_COLUMNS = {"player": "player", "tournament": "tournament", "tee": "tee", "course": "course"}
+
+META_FILE = "meta.json"
+
+
+def _from_float(value, as_int=False):
+    """Float column value back to None / int / float for materialized rounds."""
+    if math.isnan(value):
+        return None
+    return int(value) if as_int else float(value)
+
+
+def intern_strings(strings, table, values):
+    """
+    Vectorized string-table lookup for a whole column.
+
+    Args:
+        strings (dict[str, list[str]]): String tables, extended in place.
+        table (str): Table name.
+        values (array-like): Values; None and NaN map to -1.
+
+    Returns:
+        int32 ndarray of indices into strings[table].
+    """
+    values = np.asarray(values, dtype=object)
+    ids = np.full(len(values), -1, dtype=np.int32)
+    valid = np.array([v is not None and not (isinstance(v, float) and math.isnan(v)) for v in values],
+                     dtype=bool)
+    if not valid.any():
+        return ids
+    uniques, inverse = np.unique(values[valid].astype(str), return_inverse=True)
+    names = strings.setdefault(table, [])
+    lookup = {s: i for i, s in enumerate(names)}
+    for value in uniques:
+        if value not in lookup:
+            lookup[value] = len(names)
+            names.append(value)
+    ids[valid] = np.array([lookup[u] for u in uniques], dtype=np.int32)[inverse]
+    return ids
+
+
+def empty_columns(n):
+    """Columns for n rows with every value missing (NaN / NaT / -1 / False / 0)."""
+    cols = {}
+    for name, (dtype, tail) in COLUMNS.items():
+        if name in STRING_COLUMNS:
+            cols[name] = np.full(n, -1, dtype=dtype)
+        elif np.dtype(dtype).kind == "f":
+            cols[name] = np.full((n,) + tail, np.nan, dtype=dtype)
+        elif np.dtype(dtype).kind == "M":
+            cols[name] = np.full(n, np.datetime64("NaT"), dtype=dtype)
+        else:
+            cols[name] = np.zeros((n,) + tail, dtype=dtype)
+    return cols
+
+
+def encode_rounds(rounds, strings):
+    """
+    Encode PlayerRoundInfo objects into column arrays.
+
+    Args:
+        rounds (list[PlayerRoundInfo]): Rounds to encode.
+        strings (dict[str, list[str]]): String tables, extended in place.
+
+    Returns:
+        dict[str, ndarray] keyed like COLUMNS.
+    """
+    lookups = {table: {s: i for i, s in enumerate(values)} for table, values in strings.items()}
+
+    def intern(table, value):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return -1
+        value = str(value)
+        ids = lookups.setdefault(table, {})
+        if value not in ids:
+            ids[value] = len(ids)
+            strings.setdefault(table, []).append(value)
+        return ids[value]
+
+    cols = rounds_to_arrays(rounds, float_dtype=np.float64)
+    for name, table in STRING_COLUMNS.items():
+        cols[name] = np.empty(len(rounds), dtype=COLUMNS[name][0])
+    for i, r in enumerate(rounds):
+        player_name = r.player.name if isinstance(r.player, Player) else r.player
+        cols["player"][i] = intern("player", player_name)
+        cols["tournament"][i] = intern("tournament", r.tournament_name)
+        cols["tee"][i] = intern("tee", r.tee)
+        cols["course"][i] = intern("course", r.course_played)
+    return cols
+
+
+class RoundStore:
+    """Memory-mapped columnar store of player rounds."""
+
+    def __init__(self, path, mmap=True):
+        self.path = Path(path)
+        self.mmap = mmap
+        with open(self.path / META_FILE) as f:
+            self.meta = json.load(f)
+        self._columns = {}
+        self._player_rows = None
+        self._player_ids = None
+        self.players = StorePlayers(self)
+
+    # --- Creation / appending ---
+
+    @classmethod
+    def create(cls, path, overwrite=False):
+        """Create an empty store directory."""
+        path = Path(path)
+        if (path / META_FILE).exists() and not overwrite:
+            raise FileExistsError(f"Round store already exists: {path}")
+        path.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            open(path / f"{name}.bin", "wb").close()
+        meta = {
+            "n_rows": 0,
+            "columns": {name: {"dtype": dtype, "shape": list(tail)}
+                        for name, (dtype, tail) in COLUMNS.items()},
+            "strings": {table: [] for table in set(STRING_COLUMNS.values())},
+        }
+        _write_meta(path, meta)
+        return cls(path)
+
+    @classmethod
+    def from_players(cls, players, path, overwrite=False):
+        """
+        Build a store from a players dict (e.g. the unpickled player_data["players"]).
+
+        Args:
+            players (dict[str, Player]): Players whose rounds are stored.
+            path (str | Path): Store directory.
+            overwrite (bool): Replace an existing store.
+        """
+        store = cls.create(path, overwrite=overwrite)
+        store.append([r for p in players.values() for r in p.rounds])
+        return store
+
+    def append(self, rounds):
+        """Append PlayerRoundInfo objects as new rows."""
+        return self.append_columns(encode_rounds(rounds, self.meta["strings"]))
+
+    def append_columns(self, cols):
+        """
+        Append already-encoded columns (see encode_rounds).
+
+        String indices must refer to this store's meta["strings"] tables.
+        Those tables are saved even when there are no rows to append, because
+        encoding a batch whose rows are all skipped may still have extended them.
+        """
+        n = len(cols["player"])
+        if n == 0:
+            _write_meta(self.path, self.meta)
+            return 0
+        encoded = {}
+        for name in COLUMNS:
+            dtype, tail = self._dtype(name)
+            data = np.ascontiguousarray(cols[name], dtype=dtype)
+            if data.shape != (n,) + tail:
+                raise ValueError(f"Column '{name}' has shape {data.shape}, expected {(n,) + tail}")
+            encoded[name] = data
+        self._columns.clear()  # drop memmaps before the files grow
+        n_rows = self.meta["n_rows"]
+        try:
+            for name, data in encoded.items():
+                with open(self.path / f"{name}.bin", "r+b") as f:
+                    # Drop bytes left past n_rows by an interrupted append, then write.
+                    size = self._column_bytes(name, n_rows)
+                    f.truncate(size)
+                    f.seek(size)
+                    f.write(data.tobytes())
+            self.meta["n_rows"] += n
+            _write_meta(self.path, self.meta)
+        except BaseException:
+            self.meta["n_rows"] = n_rows
+            raise
+        finally:
+            self._player_rows = None
+            self._player_ids = None
+            self.players.clear_cache()
+        return n
+
+    def _dtype(self, name):
+        """(dtype, trailing shape) of a column as recorded in meta.json."""
+        info = self.meta.get("columns", {}).get(name)
+        if info is None:
+            return COLUMNS[name]
+        return info["dtype"], tuple(info["shape"])
+
+    def _column_bytes(self, name, n_rows):
+        dtype, tail = self._dtype(name)
+        return n_rows * np.dtype(dtype).itemsize * math.prod(tail)
+
+    # --- Column access ---
+
+    def __len__(self):
+        return self.meta["n_rows"]
+
+    def column(self, name):
+        """Return a column as a (read-only memory-mapped) array."""
+        if name not in self._columns:
+            dtype, tail = self._dtype(name)
+            shape = (len(self),) + tail
+            file = self.path / f"{name}.bin"
+            if len(self) == 0:
+                data = np.empty(shape, dtype=dtype)
+            elif self.mmap:
+                data = np.memmap(file, dtype=dtype, mode="r", shape=shape)
+            else:
+                data = np.fromfile(file, dtype=dtype, count=math.prod(shape)).reshape(shape)
+            self._columns[name] = data
+        return self._columns[name]
+
+    def strings(self, table):
+        return self.meta["strings"][table]
+
+    def player_id(self, name):
+        """Index of a player name in the player string table (KeyError if unknown)."""
+        if self._player_ids is None:
+            self._player_ids = {n: i for i, n in enumerate(self.strings("player"))}
+        return self._player_ids[name]
+
+    def player_rows(self, name):
+        """Row indices of one player's rounds, in insertion order."""
+        if self._player_rows is None:
+            ids = np.asarray(self.column("player"))
+            order = np.argsort(ids, kind="stable")
+            bounds = np.searchsorted(ids[order], np.arange(len(self.strings("player")) + 1))
+            self._player_rows = (order, bounds)
+        pid = self.player_id(name)
+        order, bounds = self._player_rows
+        return order[bounds[pid]:bounds[pid + 1]]
+
+    # --- Materialization ---
+
+    def materialize_round(self, row, player):
+        """Build a PlayerRoundInfo for one row."""
+        def string(col):
+            idx = int(self.column(col)[row])
+            return self.strings(STRING_COLUMNS[col])[idx] if idx >= 0 else None
+
+        num = {name: float(self.column(name)[row])
+               for name in ("handicap", "index", "cr", "sr", "total", "net")}
+        day = self.column("date")[row]
+        rnd = PlayerRoundInfo(
+            player=player,
+            tournament_name=string("tournament"),
+            tournament_flag=bool(self.column("tournament_flag")[row]),
+            round_number=int(self.column("round_number")[row]),
+            handicap=_from_float(num["handicap"], as_int=num["handicap"].is_integer()),
+            tee=string("tee"),
+            hole_scores=(self.column("hole_scores")[row].tolist()
+                         if self.column("has_holes")[row] else []),
+            total=_from_float(num["total"], as_int=True),
+            net=_from_float(num["net"], as_int=num["net"].is_integer()),
+            date=None if np.isnat(day) else day.item(),
+            index=_from_float(num["index"]),
+            cr=_from_float(num["cr"]),
+            sr=_from_float(num["sr"], as_int=True),
+            course_played=string("course"),
+        )
+        rnd.completed = bool(self.column("completed")[row])
+        rnd.duplicate = bool(self.column("duplicate")[row])
+        return rnd
+
+    def materialize_player(self, name):
+        player = Player(name)
+        player.rounds = [self.materialize_round(row, player) for row in self.player_rows(name)]
+        return player
+
+
+class StorePlayers(Mapping):
+    """Lazy players dict: Player objects are built on first access and cached."""
+
+    def __init__(self, store):
+        self._store = store
+        self._cache = {}
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def __getitem__(self, name):
+        if name not in self._cache:
+            self._cache[name] = self._store.materialize_player(name)
+        return self._cache[name]
+
+    def __iter__(self):
+        return iter(self._store.strings("player"))
+
+    def __len__(self):
+        return len(self._store.strings("player"))
+
+    def __contains__(self, name):
+        try:
+            self._store.player_id(name)
+        except KeyError:
+            return False
+        return True
+
+
+def _write_meta(path, meta):
+    tmp = Path(path) / (META_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, Path(path) / META_FILE)
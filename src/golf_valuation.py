@@ -0,0 +1,204 @@
+# golf_valuation.py
+"""
+Auction-night valuation: EV and ROI of every C team from simulated finish
+probabilities and the sale prices entered so far.
+
+The Monte Carlo result only depends on the field, so it is computed once and
+reduced to a per-team expected share of the pot:
+
+    share[i] = sum_j P(team i finishes j) * payouts[j]
+
+Each new price then only changes the pot, which re-prices every team in
+O(n_teams):
+
+    pot      = (sold prices + estimates for unsold teams) * (1 - house_cut)
+    EV[i]    = share[i] * pot
+    ROI[i]   = (EV[i] - price[i]) / price[i]
+
+Simulations are re-run (optionally in a background thread) only when the
+field composition changes.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from golf_simulation import compile_field, simulate_until_converged
+
+# Fraction of the pot paid to each finishing position (winner first).
+DEFAULT_PAYOUTS = (1.0,)
+
+
+def field_signature(c_teams):
+    """Hashable description of the field: team, MM team and player names."""
+    return tuple(
+        (team_name, tuple((mm.name, tuple(p.name for p in mm.players)) for mm in c_team.mm_teams))
+        for team_name, c_team in c_teams.items()
+    )
+
+
+def payout_shares(result, payouts=DEFAULT_PAYOUTS):
+    """
+    Expected fraction of the pot won by each team.
+
+    Args:
+        result (TournamentResult): Simulated finish counts.
+        payouts (sequence[float]): Pot fraction per finishing position.
+    """
+    n_teams = len(result.team_names)
+    table = np.zeros(n_teams)
+    k = min(len(payouts), n_teams)
+    table[:k] = payouts[:k]
+    return result.finish_prob @ table
+
+
+class LiveValuation:
+    """
+    Re-prices every team as sale prices come in.
+
+    Args:
+        c_teams (dict[str, CTeam]): Teams in the auction.
+        payouts (sequence[float]): Pot fraction per finishing position.
+        house_cut (float): Fraction of the pot kept back (e.g. for expenses).
+        tolerance (float): Win probability tolerance for simulate_until_converged.
+        max_sims (int): Simulation cap per refresh.
+        seed (int | None): Seed for the simulations.
+    """
+
+    def __init__(self, c_teams, payouts=DEFAULT_PAYOUTS, house_cut=0.0,
+                 tolerance=0.005, max_sims=200000, seed=None):
+        self.payouts = tuple(payouts)
+        self.house_cut = house_cut
+        self.tolerance = tolerance
+        self.max_sims = max_sims
+        self.seed = seed
+        self.prices = {}
+        self.result = None
+        self.signature = None
+        self._shares = None
+        self._pending = None
+        self._pending_signature = None
+        self._executor = None
+        self.refresh(c_teams)
+
+    # --- Simulation ---
+
+    def _simulate(self, c_teams):
+        result, _ = simulate_until_converged(compile_field(c_teams), tolerance=self.tolerance,
+                                             max_sims=self.max_sims, rng=self.seed)
+        return field_signature(c_teams), result
+
+    def _install(self, signature, result):
+        self.signature = signature
+        self.result = result
+        self._shares = dict(zip(result.team_names, payout_shares(result, self.payouts)))
+        self.prices = {team: price for team, price in self.prices.items() if team in self._shares}
+
+    def needs_refresh(self, c_teams):
+        """True if c_teams differs from the field the current result was simulated for."""
+        return field_signature(c_teams) != self.signature
+
+    def refresh(self, c_teams, force=False):
+        """Re-simulate now if the field changed (or force=True)."""
+        if force or self.needs_refresh(c_teams):
+            self._install(*self._simulate(c_teams))
+        return self
+
+    def refresh_in_background(self, c_teams, force=False):
+        """
+        Start re-simulating in a background thread if the field changed.
+
+        The current valuation keeps serving prices until poll() installs the
+        new result. Calling again for the field already being simulated (e.g.
+        on every UI rerun) does not start another simulation.
+        """
+        signature = field_signature(c_teams)
+        if not force:
+            if self._pending is not None and signature == self._pending_signature:
+                return False
+            if signature == self.signature:
+                # Back to the installed field: drop any job for another field.
+                self._discard_pending()
+                return False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._discard_pending()
+        self._pending = self._executor.submit(self._simulate, c_teams)
+        self._pending_signature = signature
+        return True
+
+    def _discard_pending(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = None
+        self._pending_signature = None
+
+    @property
+    def refreshing(self):
+        return self._pending is not None and not self._pending.done()
+
+    def poll(self):
+        """Install a finished background simulation; True if one was installed."""
+        if self._pending is None or not self._pending.done():
+            return False
+        pending, self._pending, self._pending_signature = self._pending, None, None
+        if not pending.cancelled():
+            self._install(*pending.result())
+        return True
+
+    def set_payouts(self, payouts, house_cut=None):
+        """Change the payout table (and house cut) without re-simulating."""
+        self.payouts = tuple(payouts)
+        if house_cut is not None:
+            self.house_cut = house_cut
+        self._shares = dict(zip(self.result.team_names, payout_shares(self.result, self.payouts)))
+
+    # --- Prices ---
+
+    def set_price(self, team, price):
+        """Record a sale price (None clears it)."""
+        if team not in self._shares:
+            raise KeyError(f"Unknown team: {team}")
+        if price is None:
+            self.prices.pop(team, None)
+        else:
+            self.prices[team] = float(price)
+
+    def pot(self, estimate=None):
+        """
+        Net pot after house_cut.
+
+        Unsold teams count at estimate (default: the average sold price) so
+        early EVs are not computed against a tiny pot.
+        """
+        sold = list(self.prices.values())
+        unsold = len(self._shares) - len(sold)
+        if estimate is None:
+            estimate = float(np.mean(sold)) if sold else 0.0
+        return (sum(sold) + unsold * estimate) * (1 - self.house_cut)
+
+    def valuations(self, estimate=None):
+        """
+        One row per team, best value (highest ROI, then EV) first.
+
+        Keys: team, win_prob, payout_share, price, ev, value, roi.
+        ev is also the break-even price; value = EV - price and roi are None
+        for unsold teams.
+        """
+        pot = self.pot(estimate)
+        win_prob = dict(zip(self.result.team_names, self.result.win_prob))
+        rows = []
+        for team, share in self._shares.items():
+            price = self.prices.get(team)
+            ev = float(share * pot)
+            rows.append({
+                "team": team,
+                "win_prob": float(win_prob[team]),
+                "payout_share": float(share),
+                "price": price,
+                "ev": ev,
+                "value": ev - price if price is not None else None,
+                "roi": (ev - price) / price if price else None,
+            })
+        rows.sort(key=lambda r: (r["roi"] is None, -(r["roi"] or 0.0), -r["ev"]))
+        return rows
@@ -0,0 +1,235 @@
+# golf_variance.py
+"""
+Variance-reduced Day-2 win probability estimates.
+
+Every simulated round is a deterministic function of uniforms (per hole for
+the parametric model, per slot / alias / mixture draw for history sampling),
+so the estimators below only change how those uniforms are drawn:
+
+    iid          plain independent uniforms, as simulate_tournament
+    antithetic   every block of uniforms u is paired with 1 - u; a player who
+                 draws good holes in one sim draws bad ones in its twin
+    stratified   Latin hypercube: within each replicate of m sims every
+                 uniform dimension has exactly one draw per stratum [k/m, (k+1)/m)
+
+stratified is the default: a win indicator is far from monotone in any one
+player's holes, so antithetic pairs gain little over iid, while Latin
+hypercube sampling never does worse than iid.
+
+Independently, control_variates=True regresses each team's win indicator on
+every team's six-player score total, whose expectation is known exactly
+(CourseModel.expected_stableford, or the history tables' mean), and removes
+the explained part:
+
+    p_i = mean(W_i - (X - E[X]) beta_i)
+
+Winners are counted fractionally on ties (1/k each), the conditional
+expectation of rank_teams' random tie-break.
+
+Sims are run in independent replicates; the spread of the replicate
+estimates gives each team's standard error and its effective sample size
+
+    ESS_i = p_i (1 - p_i) / SE_i^2
+
+i.e. the number of plain i.i.d. sims that would give the same precision.
+"""
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List
+
+import numpy as np
+
+from golf_sampler import expected_history_score, history_from_uniforms
+from golf_scoring import default_course
+from golf_simulation import CompiledField, TournamentResult, compile_field, score_field, team_scores
+
+METHODS = ("iid", "antithetic", "stratified")
+DEFAULT_REPLICATES = 32
+# Largest replicate (sims); more replicates are used beyond this to bound memory.
+MAX_REPLICATE_SIMS = 4000
+
+
+def uniform_model(field, calibrated, sampler):
+    """
+    Return (dims, scores_from, expected): uniforms needed per player and sim,
+    the map (n, n_players, dims) uniforms -> (n, n_players) scores, and each
+    player's exact mean. A player's score depends only on its own uniforms.
+    """
+    n_players = field.n_players
+    handicaps = field.course_handicaps
+    course = (sampler.course if sampler is not None else None) or default_course()
+    parametric_mean = course.expected_stableford(handicaps, calibrated)
+
+    def parametric(u):
+        return course.rounds_from_uniforms(handicaps, u, calibrated)
+
+    if sampler is None:
+        return 18, parametric, parametric_mean
+
+    if hasattr(sampler, "outcome_tables"):
+        from golf_fit import calibration_offsets
+        fitted = sampler.outcome_tables(field.players, handicaps)
+        offsets = calibration_offsets(fitted, calibrated, course)
+
+        def outcomes(u):
+            return course.rounds_from_uniforms(handicaps, u, cdfs=fitted.cdfs) + offsets
+
+        return 18, outcomes, fitted.expected_points + offsets
+
+    tables = sampler.tables(field.players)
+    share = tables.history_share
+
+    def history(u):
+        # Per player: slot, alias, history-vs-parametric mixture, then 18 holes.
+        scores = history_from_uniforms(tables, u[..., 0], u[..., 1])
+        if np.all(share >= 1.0):
+            return scores
+        return np.where(u[..., 2] < share, scores, parametric(u[..., 3:]))
+
+    expected = share * expected_history_score(tables) + (1 - share) * parametric_mean
+    return 21, history, expected
+
+
+def draw_uniforms(method, n, dims, rng):
+    """(n, dims) float32 uniforms for one replicate."""
+    if method == "iid":
+        return rng.random((n, dims), dtype=np.float32)
+    if method == "antithetic":
+        half = rng.random(((n + 1) // 2, dims), dtype=np.float32)
+        return np.concatenate([half, 1 - half])[:n]
+    if method == "stratified":
+        strata = np.argsort(rng.random((n, dims), dtype=np.float32), axis=0).astype(np.float32)
+        return (strata + rng.random((n, dims), dtype=np.float32)) / n
+    raise ValueError(f"Unknown method '{method}' (choose from {', '.join(METHODS)})")
+
+
+def win_shares(scores):
+    """(n_sims, n_teams) win indicators with ties split evenly."""
+    best = scores.max(axis=1, keepdims=True)
+    top = scores == best
+    return top / top.sum(axis=1, keepdims=True)
+
+
+@dataclass
+class VarianceReducedResult:
+    """Win probability estimates with their standard errors and effective sample sizes."""
+    team_names: List[str]
+    n_sims: int
+    method: str
+    control_variates: bool
+    win_prob: np.ndarray    # (n_teams,) estimates
+    std_error: np.ndarray   # (n_teams,)
+    ess: np.ndarray         # (n_teams,) equivalent i.i.d. sims
+    result: TournamentResult  # raw counts from the same sims
+
+    @property
+    def efficiency(self):
+        """ESS per simulated tournament (1.0 = no better than i.i.d.)."""
+        return self.ess / max(self.n_sims, 1)
+
+    def win_interval(self, confidence=0.95):
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return (np.clip(self.win_prob - z * self.std_error, 0, 1),
+                np.clip(self.win_prob + z * self.std_error, 0, 1))
+
+    def summary(self):
+        """List of dicts sorted by win probability, best first."""
+        rows = [{"team": name, "win_prob": float(self.win_prob[i]),
+                 "std_error": float(self.std_error[i]), "ess": float(self.ess[i]),
+                 "expected_points": float(self.result.expected_points[i])}
+                for i, name in enumerate(self.team_names)]
+        rows.sort(key=lambda r: -r["win_prob"])
+        return rows
+
+
+def simulate_tournament_vr(c_teams, n_sims=10000, method="stratified", control_variates=True,
+                           rng=None, calibrated=True, sampler=None, replicates=DEFAULT_REPLICATES):
+    """
+    Estimate Day-2 win probabilities with a variance-reduction estimator.
+
+    Args:
+        c_teams (dict[str, CTeam] | CompiledField): Teams to simulate.
+        n_sims (int): Total simulated tournaments.
+        method (str): "iid", "antithetic" or "stratified".
+        control_variates (bool): Adjust with each team's known expected total.
+        rng (np.random.Generator | int | None): Random source or seed.
+        calibrated (bool): Use calibrated_simulate_round semantics.
+        sampler (HistorySampler | HoleOutcomeModel | None): Draw rounds from
+            player history, or fitted hole outcomes, instead of the parametric model.
+        replicates (int): Minimum number of independent replicates used for
+            the standard errors.
+
+    Returns:
+        VarianceReducedResult
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}' (choose from {', '.join(METHODS)})")
+    field = c_teams if isinstance(c_teams, CompiledField) else compile_field(c_teams)
+    rng = np.random.default_rng(rng)
+    dims, scores_from, player_means = uniform_model(field, calibrated, sampler)
+
+    team_players = field.mm_players[field.team_mm].reshape(field.n_teams, -1)  # (T, 6)
+    control_mean = player_means[team_players].sum(axis=1)
+
+    n_units = max(replicates, math.ceil(n_sims / MAX_REPLICATE_SIMS))
+    sizes = [n_sims // n_units + (k < n_sims % n_units) for k in range(n_units)]
+    sizes = [s for s in sizes if s > 0]
+    n_teams = field.n_teams
+
+    result = TournamentResult.empty(field.team_names)
+    unit_w = np.zeros((len(sizes), n_teams))
+    unit_x = np.zeros((len(sizes), n_teams))
+    sum_xx = np.zeros((n_teams, n_teams))
+    sum_xw = np.zeros((n_teams, n_teams))
+    for k, n in enumerate(sizes):
+        u = draw_uniforms(method, n, field.n_players * dims, rng)
+        player_scores = scores_from(u.reshape(n, field.n_players, dims))
+        result.merge(score_field(field, player_scores, rng))
+
+        w = win_shares(team_scores(field, player_scores))
+        x = player_scores[:, team_players].sum(axis=2) - control_mean
+        unit_w[k] = w.mean(axis=0)
+        unit_x[k] = x.mean(axis=0)
+        sum_xx += x.T @ x
+        sum_xw += x.T @ w
+
+    z = unit_w
+    if control_variates:
+        weights = np.array(sizes, dtype=float)[:, None]
+        total = weights.sum()
+        mean_x = (unit_x * weights).sum(axis=0) / total
+        mean_w = (unit_w * weights).sum(axis=0) / total
+        cov_xx = sum_xx / total - np.outer(mean_x, mean_x)
+        cov_xw = sum_xw / total - np.outer(mean_x, mean_w)
+        beta = np.linalg.lstsq(cov_xx, cov_xw, rcond=None)[0]
+        z = unit_w - unit_x @ beta
+
+    weights = np.array(sizes, dtype=float)
+    estimate = weights @ z / weights.sum()
+    std_error = np.sqrt(np.cov(z, rowvar=False, aweights=weights).diagonal() / len(sizes)) \
+        if len(sizes) > 1 else np.full(n_teams, np.nan)
+
+    win_prob = np.clip(estimate, 0, None)
+    win_prob /= win_prob.sum()
+    # No spread (SE 0) is an unbounded ESS; no replicates to compare (SE NaN) is unknown.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ess = np.where(std_error > 0, win_prob * (1 - win_prob) / std_error ** 2,
+                       np.where(std_error == 0, np.inf, np.nan))
+    return VarianceReducedResult(list(field.team_names), n_sims, method, control_variates,
+                                 win_prob, std_error, ess, result)
+
+
+def print_variance_results(result, top_n=None):
+    """Pretty-print win probabilities with standard errors and effective sample sizes."""
+    rows = result.summary()[:top_n]
+    label = result.method + (" + control variates" if result.control_variates else "")
+    print(f"\n📉 Day-2 win probabilities ({label}):\n")
+    print(f"{'Rank':<5} {'Team':<25} {'Win %':>8} {'± SE':>7} {'ESS':>10} {'Exp Pts':>9}")
+    print("-" * 68)
+    for i, r in enumerate(rows, 1):
+        print(f"{i:<5} {r['team']:<25} {r['win_prob'] * 100:>7.2f} {r['std_error'] * 100:>7.2f} "
+              f"{r['ess']:>10,.0f} {r['expected_points']:>9.2f}")
+    if not np.isnan(result.efficiency).all():
+        print(f"\nMedian efficiency: {np.nanmedian(result.efficiency):.2f}x i.i.d. sims")
@@ -0,0 +1,41 @@
+"""Import-time budgets of the modules loaded at worker spawn and app start."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from golf_bench import HEAVY_MODULES, IMPORT_BUDGETS_MS  # noqa: E402
+
+REPEAT = 3
+
+
+def import_profile(module):
+    """({imported module: cumulative us}) from python -X importtime in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    env.pop("GOLF_INSTRUMENT", None)
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True, cwd=SRC, env=env, check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        if cumulative.isdigit():
+            times[name] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_budget(module):
+    profiles = [import_profile(module) for _ in range(REPEAT)]
+    loaded = {name.split(".")[0] for name in profiles[0]}
+    assert not loaded & set(HEAVY_MODULES), f"{module} imports {sorted(loaded & set(HEAVY_MODULES))}"
+    best_ms = min(p[module] for p in profiles) / 1e3
+    assert best_ms <= IMPORT_BUDGETS_MS[module], \
+        f"{module} imported in {best_ms:.0f} ms (budget {IMPORT_BUDGETS_MS[module]} ms)"